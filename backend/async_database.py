@@ -0,0 +1,79 @@
+"""Async database layer — the database.py API as awaitables for FastAPI handlers.
+
+Each function here has the same name and signature as its database.py twin but
+runs on a bounded thread pool, so a Supabase round trip never blocks the event
+loop (and with it every other request and WebSocket stream). The pool is sized
+to database.DB_POOL_SIZE, the keep-alive HTTP/2 connection pool behind the
+Supabase client, so each worker thread reuses a warm connection.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+import database
+
+_executor = ThreadPoolExecutor(max_workers=database.DB_POOL_SIZE, thread_name_prefix="aura-db")
+
+
+def _offload(fn):
+    """Wrap a blocking database.py function as a coroutine run on the DB pool."""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+    return wrapper
+
+
+def shutdown():
+    """Drain the worker pool and close pooled connections."""
+    _executor.shutdown(wait=True)
+    database.close_db()
+
+
+# ─── READ: Patients ──────────────────────────────────────────────────────────
+
+get_all_patients = _offload(database.get_all_patients)
+get_patients_page = _offload(database.get_patients_page)
+get_patient = _offload(database.get_patient)
+get_patient_by_abha = _offload(database.get_patient_by_abha)
+get_patient_encounters = _offload(database.get_patient_encounters)
+get_patient_medications = _offload(database.get_patient_medications)
+get_patient_vitals = _offload(database.get_patient_vitals)
+get_patient_allergies = _offload(database.get_patient_allergies)
+get_patient_lab_results = _offload(database.get_patient_lab_results)
+get_full_patient_record = _offload(database.get_full_patient_record)
+get_full_patient_record_by_abha = _offload(database.get_full_patient_record_by_abha)
+get_scored_patient_record = _offload(database.get_scored_patient_record)
+get_scored_patient_record_by_abha = _offload(database.get_scored_patient_record_by_abha)
+get_risk_scores = _offload(database.get_risk_scores)
+
+# ─── CRUD ────────────────────────────────────────────────────────────────────
+
+create_patient = _offload(database.create_patient)
+update_patient = _offload(database.update_patient)
+delete_patient = _offload(database.delete_patient)
+create_encounter = _offload(database.create_encounter)
+delete_encounter = _offload(database.delete_encounter)
+create_medication = _offload(database.create_medication)
+update_medication = _offload(database.update_medication)
+delete_medication = _offload(database.delete_medication)
+create_vitals = _offload(database.create_vitals)
+create_allergy = _offload(database.create_allergy)
+delete_allergy = _offload(database.delete_allergy)
+create_lab_result = _offload(database.create_lab_result)
+create_vitals_batch = _offload(database.create_vitals_batch)
+create_medications_batch = _offload(database.create_medications_batch)
+create_lab_results_batch = _offload(database.create_lab_results_batch)
+
+# ─── Jan Aushadhi / Diagnostics ──────────────────────────────────────────────
+
+get_jan_aushadhi_alternative = _offload(database.get_jan_aushadhi_alternative)
+get_all_jan_aushadhi_drugs = _offload(database.get_all_jan_aushadhi_drugs)
+get_jan_aushadhi_by_molecule = _offload(database.get_jan_aushadhi_by_molecule)
+get_diagnostic_centers = _offload(database.get_diagnostic_centers)
+get_all_diagnostic_centers = _offload(database.get_all_diagnostic_centers)
+
+# ─── ABHA Consent ────────────────────────────────────────────────────────────
+
+create_consent_request = _offload(database.create_consent_request)
+verify_consent = _offload(database.verify_consent)
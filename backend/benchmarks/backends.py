@@ -0,0 +1,26 @@
+"""Offline storage backends for benchmarks — pick with `--backend standin|sqlite`.
+
+standin  Supabase backend talking to the local PostgREST stand-in (simulated latency)
+sqlite   Embedded SQLite backend on a throwaway file, seeded from seed_data.py
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+BACKENDS = ("standin", "sqlite")
+
+
+def start_backend(name: str, latency_ms: float = 0.0):
+    """Point database.py at an offline backend holding the seed dataset."""
+    if name == "standin":
+        from postgrest_standin import start_standin
+        return start_standin(latency_ms=latency_ms)
+    if name == "sqlite":
+        os.environ["AURA_STORAGE_BACKEND"] = "sqlite"
+        os.environ["AURA_SQLITE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="aura-bench-"), "aura.db")
+        import seed_data
+        seed_data.seed(force=True)
+        return None
+    raise ValueError(f"Unknown backend {name!r} (expected one of {', '.join(BACKENDS)})")
@@ -0,0 +1,152 @@
+"""Benchmark: /ws/board fan-out — concurrent vitals writes pushed to many board clients.
+
+Runs against a scratch SQLite database (AURA_SQLITE_PATH is overridden).
+Writer threads post vitals for the seeded patients the way the API's DB pool
+does, while simulated clients consume the hub: most drain their queue as
+fast as the loop allows, and some are slow (0.5 s per message). The
+script checks that each fast client's board, after applying the deltas, equals the
+stored risk scores. It also checks that slow clients were resynced instead
+of being waited for, and it reports the end-to-end latency and how much
+coalescing saved:
+
+    python benchmarks/bench_board.py --clients 200 --slow 20 --writes 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+_tmp = tempfile.mkdtemp(prefix="aura-board-")
+os.environ["AURA_STORAGE_BACKEND"] = "sqlite"
+os.environ["AURA_SQLITE_PATH"] = os.path.join(_tmp, "board.db")
+
+import database  # noqa: E402
+from board import BoardHub  # noqa: E402
+from seed_data import seed  # noqa: E402
+
+
+def write_vitals(patient_ids: list, writes: int, threads: int, pause: float, sent: dict, seed_value: int):
+    """Post `writes` vitals rows from `threads` threads, each pausing `pause` s between writes.
+
+    sent[patient_id] is the time of the patient's last write.
+    """
+    start = datetime(2026, 3, 1, 8, 0)
+    counter = iter(range(writes))
+    lock = threading.Lock()
+
+    def worker(rng: random.Random):
+        while True:
+            with lock:
+                k = next(counter, None)
+            if k is None:
+                return
+            patient_id = rng.choice(patient_ids)
+            database.create_vitals(patient_id, {
+                "timestamp": (start + timedelta(minutes=k)).isoformat(),
+                "heart_rate": rng.randint(45, 140),
+                "oxygen_saturation": rng.randint(86, 100),
+                "respiratory_rate": rng.randint(9, 28),
+            })
+            sent[patient_id] = time.perf_counter()
+            time.sleep(pause)
+
+    workers = [threading.Thread(target=worker, args=(random.Random(seed_value + i),)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+
+async def consume(client, board: dict, sent: dict, latencies: list, slow: bool, done: asyncio.Event):
+    while not (done.is_set() and client.queue.empty()):
+        try:
+            message = json.loads(await asyncio.wait_for(client.next(), 0.1))
+        except asyncio.TimeoutError:
+            continue
+        if message["type"] == "resync":
+            board.clear()
+            board["_resynced"] = True
+            continue
+        received = time.perf_counter()
+        for delta in message["deltas"]:
+            board[delta["patient_id"]] = (delta["score"], delta["triage_level"])
+            if not slow and delta["patient_id"] in sent:
+                latencies.append(received - sent[delta["patient_id"]])
+        if slow:
+            await asyncio.sleep(0.5)
+
+
+async def run(args):
+    hub = BoardHub(flush_seconds=args.flush_ms / 1000, queue_size=args.queue)
+    hub.start()
+    database.add_risk_listener(hub.publish)
+    patient_ids = [row["patient_id"] for row in database.get_storage().select("patients", [], columns=("patient_id",))]
+    initial = database.get_risk_scores(patient_ids)
+
+    done = asyncio.Event()
+    sent, latencies = {}, []
+    clients = []
+    for i in range(args.clients):
+        slow = i < args.slow
+        board = {patient_id: (risk["score"], risk["triage_level"]) for patient_id, risk in initial.items()}
+        client = hub.subscribe()
+        clients.append((client, board, slow, asyncio.create_task(consume(client, board, sent, latencies, slow, done))))
+
+    start = time.perf_counter()
+    await asyncio.to_thread(write_vitals, patient_ids, args.writes, args.threads,
+                            args.pause_ms / 1000, sent, args.seed)
+    write_s = time.perf_counter() - start
+    await asyncio.sleep(args.flush_ms / 1000 * 3)
+    done.set()
+    await asyncio.gather(*(task for *_, task in clients))
+    database.remove_risk_listener(hub.publish)
+    hub.stop()
+
+    final = {patient_id: (risk["score"], risk["triage_level"])
+             for patient_id, risk in database.get_risk_scores(patient_ids).items()}
+    fast = [(client, board) for client, board, slow, _ in clients if not slow]
+    slow = [(client, board) for client, board, slow, _ in clients if slow]
+    for client, board in fast:
+        assert client.resyncs == 0 and board == final, "fast client out of sync"
+    slow_resynced = sum(client.resyncs > 0 for client, _ in slow)
+
+    latencies.sort()
+    print(f"{args.writes} vitals writes in {write_s:.2f} s ({args.threads} threads), "
+          f"{hub.changes} risk changes, "
+          f"{hub.coalesced} coalesced, {hub.seq} messages to {args.clients} clients")
+    if latencies:
+        print(f"write -> fast client: p50 {statistics.median(latencies) * 1000:.0f} ms  "
+              f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.0f} ms")
+    print(f"{len(fast)} fast clients match the stored scores; {slow_resynced}/{len(slow)} slow clients resynced")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--slow", type=int, default=20)
+    parser.add_argument("--writes", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--pause-ms", type=float, default=5)
+    parser.add_argument("--flush-ms", type=float, default=50)
+    parser.add_argument("--queue", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=25)
+    args = parser.parse_args()
+
+    database.init_db()
+    seed()
+    database.backfill_risk_scores()
+    asyncio.run(run(args))
+    database.close_db()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark: Jan Aushadhi index search latency on a full-size (~2,000 SKU) PMBJP catalog.
+
+The seed catalog is expanded with strength and brand-suffix variants to reach
+PMBJP scale, then typo'd and brand-spelled queries are timed.
+
+    python benchmarks/bench_drug_search.py --skus 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from drug_index import DrugIndex
+
+# Same tuple layout as seed_data.JAN_AUSHADHI_DRUGS (kept local: seed_data imports database).
+BASE_DRUGS = [
+    ("Paracetamol", "Dolo", "Analgesic"), ("Amoxicillin+Clavulanic Acid", "Augmentin", "Antibiotic"),
+    ("Atorvastatin", "Atorva", "Statin"), ("Metformin", "Glycomet", "Anti-diabetic"),
+    ("Telmisartan", "Telma", "Anti-hypertensive"), ("Amlodipine", "Amlodac", "Anti-hypertensive"),
+    ("Pantoprazole", "Pan", "PPI"), ("Azithromycin", "Azee", "Antibiotic"),
+    ("Cetirizine", "Alerid", "Antihistamine"), ("Omeprazole", "Omez", "PPI"),
+    ("Metoprolol", "Metolar", "Beta-blocker"), ("Losartan", "Covance", "ARB"),
+    ("Clopidogrel", "Clopitab", "Antiplatelet"), ("Rosuvastatin", "Rosuvas", "Statin"),
+    ("Glimepiride", "Amaryl", "Anti-diabetic"), ("Escitalopram", "Nexito", "SSRI"),
+    ("Montelukast", "Montair", "Anti-asthmatic"), ("Rabeprazole", "Razo", "PPI"),
+    ("Hydrochlorothiazide", "Aquazide", "Diuretic"), ("Prednisolone", "Omnacortil", "Corticosteroid"),
+]
+STRENGTHS = ["2.5", "5", "10", "12.5", "20", "25", "40", "50", "75", "100", "250", "500", "625", "650", "1000"]
+SUFFIXES = ["", " GP", " MF", " XR", " SR", " D", " DSR", " Plus", " Forte", " Kid", " LS", " AM", " H", " CV", " OD"]
+
+QUERIES = ["Dolo650", "dolo-650", "Glycomet-GP", "glycomett", "atorvastatn", "Metformin",
+           "telma 40", "pantaprazole", "Augmentin 625", "escitalopram 10", "rosuvas", "xyzzy"]
+
+
+def build_catalog(n_skus: int) -> list:
+    drugs = []
+    for i in range(n_skus):
+        generic, brand, category = BASE_DRUGS[i % len(BASE_DRUGS)]
+        strength = STRENGTHS[(i // len(BASE_DRUGS)) % len(STRENGTHS)]
+        suffix = SUFFIXES[(i // (len(BASE_DRUGS) * len(STRENGTHS))) % len(SUFFIXES)]
+        drugs.append({
+            "drug_id": f"JA{i:05d}", "generic_name": f"{generic} {strength}mg", "brand_name": f"{brand}{suffix} {strength}",
+            "molecule": generic, "category": category, "brand_price_inr": 100.0,
+            "jan_aushadhi_price_inr": 10.0 + i % 50, "pmbjp_available": True,
+        })
+    return drugs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--skus", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    index = DrugIndex()
+    start = time.perf_counter()
+    index.load(build_catalog(args.skus))
+    print(f"Indexed {index.size} SKUs in {(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    print(f"{'query':<18} {'cold µs':>9} {'warm µs':>9}  top match")
+    for query in QUERIES:
+        start = time.perf_counter()
+        results = index.search(query)
+        cold = (time.perf_counter() - start) * 1e6
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            index.search(query)
+        warm = (time.perf_counter() - start) * 1e6 / args.repeat
+        top = f"{results[0]['brand_name']} ({results[0]['match_score']})" if results else "—"
+        print(f"{query:<18} {cold:>9.1f} {warm:>9.2f}  {top}")
+
+
+if __name__ == "__main__":
+    main()
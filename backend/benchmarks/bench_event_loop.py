@@ -0,0 +1,78 @@
+"""Benchmark: event-loop responsiveness while 200 list/detail DB calls are in flight.
+
+A heartbeat coroutine stands in for a /ws/triage stream: it wants to send a
+frame every 10 ms and records how late each frame goes out. The same burst of
+DB reads is issued twice — once calling database.py directly from the loop
+(the old handler behaviour) and once through async_database.
+
+    python benchmarks/bench_event_loop.py --requests 200 --latency-ms 10
+    python benchmarks/bench_event_loop.py --backend sqlite
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from backends import BACKENDS, start_backend
+
+HEARTBEAT_S = 0.010
+
+
+async def _heartbeat(lags: list, stop: asyncio.Event):
+    while not stop.is_set():
+        expected = time.perf_counter() + HEARTBEAT_S
+        await asyncio.sleep(HEARTBEAT_S)
+        lags.append(max(0.0, time.perf_counter() - expected) * 1000)
+
+
+async def _run(label: str, make_call, n_requests: int, patient_ids: list):
+    lags, stop = [], asyncio.Event()
+    beat = asyncio.create_task(_heartbeat(lags, stop))
+    await asyncio.sleep(HEARTBEAT_S * 2)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(make_call(i, patient_ids[i % len(patient_ids)]) for i in range(n_requests)))
+    wall = time.perf_counter() - start
+
+    stop.set()
+    await beat
+    lags.sort()
+    p99 = lags[min(len(lags) - 1, int(0.99 * (len(lags) - 1)))]
+    print(f"{label:<10} wall {wall * 1000:>8.1f} ms | heartbeat lag p50 {statistics.median(lags):>7.2f} ms, "
+          f"p99 {p99:>7.2f} ms, max {lags[-1]:>7.2f} ms ({len(lags)} beats)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=10.0)
+    parser.add_argument("--backend", choices=BACKENDS, default="standin")
+    args = parser.parse_args()
+
+    start_backend(args.backend, latency_ms=args.latency_ms)
+    import async_database
+    import database
+    from seed_data import PATIENTS
+
+    patient_ids = [p[0] for p in PATIENTS]
+
+    async def blocking_call(i, pid):
+        # What an `async def` handler calling the sync client does today.
+        return database.get_all_patients() if i % 2 else database.get_full_patient_record(pid)
+
+    async def offloaded_call(i, pid):
+        return await (async_database.get_all_patients() if i % 2 else async_database.get_full_patient_record(pid))
+
+    latency = f"{args.latency_ms:g} ms simulated latency" if args.backend == "standin" else "embedded SQLite"
+    print(f"{args.requests} concurrent list/detail requests, {latency}, pool size {database.DB_POOL_SIZE}")
+    await _run("blocking", blocking_call, args.requests, patient_ids)
+    await _run("async", offloaded_call, args.requests, patient_ids)
+    async_database.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
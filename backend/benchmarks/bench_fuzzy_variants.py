@@ -0,0 +1,148 @@
+"""Match quality and speed of transliteration-variant matching on a labelled corpus.
+
+Two labelled sets are scored at the symptom level (precision / recall / F1),
+with fuzzy matching off (exact lexicon spellings, AURA_NLP_FUZZY=0) and on:
+
+  * hand-labelled notes — real-world misspellings plus English "trap" text
+    that must not produce findings ("taken", "card", "since", "with"...)
+  * generated variants — every HINGLISH_MAP phrase respelled with common
+    transliteration habits (aa/a, ee/i, dropped or added h, me/mein, w/v)
+
+Speed is per-note latency for short typed notes, cold (empty memo) and warm,
+plus the raw SymSpell lookup cost:
+
+    python benchmarks/bench_fuzzy_variants.py
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import nlp_engine
+from nlp_engine import HINGLISH_MAP, extract_symptoms
+
+# (note, symptoms that must be extracted — nothing else counts as correct)
+LABELLED = [
+    ("Bukhaar 3 din se", {"fever"}),
+    ("bhukar aur khaansi", {"fever", "cough"}),
+    ("Seene me dard since morning", {"chest pain"}),
+    ("chati me dard, pasina ana", {"chest pain", "diaphoresis"}),
+    ("sar dardh aur chakkar ana", {"headache", "dizziness"}),
+    ("jodo me dard 1 hafte se", {"joint pain"}),
+    ("saans phulna, seeti ki awaj", {"shortness of breath", "wheezing"}),
+    ("pet me dard, ulti 2 baar", {"abdominal pain", "vomiting"}),
+    ("patient had vomitting and diarrhoea overnight", {"vomiting", "diarrhea"}),
+    ("known case of malria last year", {"malaria"}),
+    ("tez bukhaar with kanpna", {"high fever", "fever", "tremor"}),
+    ("khujlee on both arms", {"pruritus"}),
+    ("kamar dardh after lifting", {"back pain"}),
+    ("neend nahin aati", {"insomnia"}),
+    ("dil ki dhadkan tej", {"palpitations"}),
+    ("zyaada peshaab aana at night", {"polyuria"}),
+    ("gala kharaab since 2 days", {"sore throat"}),
+    ("thakaan and kamjori", {"fatigue", "weakness"}),
+    ("pairo me sujan", {"pedal edema"}),
+    ("jhunjhunaahat in feet", {"tingling"}),
+    ("taken to hospital by ambulance since morning", set()),
+    ("paid by card at the ward counter", set()),
+    ("patient with family, air ambulance arranged", set()),
+    ("sliding scale insulin started", set()),
+    ("discharged with advice, review as an outpatient", set()),
+    ("saw the dentist for a routine check", set()),
+    ("seen in OPD, BP 130/80", set()),
+    ("hard copy of reports filed", set()),
+]
+
+VARIANT_RULES = [
+    lambda w: w.replace("aa", "a", 1) if "aa" in w else w.replace("a", "aa", 1),
+    lambda w: w.replace("ee", "i", 1) if "ee" in w else w.replace("oo", "u", 1),
+    lambda w: w.replace("h", "", 1) if "h" in w[1:] else w + "h",
+    lambda w: "me" if w == "mein" else w,
+    lambda w: w.replace("w", "v"),
+    lambda w: w.replace("z", "j"),
+]
+
+
+def generated_variants(rng: random.Random) -> list:
+    out = []
+    for phrase in HINGLISH_MAP:
+        expected = _symptoms(phrase)
+        if not expected:
+            continue
+        for rule in VARIANT_RULES:
+            words = phrase.split()
+            k = rng.randrange(len(words))
+            words[k] = rule(words[k])
+            variant = " ".join(words)
+            if variant != phrase:
+                out.append((f"patient c/o {variant} since 2 days", expected))
+    return out
+
+
+def _symptoms(text: str) -> set:
+    return {s["symptom"] for s in extract_symptoms(text) if not s["negated"]}
+
+
+def score(cases: list) -> tuple:
+    tp = fp = fn = 0
+    for text, expected in cases:
+        got = _symptoms(text)
+        tp += len(got & expected)
+        fp += len(got - expected)
+        fn += len(expected - got)
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+
+def latency_us(texts: list, rounds: int = 50) -> float:
+    samples = []
+    for _ in range(rounds):
+        for text in texts:
+            start = time.perf_counter()
+            extract_symptoms(text)
+            samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6
+
+
+def main():
+    rng = random.Random(16)
+    generated = generated_variants(rng)
+    texts = [text for text, _ in LABELLED] + [text for text, _ in generated]
+
+    print(f"{'corpus':<22} {'matching':<8} {'precision':>9} {'recall':>7} {'F1':>6}")
+    for fuzzy in (False, True):
+        nlp_engine.FUZZY_MATCHING = fuzzy
+        for name, cases in [(f"hand-labelled ({len(LABELLED)})", LABELLED), (f"generated ({len(generated)})", generated)]:
+            p, r, f = score(cases)
+            print(f"{name:<22} {'fuzzy' if fuzzy else 'exact':<8} {p:>9.3f} {r:>7.3f} {f:>6.3f}")
+
+    print()
+    for fuzzy in (False, True):
+        nlp_engine.FUZZY_MATCHING = fuzzy
+        lex = nlp_engine._lexicons
+        lex.variant_memo.clear()
+        lex.raw_token_memo.clear()
+        lex.variant_raw_tokens.clear()
+        start = time.perf_counter()
+        for text in texts:
+            extract_symptoms(text)
+        cold = (time.perf_counter() - start) / len(texts) * 1e6
+        print(f"extract_symptoms per typed note, {'fuzzy' if fuzzy else 'exact'}: "
+              f"cold {cold:.0f} µs, warm median {latency_us(texts):.0f} µs")
+
+    words = [w for text in texts for w in text.lower().split()]
+    index = nlp_engine._lexicons.variant_index
+    start = time.perf_counter()
+    for word in words:
+        index.lookup(word, 2)
+    print(f"SymSpell lookup (uncached, max 2 edits): {(time.perf_counter() - start) / len(words) * 1e6:.1f} µs/word "
+          f"over {len(index.words_by_key)} lexicon keys ({nlp_engine.lexicon_info()['source']})")
+
+
+if __name__ == "__main__":
+    main()
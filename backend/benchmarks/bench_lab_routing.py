@@ -0,0 +1,68 @@
+"""Benchmark: lab_router k-nearest routing latency on a national-scale center network.
+
+Generates ~100k synthetic center-test rows spread across the pincodes known to
+lab_router, then times route() for patients in different cities.
+
+    python benchmarks/bench_lab_routing.py --rows 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lab_router import PINCODE_COORDS, PINCODE_PREFIX_COORDS, LabRouter
+
+TESTS = ["Lipid Profile", "CBC (Complete Blood Count)", "Dengue NS1 + IgM Panel", "HbA1c",
+         "Liver Function Test", "Thyroid Profile (T3/T4/TSH)", "Troponin I", "Kidney Function Test",
+         "Vitamin D", "Vitamin B12", "Urine Routine", "Malaria Antigen", "Widal Test", "CRP", "ECG"]
+CHAINS = ["Dr. Lal PathLabs", "SRL Diagnostics", "Thyrocare", "Metropolis", "Tata 1mg Labs", "Redcliffe Labs"]
+
+
+def build_centers(n_rows: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    pincodes = list(PINCODE_COORDS) + [p + "0" * 3 for p in PINCODE_PREFIX_COORDS]
+    return [
+        {
+            "center_id": f"DC{i:06d}", "center_name": rng.choice(CHAINS), "city": "", "pincode": rng.choice(pincodes),
+            "test_name": TESTS[i % len(TESTS)], "price_inr": rng.randint(150, 1500),
+            "distance_km": None, "turnaround_hours": rng.choice([4, 6, 8, 12, 24]),
+        }
+        for i in range(n_rows)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    router = LabRouter()
+    centers = build_centers(args.rows)
+    start = time.perf_counter()
+    router.load(centers)
+    print(f"Indexed {router.size} center-test rows in {(time.perf_counter() - start):.2f} s")
+
+    rng = random.Random(1)
+    origins = ["800001", "110001", "600001", "560001", "226001", "781000"]
+    samples = []
+    for i in range(args.queries):
+        start = time.perf_counter()
+        router.route(rng.choice(TESTS), origins[i % len(origins)], limit=5)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    print(f"route() over {args.queries} queries: p50 {samples[len(samples) // 2]:.2f} ms, "
+          f"p99 {samples[int(0.99 * (len(samples) - 1))]:.2f} ms, max {samples[-1]:.2f} ms")
+
+    top = router.route("Dengue NS1", "800001", limit=3)
+    print("\nDengue NS1 for a patient in Patna (800001):")
+    for c in top:
+        print(f"  {c['center_name']:<18} {c['pincode']}  ₹{c['price_inr']:<5} {c['distance_km']:>7} km  "
+              f"{c['turnaround_hours']}h  score {c['route_score']}")
+
+
+if __name__ == "__main__":
+    main()
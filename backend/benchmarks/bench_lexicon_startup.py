@@ -0,0 +1,101 @@
+"""Benchmark: nlp_engine startup as the lexicons grow, with and without the compiled artifact.
+
+Builds lexicon directories holding the shipped files plus synthetic regional
+extension files (hinglish.synthetic.json, icd10.synthetic.json) that grow
+them 10x and 100x. For each size, a fresh interpreter imports nlp_engine
+twice: first with no artifact (compile + store it), then mapping the stored
+artifact. Time to the first extraction and resident memory are reported too:
+
+    python benchmarks/bench_lexicon_startup.py --scales 1 10 100
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, BACKEND)
+
+import lexicon_store
+
+SYLLABLES = ["ka", "kha", "ga", "cha", "ja", "ta", "da", "na", "pa", "ba", "ma", "ra", "la", "va", "sha", "sa", "ha",
+             "ki", "ku", "ke", "ko", "ti", "du", "ni", "pu", "bi", "mo", "ri", "lu", "vi", "shi", "su", "ai", "au"]
+
+PROBE = ("Pt c/o seene mein dard, saans phoolna 2 din se. Tez bukhar, no cough. "
+         "Tab Dolo 650 TDS x 5 days, Tab Pan 40 OD BBF.")
+
+CHILD = """
+import json, resource, time
+start = time.perf_counter()
+import nlp_engine
+imported = time.perf_counter()
+nlp_engine.extract_symptoms(PROBE)
+nlp_engine.decode_prescription_abbreviations(PROBE)
+first = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - start,
+    "first_call_s": first - imported,
+    "source": nlp_engine.lexicon_info()["source"],
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}))
+"""
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def build_lexicon_dir(directory: str, scale: int, rng: random.Random):
+    """The shipped lexicons plus (scale - 1)x as many synthetic Hinglish and ICD-10 terms."""
+    for name in os.listdir(lexicon_store.LEXICON_DIR):
+        if name.endswith(".json"):
+            shutil.copy(os.path.join(lexicon_store.LEXICON_DIR, name), directory)
+    data, _, _ = lexicon_store.read_lexicons()
+    english = sorted(data["icd10"])
+    extra = {
+        "hinglish": {" ".join(_word(rng) for _ in range(rng.randint(1, 3))): rng.choice(english)
+                     for _ in range((scale - 1) * len(data["hinglish"]))},
+        "icd10": {" ".join(_word(rng) for _ in range(rng.randint(1, 3))): f"R{rng.randint(0, 99):02d}.{rng.randint(0, 9)}"
+                  for _ in range((scale - 1) * len(data["icd10"]))},
+    }
+    for kind, entries in extra.items():
+        if entries:
+            with open(os.path.join(directory, f"{kind}.synthetic.json"), "w", encoding="utf-8") as f:
+                json.dump({"lexicon": kind, "version": f"synthetic-{scale}x", "entries": entries}, f)
+
+
+def run_child(lexicon_dir: str, artifact_dir: str) -> dict:
+    env = {**os.environ, "AURA_LEXICON_DIR": lexicon_dir, "AURA_LEXICON_ARTIFACT_DIR": artifact_dir}
+    out = subprocess.run([sys.executable, "-c", f"PROBE = {PROBE!r}\n" + CHILD], cwd=BACKEND, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--seed", type=int, default=19)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'lexicon':>8} {'terms':>8} {'start':<9} {'import s':>9} {'1st call s':>11} {'RSS MB':>8} {'artifact MB':>12}")
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            lexicon_dir, artifact_dir = os.path.join(tmp, "lexicons"), os.path.join(tmp, "compiled")
+            os.makedirs(lexicon_dir)
+            build_lexicon_dir(lexicon_dir, scale, rng)
+            terms = sum(entry["entries"] for entry in lexicon_store.read_lexicons(lexicon_dir)[1])
+            for label in ("compile", "artifact"):
+                result = run_child(lexicon_dir, artifact_dir)
+                assert result["source"] == ("compiled" if label == "compile" else "artifact"), result
+                size = sum(os.path.getsize(os.path.join(artifact_dir, f)) for f in os.listdir(artifact_dir)) / 1e6
+                print(f"{scale:>7}x {terms:>8} {label:<9} {result['import_s']:>9.2f} {result['first_call_s']:>11.3f} "
+                      f"{result['rss_mb']:>8.0f} {size:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark: incremental live extraction (live_extract.LiveNote) against re-scanning the note.
+
+Simulates a clinician editing long notes — typing Hinglish and English
+complaints character by character, backspacing, pasting a sentence, cutting a
+range — and after every edit checks that the incremental mentions equal a
+full extract_symptoms() of the current text. Reports per-edit latency next to
+the cost of re-running full extraction on each keystroke:
+
+    python benchmarks/bench_live_extract.py --notes 3 --words 6000 --edits 400
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from corpus import clinical_note, complaint
+from live_extract import LiveNote
+from nlp_engine import extract_symptoms
+
+
+def full_mentions(text: str) -> list:
+    mentions = [
+        {"start": o["start"], "end": o["end"], "symptom": s["symptom"], "icd10": s["icd10"],
+         "negated": o["negated"], "severity": o["severity"], "body_part": o["body_part"]}
+        for s in extract_symptoms(text) for o in s["occurrences"]
+    ]
+    mentions.sort(key=lambda m: (m["start"], m["symptom"]))
+    return mentions
+
+
+def edits(rng: random.Random, text: str):
+    """Yield change lists against the evolving text; `text` is tracked locally."""
+    while True:
+        roll = rng.random()
+        pos = rng.randint(0, len(text))
+        if roll < 0.6:  # type a complaint one keystroke at a time
+            for ch in f" {complaint(rng, 0.6)},":
+                yield [{"start": pos, "end": pos, "text": ch}]
+                text = text[:pos] + ch + text[pos:]
+                pos += 1
+        elif roll < 0.8:  # backspace a few characters
+            for _ in range(rng.randint(1, 12)):
+                if pos == 0:
+                    break
+                yield [{"start": pos - 1, "end": pos, "text": ""}]
+                text = text[:pos - 1] + text[pos:]
+                pos -= 1
+        elif roll < 0.9:  # paste a sentence
+            pasted = clinical_note(rng, 25, 0.5) + " "
+            yield [{"start": pos, "end": pos, "text": pasted}]
+            text = text[:pos] + pasted + text[pos:]
+        else:  # cut a range
+            end = min(len(text), pos + rng.randint(1, 300))
+            yield [{"start": pos, "end": end, "text": ""}]
+            text = text[:pos] + text[end:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=3)
+    parser.add_argument("--words", type=int, default=6000, help="words per note (~6 chars each)")
+    parser.add_argument("--edits", type=int, default=400, help="edits per note")
+    parser.add_argument("--check-every", type=int, default=1, help="compare with a full scan every N edits")
+    parser.add_argument("--seed", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    incremental, full = [], []
+    checked = 0
+    for _ in range(args.notes):
+        note = LiveNote(clinical_note(rng, args.words, 0.5))
+        for n, changes in zip(range(args.edits), edits(rng, note.text)):
+            start = time.perf_counter()
+            note.apply(changes)
+            incremental.append(time.perf_counter() - start)
+            if n % args.check_every == 0:
+                start = time.perf_counter()
+                expected = full_mentions(note.text)
+                full.append(time.perf_counter() - start)
+                assert note.mentions == expected, f"divergence after edit {n}: {changes}"
+                checked += 1
+
+    kb = len(note.text) / 1024
+    print(f"{args.notes} notes × {args.edits} edits (~{kb:.0f} KB each); {checked} states identical to a full scan")
+    q = statistics.quantiles(incremental, n=100)
+    print(f"{'per edit':<22} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    print(f"{'incremental':<22} {q[49] * 1e3:>8.2f} {q[94] * 1e3:>8.2f} {q[98] * 1e3:>8.2f} {max(incremental) * 1e3:>8.2f}")
+    f = statistics.quantiles(full, n=100)
+    print(f"{'full re-scan':<22} {f[49] * 1e3:>8.2f} {f[94] * 1e3:>8.2f} {f[98] * 1e3:>8.2f} {max(full) * 1e3:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
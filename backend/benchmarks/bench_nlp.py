@@ -0,0 +1,180 @@
+"""Benchmark: extract_symptoms throughput on long discharge-summary text.
+
+Compares nlp_engine against a frozen copy of the previous per-keyword
+implementation, after asserting both extract identically from every
+generated note (plus a fuzz set of adversarial strings):
+
+    python benchmarks/bench_nlp.py --notes 300 --words 1500
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import nlp_engine
+from nlp_engine import BODY_PARTS, HINGLISH_MAP, ICD10_MAP, SEVERITY_KEYWORDS
+
+
+# ─── Reference implementation (pre-compiled-lexicon) ─────────────────────────
+
+def legacy_normalize_hinglish(text: str) -> str:
+    text_lower = text.lower()
+    for hindi, english in sorted(HINGLISH_MAP.items(), key=lambda x: -len(x[0])):
+        text_lower = text_lower.replace(hindi, english)
+    return text_lower
+
+
+def _legacy_detect_severity(text: str, symptom: str) -> str:
+    idx = text.find(symptom)
+    if idx == -1:
+        return "unknown"
+    window = text[max(0, idx - 80):min(len(text), idx + len(symptom) + 80)]
+    for keyword, level in SEVERITY_KEYWORDS.items():
+        if keyword in window:
+            return level
+    return "medium"
+
+
+def _legacy_detect_body_part(text: str, symptom: str) -> Optional[str]:
+    idx = text.find(symptom)
+    if idx == -1:
+        return None
+    window = text[max(0, idx - 50):min(len(text), idx + len(symptom) + 50)]
+    for part in BODY_PARTS:
+        if part in window:
+            return part
+    return None
+
+
+def legacy_extract_symptoms(text: str, normalize=legacy_normalize_hinglish) -> list:
+    text_lower = normalize(text).lower()
+    found = []
+    for symptom, icd_code in ICD10_MAP.items():
+        if symptom in text_lower:
+            found.append({
+                "symptom": symptom,
+                "icd10": icd_code,
+                "severity": _legacy_detect_severity(text_lower, symptom),
+                "body_part": _legacy_detect_body_part(text_lower, symptom),
+            })
+    return found
+
+
+# ─── Synthetic discharge summaries ───────────────────────────────────────────
+
+FILLER = (
+    "patient admitted via emergency department with complaints of since days history of known case "
+    "of on treatment with advised follow up in opd after review investigations revealed no acute "
+    "distress vitals stable on discharge counselled regarding diet and medication compliance referred "
+    "to physician ward course uneventful started on iv fluids antibiotics antipyretics monitored "
+    "closely improved symptomatically relatives explained condition prognosis summary department of "
+    "medicine was is the a an to for by per as at from under over normal within limits reported "
+    "negative positive consistent suggestive likely ruled out bilateral unilateral tolerated orally "
+    "ambulatory afebrile conscious oriented alert cooperative hemodynamically saturation maintained "
+    "room air nebulisation physiotherapy dietician consultation insulin sliding scale glucose charting "
+    "ecg echo ultrasound x-ray ct mri sputum culture sensitivity urine routine microscopy"
+).split()
+DRUGS = ["Tab Dolo 650", "Tab Pan 40", "Inj Ceftriaxone 1g", "Tab Ecosprin 75", "Tab Atorva 40",
+         "Syp Ascoril", "Tab Glycomet GP 2", "Inj Pantop 40", "Tab Telma 40", "Neb Duolin"]
+SECTION_HEADERS = ["Chief complaints:", "History of present illness:", "Examination:", "Investigations:",
+                   "Hospital course:", "Condition at discharge:", "Advice on discharge:"]
+
+
+def _number_token(rng: random.Random) -> str:
+    kind = rng.random()
+    if kind < 0.3:
+        return f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2026"
+    if kind < 0.6:
+        return f"{rng.choice(['BP', 'HR', 'SpO2', 'Temp', 'RR', 'Hb', 'TLC', 'Na', 'K', 'Cr'])} {rng.uniform(1, 250):.1f}"
+    return f"{rng.choice(DRUGS)} {rng.choice(['OD', 'BD', 'TDS', 'HS', 'SOS'])} x {rng.randint(3, 14)} days"
+
+
+def discharge_summary(rng: random.Random, n_words: int) -> str:
+    """One clinical case: a handful of complaints and modifiers recurring through long English/Hinglish text."""
+    case = (rng.sample(sorted(HINGLISH_MAP), rng.randint(2, 6))
+            + rng.sample([k for k in ICD10_MAP if k == k.lower()], rng.randint(2, 8))
+            + rng.sample(sorted(SEVERITY_KEYWORDS), rng.randint(1, 4))
+            + rng.sample(BODY_PARTS, rng.randint(1, 4)))
+    words, sections = [], iter(SECTION_HEADERS)
+    while len(words) < n_words:
+        if len(words) % max(1, n_words // len(SECTION_HEADERS)) == 0:
+            words.append("\n" + next(sections, "Notes:"))
+        roll = rng.random()
+        if roll < 0.04:
+            words.append(rng.choice(case))
+        elif roll < 0.14:
+            words.append(_number_token(rng))
+        else:
+            words.append(rng.choice(FILLER) + ("," if rng.random() < 0.05 else ""))
+    return " ".join(words)
+
+
+def adversarial(rng: random.Random, count: int) -> list:
+    """Short strings built from lexicon fragments — overlaps, run-ons and odd spacing."""
+    pieces = list(HINGLISH_MAP) + list(HINGLISH_MAP.values()) + list(ICD10_MAP) + list(SEVERITY_KEYWORDS) + BODY_PARTS
+    out = []
+    for _ in range(count):
+        chunks = []
+        for _ in range(rng.randint(1, 12)):
+            piece = rng.choice(pieces)
+            if rng.random() < 0.3:
+                cut = rng.randint(0, len(piece))
+                piece = piece[:cut] if rng.random() < 0.5 else piece[cut:]
+            chunks.append(piece)
+            chunks.append(rng.choice(["", " ", " ", "  ", ", ", "\n", "-"]))
+        text = "".join(chunks)
+        out.append(text.upper() if rng.random() < 0.1 else text)
+    return out
+
+
+def _throughput(fn, notes: list, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for note in notes:
+            fn(note)
+        best = min(best, time.perf_counter() - start)
+    return len(notes) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=200)
+    parser.add_argument("--words", type=int, default=1500, help="words per discharge summary")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--fuzz", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    notes = [discharge_summary(rng, args.words) for _ in range(args.notes)]
+    for text in notes + adversarial(rng, args.fuzz):
+        # The Hinglish pass intentionally differs (whole-token matching), so
+        # extraction is compared on the same normalized text.
+        # The first mention's attributes must match the old first-hit-only output.
+        expected = legacy_extract_symptoms(text, normalize=nlp_engine.normalize_hinglish)
+        got = [
+            {"symptom": s["symptom"], "icd10": s["icd10"],
+             "severity": s["occurrences"][0]["severity"], "body_part": s["occurrences"][0]["body_part"]}
+            for s in nlp_engine.extract_symptoms(text)
+        ]
+        assert got == expected, f"extract mismatch: {text!r}"
+    print(f"equivalence: {args.notes} notes + {args.fuzz} fuzz strings identical")
+
+    chars = sum(map(len, notes)) / len(notes)
+    print(f"extract_symptoms on {args.notes} notes × {args.words} words (~{chars / 1024:.1f} KB each)")
+    print(f"{'implementation':<16} {'notes/s':>10} {'MB/s':>8}")
+    results = {}
+    for name, fn in [("legacy", legacy_extract_symptoms), ("compiled", nlp_engine.extract_symptoms)]:
+        rate = _throughput(fn, notes, args.rounds)
+        results[name] = rate
+        print(f"{name:<16} {rate:>10.0f} {rate * chars / 1e6:>8.2f}")
+    print(f"speedup: {results['compiled'] / results['legacy']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
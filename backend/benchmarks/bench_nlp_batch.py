@@ -0,0 +1,73 @@
+"""Benchmark: batch symptom extraction throughput at 1, 4 and N worker processes.
+
+Drives nlp_batch.extract_stream (the engine behind POST
+/api/extract-symptoms/batch) over synthetic discharge summaries fed as NDJSON
+lines, checks the streamed results come back complete and in order, and
+compares against extracting inline on the event loop:
+
+    python benchmarks/bench_nlp_batch.py --notes 2000 --words 400
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import nlp_batch
+from bench_nlp import discharge_summary
+from nlp_engine import extract_symptoms
+
+
+async def _as_ndjson(lines):
+    for line in lines:
+        yield line
+
+
+async def run_pool(lines: list, workers: int, chunk_size: int) -> tuple:
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("forkserver"))
+    try:
+        # Warm the workers (process start + imports) outside the timed region.
+        await asyncio.gather(*(asyncio.get_running_loop().run_in_executor(pool, nlp_batch.extract_chunk, ["warm"])
+                               for _ in range(workers)))
+        start = time.perf_counter()
+        results = [r async for r in nlp_batch.extract_stream(_as_ndjson(lines), chunk_size, pool, 2 * workers)]
+        return time.perf_counter() - start, results
+    finally:
+        pool.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=400, help="words per note")
+    parser.add_argument("--chunk", type=int, default=nlp_batch.NLP_CHUNK_SIZE, help="notes per worker task")
+    parser.add_argument("--seed", type=int, default=14)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    notes = [discharge_summary(rng, args.words) for _ in range(args.notes)]
+    lines = [json.dumps({"id": f"E{i:06d}", "text": text}).encode() for i, text in enumerate(notes)]
+
+    start = time.perf_counter()
+    expected = [extract_symptoms(text) for text in notes]
+    inline = time.perf_counter() - start
+
+    cores = os.cpu_count() or 1
+    print(f"{args.notes} notes × {args.words} words, chunk={args.chunk}, {cores} CPU core(s) available")
+    print(f"{'mode':<14} {'notes/s':>10} {'vs inline':>10}")
+    print(f"{'inline':<14} {args.notes / inline:>10.0f} {1.0:>9.2f}x")
+    for workers in sorted({1, 4, cores}):
+        elapsed, results = asyncio.run(run_pool(lines, workers, args.chunk))
+        assert [r["index"] for r in results] == list(range(args.notes)), "results out of order"
+        assert [r["symptoms"] for r in results] == expected, "results differ from inline extraction"
+        print(f"{f'{workers} worker(s)':<14} {args.notes / elapsed:>10.0f} {inline / elapsed:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""NLP benchmark suite with stored baselines and regression flags.
+
+Times normalize_hinglish, extract_symptoms and decode_prescription_abbreviations
+on synthetic notes from corpus.py — short typed notes and long discharge
+summaries, at 0%, 50% and 100% Hinglish code-mix — and compares each case with
+baselines/nlp_suite.json. Like pytest-benchmark's saved runs, a baseline is
+only meaningful on the machine that recorded it — re-record with --save after
+changing hardware or Python. A case is flagged when its best pass is slower
+than the baseline by more than --threshold (confirmed by re-timing it), and
+the script exits 1 if any case regressed:
+
+    python benchmarks/bench_nlp_suite.py            # compare with the baseline
+    python benchmarks/bench_nlp_suite.py --save     # re-record the baseline
+    python benchmarks/bench_nlp_suite.py -k extract # only matching cases
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import nlp_engine
+from corpus import corpus
+from nlp_engine import decode_prescription_abbreviations, extract_symptoms, normalize_hinglish
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "nlp_suite.json")
+
+SIZES = {"short": (200, 40), "long": (20, 1500)}  # name -> (notes, words per note)
+CODE_MIX = [0.0, 0.5, 1.0]
+FUNCTIONS = {
+    "normalize_hinglish": (normalize_hinglish, CODE_MIX),
+    "extract_symptoms": (extract_symptoms, CODE_MIX),
+    "decode_prescription_abbreviations": (decode_prescription_abbreviations, [0.5]),
+}
+
+
+def cases() -> list:
+    """(name, fn, notes) for every function × size × code-mix combination."""
+    out = []
+    for fn_name, (fn, mixes) in FUNCTIONS.items():
+        for size, (count, words) in SIZES.items():
+            for mix in mixes:
+                out.append((f"{fn_name}[{size},mix={mix:.1f}]", fn, corpus(count, words, mix)))
+    return out
+
+
+def time_case(fn, notes: list, repeat: int) -> float:
+    """Best seconds per note over `repeat` passes, after one warm-up pass.
+
+    The minimum, not the median: on a shared machine the noise only ever adds
+    time, so the fastest pass is the most repeatable estimate.
+    """
+    for note in notes:
+        fn(note)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for note in notes:
+            fn(note)
+        best = min(best, time.perf_counter() - start)
+    return best / len(notes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--save", action="store_true", help="record the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.20, help="allowed slowdown before flagging (0.20 = 20%%)")
+    parser.add_argument("--repeat", type=int, default=9)
+    parser.add_argument("-k", dest="select", default="", help="only run cases whose name contains this")
+    args = parser.parse_args()
+
+    baseline = None
+    if not args.save and os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            baseline = json.load(f)
+        recorded = (baseline["machine"], baseline["python"], baseline["fuzzy_matching"])
+        if recorded != (platform.machine(), platform.python_version(), nlp_engine.FUZZY_MATCHING):
+            print(f"⚠️  baseline was recorded on {recorded[0]}, Python {recorded[1]}, AURA_NLP_FUZZY={int(recorded[2])}; "
+                  f"timings may not be comparable")
+    results, regressions = {}, []
+    print(f"{'case':<54} {'µs/note':>10} {'KB/note':>8} {'baseline':>10} {'change':>8}")
+    for name, fn, notes in cases():
+        if args.select not in name:
+            continue
+        seconds = time_case(fn, notes, args.repeat)
+        kb = sum(map(len, notes)) / len(notes) / 1024
+        results[name] = {"us_per_note": round(seconds * 1e6, 2), "kb_per_note": round(kb, 2)}
+        line = f"{name:<54} {seconds * 1e6:>10.1f} {kb:>8.1f}"
+        expected = baseline["cases"].get(name) if baseline else None
+        if expected and seconds * 1e6 / expected["us_per_note"] - 1 > args.threshold:
+            # Confirm before flagging: a burst of machine noise rarely lasts two runs.
+            seconds = min(seconds, time_case(fn, notes, args.repeat))
+            results[name]["us_per_note"] = round(seconds * 1e6, 2)
+            line = f"{name:<54} {seconds * 1e6:>10.1f} {kb:>8.1f}"
+        if expected:
+            change = seconds * 1e6 / expected["us_per_note"] - 1
+            flag = "  ❌ regression" if change > args.threshold else ""
+            if flag:
+                regressions.append(name)
+            line += f" {expected['us_per_note']:>10.1f} {change:>+7.0%}{flag}"
+        print(line)
+
+    if args.save:
+        os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "fuzzy_matching": nlp_engine.FUZZY_MATCHING,
+                "cases": results,
+            }, f, indent=2)
+            f.write("\n")
+        print(f"Recorded {len(results)} cases to {BASELINE_PATH}")
+    elif baseline is None:
+        print("No baseline yet — run with --save to record one")
+    elif regressions:
+        print(f"❌ {len(regressions)} case(s) slower than baseline by more than {args.threshold:.0%}")
+        sys.exit(1)
+    else:
+        print(f"✅ no case slower than baseline by more than {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark: get_full_patient_record latency — sequential vs concurrent vs embedded.
+
+Runs against the local PostgREST stand-in (or embedded SQLite) so no Supabase
+project is needed:
+
+    python benchmarks/bench_patient_record.py --latency-ms 20 --iterations 200
+    python benchmarks/bench_patient_record.py --backend sqlite
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from backends import BACKENDS, start_backend
+
+
+def _percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _time_calls(fn, patient_ids: list, iterations: int) -> list:
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn(patient_ids[i % len(patient_ids)])
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=10.0, help="simulated per-request network latency")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--backend", choices=BACKENDS, default="standin")
+    args = parser.parse_args()
+
+    start_backend(args.backend, latency_ms=args.latency_ms)
+    import database
+    from seed_data import PATIENTS
+
+    patient_ids = [p[0] for p in PATIENTS]
+
+    def sequential(patient_id):
+        # The pre-aggregate behaviour: six round trips back to back.
+        patient = database.get_patient(patient_id)
+        patient["encounters"] = database.get_patient_encounters(patient_id)
+        patient["medications"] = database.get_patient_medications(patient_id)
+        patient["vitals"] = database.get_patient_vitals(patient_id)
+        patient["allergies"] = database.get_patient_allergies(patient_id)
+        patient["lab_results"] = database.get_patient_lab_results(patient_id)
+        return patient
+
+    storage = database.get_storage()
+    strategies = [("sequential", sequential)]
+    if args.backend == "standin":
+        strategies += [
+            ("concurrent", lambda pid: storage.fetch_concurrent_record(database.get_patient(pid))),
+            ("embedded", lambda pid: storage.fetch_embedded_record("patient_id", pid)),
+        ]
+    else:
+        strategies.append(("full_record", lambda pid: storage.full_record("patient_id", pid)))
+
+    # Sanity check: every strategy must agree before we time them.
+    for pid in patient_ids:
+        records = [fn(pid) for _, fn in strategies]
+        assert all(r == records[0] for r in records), f"record mismatch for {pid}"
+
+    latency = f"{args.latency_ms:g} ms simulated latency" if args.backend == "standin" else "embedded SQLite"
+    print(f"get_full_patient_record — {args.iterations} calls, {latency}")
+    print(f"{'strategy':<12} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9}")
+    for name, fn in strategies:
+        samples = _time_calls(fn, patient_ids, args.iterations)
+        print(f"{name:<12} {_percentile(samples, 50):>9.2f} {_percentile(samples, 99):>9.2f} {statistics.mean(samples):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark: decode_prescription_abbreviations on long prescription/OCR text.
+
+Compares the single compiled alternation against a frozen copy of the old
+one-re.sub-per-abbreviation loop, after checking that
+
+  * single abbreviations decode exactly as before, and
+  * decode_prescription_stream() over random chunkings equals decoding the
+    whole text at once:
+
+    python benchmarks/bench_prescriptions.py --docs 200 --lines 300
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from nlp_engine import PRESCRIPTION_ABBREVS, decode_prescription_abbreviations, decode_prescription_stream
+from seed_data import MEDICATIONS
+
+
+def legacy_decode(text: str) -> str:
+    result = text
+    for abbrev, full in PRESCRIPTION_ABBREVS.items():
+        result = re.sub(rf'\b{abbrev}\b', f"{abbrev} ({full})", result, flags=re.IGNORECASE)
+    return result
+
+
+SCHEDULES = ["OD", "BD", "TDS", "QDS", "HS", "SOS", "STAT", "OD HS", "BD PC", "OD BBF", "TDS SOS", "bd ac"]
+FORMS = ["Tab", "Cap", "Syp", "Inj", "TAB", "tab"]
+
+
+def prescription(rng: random.Random, n_lines: int, runs: bool = True) -> str:
+    """A scanned prescription: numbered lines of form, brand, dose, schedule and duration."""
+    schedules = SCHEDULES if runs else [s for s in SCHEDULES if " " not in s]
+    lines = ["Rx", "Name: ______  Age/Sex: __  Date: __/__/2026"]
+    for i in range(1, n_lines + 1):
+        _, _, name, dose, _, _ = rng.choice(MEDICATIONS)
+        unit = rng.choice(["", " 5 ml", " 10 IU", " 500 mg", " 250 mcg"])
+        lines.append(f"{i}. {rng.choice(FORMS)} {name} {dose}{unit} {rng.choice(schedules)} x {rng.randint(3, 30)} days")
+        if rng.random() < 0.2:
+            lines.append("   Advice: avoid oily food, review in OPD after reports; good hydration")
+    return "\n".join(lines)
+
+
+def random_chunks(rng: random.Random, text: str) -> list:
+    cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(1, 40))))
+    return [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+
+
+def _throughput(fn, docs: list, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for doc in docs:
+            fn(doc)
+        best = min(best, time.perf_counter() - start)
+    return len(docs) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--lines", type=int, default=300, help="prescription lines per document")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for _ in range(200):
+        text = prescription(rng, 20, runs=False)
+        assert decode_prescription_abbreviations(text) == legacy_decode(text), f"decode mismatch: {text!r}"
+        text = prescription(rng, 20)
+        streamed = "".join(decode_prescription_stream(random_chunks(rng, text)))
+        assert streamed == decode_prescription_abbreviations(text), f"stream mismatch: {text!r}"
+    print("equivalence: 200 single-abbreviation docs match legacy; 200 chunked streams match whole-text decode")
+
+    docs = [prescription(rng, args.lines) for _ in range(args.docs)]
+    chars = sum(map(len, docs)) / len(docs)
+    print(f"decode on {args.docs} docs × {args.lines} lines (~{chars / 1024:.1f} KB each)")
+    print(f"{'implementation':<16} {'docs/s':>10} {'MB/s':>8}")
+    results = {}
+    for name, fn in [
+        ("legacy", legacy_decode),
+        ("compiled", decode_prescription_abbreviations),
+        ("stream (4 KB)", lambda d: "".join(decode_prescription_stream(d[i:i + 4096] for i in range(0, len(d), 4096)))),
+    ]:
+        rate = _throughput(fn, docs, args.rounds)
+        results[name] = rate
+        print(f"{name:<16} {rate:>10.0f} {rate * chars / 1e6:>8.2f}")
+    print(f"speedup: {results['compiled'] / results['legacy']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark: census-wide risk scoring, risk_batch.score_patients vs calculate_risk_score per patient.
+
+Builds a synthetic census — ages, vitals series straddling every threshold
+(some NULL, some drifting for the trend factor), medications, encounter complaints from corpus.py with risk keywords
+mixed in, flagged labs and allergies — as flat table rows, then scores it
+both ways and checks every result is identical:
+
+    python benchmarks/bench_risk_batch.py --patients 1000 10000 50000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from corpus import complaint
+from risk_batch import assemble_records, score_patients
+from risk_scorer import calculate_risk_score, current_rules
+
+VITAL_RANGES = {
+    "heart_rate": (40, 140),
+    "blood_pressure_systolic": (80, 200),
+    "blood_pressure_diastolic": (50, 110),
+    "temperature": (34.5, 40.5),
+    "oxygen_saturation": (85, 100),
+    "respiratory_rate": (8, 30),
+}
+LAB_TESTS = ["troponin", "ns1", "dengue", "crp", "platelet count", "hba1c", "serum creatinine", "hemoglobin"]
+# Every keyword of the active rules, in upper and lower case ("TB" as a word and inside "stubborn")
+KEYWORDS = [kw for spec in current_rules().specs.values() if spec["kind"] == "keywords"
+            for _, _, keywords in spec["groups"] for kw in keywords] + ["TB", "stubborn"]
+NOW = datetime(2026, 3, 1, 12, 0)
+
+
+def vitals_series(pid: str, rng: random.Random) -> list:
+    """A patient's vitals, newest first: a baseline per measurement, some drifting, readings 5-60 min apart."""
+    newest = NOW - timedelta(minutes=rng.randint(0, 72 * 60))
+    interval = rng.choice([5, 10, 15, 30, 60])
+    drift = {key: rng.choice([0, 0, 1, -1]) * rng.uniform(0, (hi - lo) / 12) for key, (lo, hi) in VITAL_RANGES.items()}
+    base = {key: rng.uniform(lo, hi) for key, (lo, hi) in VITAL_RANGES.items()}
+    rows = []
+    for k in range(rng.choice([0, 1, 1, 2, 3, 6, 12, 40])):
+        hours_ago = k * interval / 60
+        row = {"patient_id": pid, "timestamp": None if rng.random() < 0.01 else
+               (newest - timedelta(hours=hours_ago)).isoformat()}
+        for key, (lo, hi) in VITAL_RANGES.items():
+            value = min(max(base[key] - drift[key] * hours_ago + rng.gauss(0, (hi - lo) / 60), lo), hi)
+            row[key] = None if rng.random() < 0.05 else round(value, 1) if key == "temperature" else round(value)
+        rows.append(row)
+    return rows
+
+
+def census(n: int, rng: random.Random) -> dict:
+    """Table name -> rows for `n` patients; vitals and encounters newest first per patient."""
+    tables = {name: [] for name in ("patients", "encounters", "medications", "vitals", "allergies", "lab_results")}
+    for i in range(n):
+        pid = f"P{i:06d}"
+        tables["patients"].append({"patient_id": pid, "age": None if rng.random() < 0.02 else rng.choice([0, 1, 2]) if rng.random() < 0.05
+                                   else rng.randint(0, 95)})
+        tables["vitals"].extend(vitals_series(pid, rng))
+        for _ in range(rng.choice([0, 1, 2])):
+            text = complaint(rng, 0.5)
+            if rng.random() < 0.5:
+                text += ", " + ", ".join(rng.sample(KEYWORDS, rng.randint(1, 4)))
+            tables["encounters"].append({"patient_id": pid, "symptoms": text.capitalize(),
+                                         "chief_complaint": rng.choice(["", "Fever", "Chest pain", None])})
+        for _ in range(rng.randint(0, 7)):
+            tables["medications"].append({"patient_id": pid, "status": rng.choice(["Active", "Active", "active", "Stopped"])})
+        for _ in range(rng.randint(0, 4)):
+            tables["lab_results"].append({"patient_id": pid, "test_name": rng.choice(LAB_TESTS).title(),
+                                          "flag": rng.choice(["HIGH", "LOW", "NORMAL", "high", None])})
+        for _ in range(rng.choice([0, 0, 1, 2])):
+            tables["allergies"].append({"patient_id": pid, "severity": rng.choice(["severe", "Severe", "moderate", "mild"])})
+    return tables
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--patients", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--seed", type=int, default=21)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'patients':>9} {'batch s':>9} {'per patient s':>14} {'speedup':>8}  {'trending':>8}  levels")
+    for n in args.patients:
+        tables = census(n, rng)
+        children = {name: rows for name, rows in tables.items() if name != "patients"}
+
+        start = time.perf_counter()
+        batch = score_patients(tables["patients"], **children)
+        batch_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        records = assemble_records(tables["patients"], **children)
+        scalar = {pid: calculate_risk_score(record) for pid, record in records.items()}
+        scalar_s = time.perf_counter() - start
+
+        assert batch == scalar, next(pid for pid in scalar if batch[pid] != scalar[pid])
+        levels = {}
+        for risk in batch.values():
+            levels[risk["triage_level"]] = levels.get(risk["triage_level"], 0) + 1
+        trending = sum(1 for risk in batch.values() if risk["breakdown"]["trend"])
+        print(f"{n:>9} {batch_s:>9.3f} {scalar_s:>14.3f} {scalar_s / batch_s:>7.1f}x  {trending:>8}  "
+              + " ".join(f"{lv}={levels.get(lv, 0)}" for lv in ("BLACK", "RED", "YELLOW", "GREEN")))
+
+
+if __name__ == "__main__":
+    main()
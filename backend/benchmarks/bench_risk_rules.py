@@ -0,0 +1,170 @@
+"""Benchmark: risk_rules.json compiled at load vs the hard-coded scorer it replaced.
+
+LEGACY below is a frozen copy of risk_scorer's factor functions from before
+the rule tables. Scores on a synthetic census (bench_risk_batch.census) must
+match it exactly, except for two intended fixes the rule file makes:
+
+- age <= 1 scores the neonatal 14 points (the old elif chain checked <= 5
+  first, so they were unreachable);
+- "TB" matches as a whole word (the old list compared "TB" against
+  lowercased text, so it never matched).
+
+    python benchmarks/bench_risk_rules.py --patients 20000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_risk_batch import census
+from risk_batch import assemble_records
+from risk_scorer import calculate_risk_score, current_rules, score_breakdown, trend_factor
+
+
+# ─── Legacy scorer (frozen) ──────────────────────────────────────────────────
+
+HIGH_SEVERITY_KEYWORDS = [
+    "chest pain", "seene mein dard", "seizure", "unconscious", "anaphylaxis",
+    "stroke", "hemorrhage", "cardiac arrest", "respiratory failure", "sepsis",
+    "radiating", "diaphoresis", "rebound tenderness",
+    "dengue", "dengue hemorrhagic", "typhoid", "malaria", "falciparum",
+    "meningitis", "encephalitis", "snakebite", "hematemesis",
+    "platelet count low", "ns1 positive",
+]
+MEDIUM_SEVERITY_KEYWORDS = [
+    "severe", "tez", "bahut", "worsening", "badh rahi",
+    "acute", "persistent", "high fever", "tez bukhar",
+    "confusion", "non-compliant", "exacerbation",
+    "chikungunya", "leptospirosis", "scrub typhus",
+    "TB", "tuberculosis",
+]
+CRITICAL_LAB_TESTS = ["troponin", "ns1", "dengue", "crp"]
+
+
+def _value(row: dict, key: str, default):
+    value = row.get(key)
+    return default if value is None else value
+
+
+def age_factor(patient: dict, fixed: bool) -> int:
+    age = _value(patient, "age", 30)
+    if age >= 75:
+        return 15
+    elif age >= 65:
+        return 12
+    elif age >= 50:
+        return 8
+    elif fixed and age <= 1:
+        return 14
+    elif age <= 5:
+        return 10
+    return 3
+
+
+def vitals_factor(vitals: list, fixed: bool) -> int:
+    score = 0
+    if vitals:
+        latest = vitals[0]
+        hr = _value(latest, "heart_rate", 75)
+        sys_bp = _value(latest, "blood_pressure_systolic", 120)
+        dia_bp = _value(latest, "blood_pressure_diastolic", 80)
+        temp = _value(latest, "temperature", 37.0)
+        spo2 = _value(latest, "oxygen_saturation", 99)
+        rr = _value(latest, "respiratory_rate", 16)
+        score += 8 if hr > 120 or hr < 50 else 4 if hr > 100 or hr < 60 else 0
+        score += 8 if sys_bp > 180 or sys_bp < 90 else 4 if sys_bp > 140 or dia_bp > 90 else 0
+        score += 6 if temp > 39.5 or temp < 35.0 else 3 if temp > 38.3 else 0
+        score += 8 if spo2 < 90 else 4 if spo2 < 94 else 0
+        score += 5 if rr > 24 or rr < 10 else 2 if rr > 20 else 0
+    return min(score, 30)
+
+
+def medications_factor(medications: list, fixed: bool) -> int:
+    active = sum(1 for m in medications if m.get("status") == "Active")
+    return 10 if active >= 5 else 6 if active >= 3 else 3 if active >= 1 else 0
+
+
+def symptoms_factor(encounters: list, fixed: bool) -> int:
+    score = 0
+    if encounters:
+        latest = encounters[0]
+        text = (_value(latest, "symptoms", "") + " " + _value(latest, "chief_complaint", "")).lower()
+        score += 5 * sum(kw in text for kw in HIGH_SEVERITY_KEYWORDS)
+        score += 3 * sum(kw in text for kw in MEDIUM_SEVERITY_KEYWORDS)
+        if fixed and re.search(r"\btb\b", text):
+            score += 3
+    return min(score, 20)
+
+
+def labs_factor(lab_results: list, fixed: bool) -> int:
+    score = 0
+    for lab in lab_results:
+        flag = _value(lab, "flag", "NORMAL").upper()
+        test_name = _value(lab, "test_name", "").lower()
+        if flag == "HIGH":
+            score += 5 if any(critical in test_name for critical in CRITICAL_LAB_TESTS) else 3
+        elif flag == "LOW":
+            score += 5 if "platelet" in test_name else 2
+    return min(score, 15)
+
+
+def allergies_factor(allergies: list, fixed: bool) -> int:
+    severe = sum(1 for a in allergies if _value(a, "severity", "").lower() == "severe")
+    return min(severe * 5 + len(allergies), 10)
+
+
+LEGACY = {
+    "age": ("patients", age_factor),
+    "vitals": ("vitals", vitals_factor),
+    "trend": ("vitals", lambda vitals, fixed: trend_factor(vitals)),
+    "medications": ("medications", medications_factor),
+    "symptoms": ("encounters", symptoms_factor),
+    "labs": ("lab_results", labs_factor),
+    "allergies": ("allergies", allergies_factor),
+}
+
+
+def legacy_score(record: dict, fixed: bool) -> dict:
+    return score_breakdown({
+        factor: fn(record if table == "patients" else record.get(table, []), fixed)
+        for factor, (table, fn) in LEGACY.items()
+    })
+
+
+# ─── Benchmark ───────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--patients", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=24)
+    args = parser.parse_args()
+
+    rules = current_rules()
+    tables = census(args.patients, random.Random(args.seed))
+    records = list(assemble_records(tables["patients"], **{k: v for k, v in tables.items() if k != "patients"}).values())
+
+    start = time.perf_counter()
+    legacy = [legacy_score(record, fixed=False) for record in records]
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = [calculate_risk_score(record, rules) for record in records]
+    compiled_s = time.perf_counter() - start
+
+    for record, risk in zip(records, compiled):
+        assert risk == legacy_score(record, fixed=True), record["patient_id"]
+    changed = [(old, new) for old, new in zip(legacy, compiled) if old != new]
+    relevelled = sum(old["triage_level"] != new["triage_level"] for old, new in changed)
+
+    print(f"rules {rules.key}: {len(records)} patients identical to the legacy scorer with both fixes")
+    print(f"fixes change {len(changed)} scores ({relevelled} triage levels)")
+    for label, seconds in (("legacy", legacy_s), ("compiled", compiled_s)):
+        print(f"{label:>9}: {seconds:6.3f} s  ({seconds / len(records) * 1e6:6.1f} µs per patient)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark: vitals_trend ring updates vs rebuilding the trend from stored rows.
+
+Streams monitor-style readings (some drifting, some NULL, some backdated)
+into one VitalsSeries per patient, and after every reading checks the ring's
+points and summary against a series rebuilt from the patient's newest
+TREND_CAPACITY rows — what a reload from the vitals table sees:
+
+    python benchmarks/bench_vitals_trend.py --patients 200 --readings 300
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from vitals_trend import TREND_CAPACITY, VitalsSeries, parse_seconds
+
+BASELINES = {
+    "heart_rate": (80, 15),
+    "blood_pressure_systolic": (125, 20),
+    "temperature": (37.0, 0.8),
+    "oxygen_saturation": (97, 2),
+    "respiratory_rate": (16, 3),
+}
+
+
+def readings(pid: str, count: int, rng: random.Random):
+    """(row, in_order) for one patient's feed; ~2% are backdated behind the newest reading."""
+    now = datetime(2026, 3, 1, 8, 0)
+    drift = {key: rng.choice([0, 1, -1]) * rng.uniform(0, spread / 2) for key, (_, spread) in BASELINES.items()}
+    for k in range(count):
+        now += timedelta(minutes=rng.choice([5, 10, 15]))
+        at = now - timedelta(minutes=rng.randint(20, 90)) if rng.random() < 0.02 else now
+        hours = (at - datetime(2026, 3, 1, 8, 0)).total_seconds() / 3600
+        row = {"vital_id": f"{pid}-{k}", "patient_id": pid, "timestamp": at.isoformat()}
+        for key, (mean, spread) in BASELINES.items():
+            value = mean + drift[key] * hours + rng.gauss(0, spread / 10)
+            row[key] = None if rng.random() < 0.05 else round(value, 1) if key == "temperature" else round(value)
+        yield row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--patients", type=int, default=200)
+    parser.add_argument("--readings", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=23)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    ring_ns, rebuild_ns = [], []
+    reloads = scored = 0
+    for p in range(args.patients):
+        pid = f"P{p:04d}"
+        series, stored = VitalsSeries(), []
+        for row in readings(pid, args.readings, rng):
+            stored.append(row)
+            stored.sort(key=lambda r: parse_seconds(r["timestamp"]), reverse=True)  # the table's newest-first order
+
+            start = time.perf_counter_ns()
+            if not series.append(row):
+                series = VitalsSeries.from_rows(stored)  # backdated: reload, as database.py does
+                reloads += 1
+            points = series.points()
+            ring_ns.append(time.perf_counter_ns() - start)
+
+            start = time.perf_counter_ns()
+            rebuilt = VitalsSeries.from_rows(stored[:TREND_CAPACITY])
+            expected = rebuilt.points()
+            rebuild_ns.append(time.perf_counter_ns() - start)
+
+            assert points == expected and series.summary() == rebuilt.summary(), (pid, row["vital_id"])
+            scored += points > 0
+
+    for label, samples in (("ring append", ring_ns), ("rebuild", rebuild_ns)):
+        samples.sort()
+        print(f"{label:>12}: mean {statistics.fmean(samples) / 1000:7.1f} µs  "
+              f"p99 {samples[int(len(samples) * 0.99)] / 1000:7.1f} µs")
+    print(f"{len(ring_ns)} readings, {reloads} backdated reloads, {scored} with trend points — all identical")
+
+
+if __name__ == "__main__":
+    main()
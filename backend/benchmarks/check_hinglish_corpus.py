@@ -0,0 +1,108 @@
+"""Regression corpus for normalize_hinglish, built from the seed encounters.
+
+Every chief complaint, symptom line and note in seed_data.ENCOUNTERS, plus
+hand-written word-boundary cases, is normalized and compared against the
+stored expectations in baselines/hinglish_corpus.json. Each reported span is
+also checked to map back to the Hinglish phrase it replaced, and the
+normalizer is timed on 5–500 KB notes to confirm it scales linearly:
+
+    python benchmarks/check_hinglish_corpus.py            # check
+    python benchmarks/check_hinglish_corpus.py --update   # re-record expectations
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from nlp_engine import HINGLISH_MAP, normalize_hinglish_with_offsets, original_span
+from seed_data import ENCOUNTERS
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "hinglish_corpus.json")
+
+# Short keys that used to fire inside unrelated words, plus spacing/casing variants.
+BOUNDARY_CASES = [
+    "Dastavez submitted at registration desk",
+    "Dast 4-5 times since morning",
+    "Ultimately referred — ulti stopped after ondansetron",
+    "Sujanpur PHC referral, pairon mein sujan 3 din se",
+    "ULTI, DAST aur BUKHAR",
+    "Tez  bukhar\nsince 2 days",
+    "zyada peshab aana, zyada pyaas",
+    "seene mein dardnaak sthiti",
+    "khoon ki ulti (hematemesis) x1",
+    "Tharmometer thakan-free? thakan hai",
+]
+
+
+def corpus() -> list:
+    texts = [text for row in ENCOUNTERS for text in row[3:6]]
+    return texts + BOUNDARY_CASES
+
+
+def check_spans(text: str, normalized: str, spans: list) -> list:
+    problems = []
+    for start, end, orig_start, orig_end in spans:
+        phrase = " ".join(text[orig_start:orig_end].lower().split())
+        if HINGLISH_MAP.get(phrase) != normalized[start:end]:
+            problems.append(f"span {text[orig_start:orig_end]!r} -> {normalized[start:end]!r}")
+        if original_span(spans, start, end) != (orig_start, orig_end):
+            problems.append(f"original_span({start}, {end}) does not round-trip")
+    return problems
+
+
+def scaling(sizes_kb=(5, 50, 500)) -> list:
+    unit = "\n".join(corpus()) + "\n"
+    rows = []
+    for kb in sizes_kb:
+        text = (unit * (kb * 1024 // len(unit) + 1))[:kb * 1024]
+        best = float("inf")
+        for _ in range(5):
+            start = time.perf_counter()
+            normalize_hinglish_with_offsets(text)
+            best = min(best, time.perf_counter() - start)
+        rows.append((kb, best))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--update", action="store_true", help="re-record expected outputs")
+    args = parser.parse_args()
+
+    results = {}
+    failures = []
+    for text in corpus():
+        normalized, spans = normalize_hinglish_with_offsets(text)
+        results[text] = normalized
+        failures += [f"{text!r}: {p}" for p in check_spans(text, normalized, spans)]
+
+    if args.update:
+        os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"Recorded {len(results)} expectations to {BASELINE_PATH}")
+    else:
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            expected = json.load(f)
+        for text, normalized in results.items():
+            if expected.get(text) != normalized:
+                failures.append(f"{text!r}: expected {expected.get(text)!r}, got {normalized!r}")
+
+    print(f"{'note size':>10} {'ms':>8} {'µs/KB':>8}")
+    for kb, seconds in scaling():
+        print(f"{kb:>8} KB {seconds * 1e3:>8.2f} {seconds * 1e6 / kb:>8.1f}")
+
+    if failures:
+        print(f"❌ {len(failures)} corpus failure(s):")
+        for failure in failures:
+            print("  " + failure)
+        sys.exit(1)
+    print(f"✅ {len(results)} corpus texts normalized as expected")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Synthetic Hinglish clinical notes for benchmarking nlp_engine.
+
+Notes are written in the style of seed_data.ENCOUNTERS: English clinical
+prose with Hinglish complaints (often glossed in brackets), severity words,
+body parts, vitals and prescription lines. `code_mix` is the share of
+complaints written in Hinglish rather than English (0.0 = all English,
+1.0 = all Hinglish); the same seed always yields the same notes.
+
+    python benchmarks/corpus.py --words 120 --code-mix 0.5 --count 3
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from nlp_engine import BODY_PARTS, HINGLISH_MAP, ICD10_MAP, SEVERITY_KEYWORDS
+from seed_data import ENCOUNTERS, MEDICATIONS
+
+# English symptom → the Hinglish phrases that normalize to it
+_HINGLISH_FOR = {}
+for _phrase, _english in HINGLISH_MAP.items():
+    _HINGLISH_FOR.setdefault(_english, []).append(_phrase)
+SYMPTOMS = sorted(s for s in ICD10_MAP if s == s.lower())
+HINGLISH_MODIFIERS = ["tez", "bahut", "badh rahi", "jyada", "thoda", "halka", "kabhi kabhi"]
+ENGLISH_MODIFIERS = [k for k in SEVERITY_KEYWORDS if k not in HINGLISH_MODIFIERS]
+ENGLISH_PARTS = BODY_PARTS[:BODY_PARTS.index("sir")]
+HINGLISH_PARTS = BODY_PARTS[BODY_PARTS.index("sir"):]
+
+SOURCES = [note for row in ENCOUNTERS for note in row[4:6]]
+DURATIONS = ["since 2 days", "3 din se", "for 1 week", "1 hafte se", "since morning", "kal raat se", "x 5 days"]
+CLAUSES = [
+    "Referred from PHC.", "Brought in by family.", "Known case of T2DM on OHA.", "No known drug allergies.",
+    "ECG ordered stat.", "Advised CBC, LFT, RFT.", "Vitals stable.", "Non-compliant with medication.",
+    "Came from local clinic after paracetamol not working.", "Review in OPD after reports.",
+    "Denies smoking or alcohol.", "Patient conscious, oriented, afebrile at present.",
+]
+SCHEDULES = ["OD", "BD", "TDS", "QDS", "HS", "SOS", "STAT", "OD HS", "BD PC", "OD BBF"]
+
+
+def complaint(rng: random.Random, code_mix: float) -> str:
+    """One complaint: an optional modifier and body part around a symptom, in Hinglish or English."""
+    symptom = rng.choice(SYMPTOMS)
+    hinglish = _HINGLISH_FOR.get(symptom)
+    if hinglish and rng.random() < code_mix:
+        text = rng.choice(hinglish)
+        if rng.random() < 0.4:
+            text += f" ({symptom})"
+        modifiers, parts = HINGLISH_MODIFIERS, HINGLISH_PARTS
+    else:
+        text = symptom
+        modifiers, parts = ENGLISH_MODIFIERS, ENGLISH_PARTS
+    if rng.random() < 0.4:
+        text = f"{rng.choice(modifiers)} {text}"
+    english = modifiers is ENGLISH_MODIFIERS
+    if rng.random() < 0.25:
+        text = f"{text} in {rng.choice(parts)}" if english else f"{rng.choice(parts)} mein {text}"
+    if rng.random() < 0.1:
+        text = f"no {text}" if english else f"{text} nahi"
+    return text
+
+
+def prescription_line(rng: random.Random) -> str:
+    _, _, name, dose, _, _ = rng.choice(MEDICATIONS)
+    form = rng.choice(["Tab", "Cap", "Syp", "Inj", "TAB"])
+    return f"{form} {name} {dose} {rng.choice(SCHEDULES)} x {rng.randint(3, 30)} days"
+
+
+def vitals(rng: random.Random) -> str:
+    return (f"BP {rng.randint(90, 200)}/{rng.randint(60, 120)}, HR {rng.randint(50, 140)}, "
+            f"SpO2 {rng.randint(84, 100)}%, Temp {rng.uniform(97, 104.5):.1f}°F")
+
+
+def clinical_note(rng: random.Random, n_words: int, code_mix: float = 0.5) -> str:
+    """A note of roughly `n_words` words mixing complaints, clinical prose, vitals and prescriptions."""
+    sentences, words = [], 0
+    while words < n_words:
+        roll = rng.random()
+        if roll < 0.45:
+            parts = [complaint(rng, code_mix) for _ in range(rng.randint(1, 3))]
+            sentence = ", ".join(parts) + f" {rng.choice(DURATIONS)}."
+        elif roll < 0.65:
+            sentence = rng.choice(SOURCES)
+        elif roll < 0.8:
+            sentence = rng.choice(CLAUSES)
+        elif roll < 0.9:
+            sentence = vitals(rng) + "."
+        else:
+            sentence = prescription_line(rng)
+        sentences.append(sentence[0].upper() + sentence[1:])
+        words += len(sentence.split())
+    return " ".join(sentences)
+
+
+def corpus(count: int, n_words: int, code_mix: float = 0.5, seed: int = 18) -> list:
+    """`count` reproducible notes of about `n_words` words each."""
+    rng = random.Random(f"{seed}:{n_words}:{code_mix}")
+    return [clinical_note(rng, n_words, code_mix) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=3)
+    parser.add_argument("--words", type=int, default=120)
+    parser.add_argument("--code-mix", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=18)
+    args = parser.parse_args()
+    for note in corpus(args.count, args.words, args.code_mix, args.seed):
+        print(note + "\n")
+
+
+if __name__ == "__main__":
+    main()
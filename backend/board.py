@@ -0,0 +1,152 @@
+"""Live triage board — stored risk changes pushed to /ws/board clients.
+
+database.py reports each write that changes a patient's score or triage
+level to its risk listeners, on whichever thread made the write. BoardHub
+hands those changes to the event loop with call_soon_threadsafe, drops any
+that arrive after a newer input_version of the same patient, and
+coalesces them per patient for BOARD_FLUSH_MS, so a burst of writes (a
+vitals batch, a bedside monitor streaming) becomes one message carrying
+each patient's latest score. That message is serialized once, and the same
+text is queued for every client.
+
+Each client has a queue of BOARD_CLIENT_QUEUE messages, and publishing never
+waits for a client. One that falls that far behind has its backlog replaced
+by a single "resync" message (reload /api/patients), so a slow connection
+costs neither the other clients nor server memory.
+"""
+import asyncio
+import json
+import os
+
+BOARD_FLUSH_MS = float(os.environ.get("AURA_BOARD_FLUSH_MS", "250"))
+BOARD_CLIENT_QUEUE = int(os.environ.get("AURA_BOARD_CLIENT_QUEUE", "64"))
+
+RESYNC = json.dumps({"type": "resync"})
+
+
+def board_delta(patient_id: str, risk) -> dict:
+    """Compact board entry for a patient's new risk (risk None: the patient was deleted)."""
+    if risk is None:
+        return {"patient_id": patient_id, "removed": True}
+    return {"patient_id": patient_id, "score": risk["score"], "triage_level": risk["triage_level"]}
+
+
+class BoardClient:
+    """One connection's bounded outbox of serialized messages."""
+
+    def __init__(self, size: int):
+        self.queue = asyncio.Queue(maxsize=size)
+        self.resyncs = 0  # times its backlog was dropped
+
+    def offer(self, message: str):
+        if self.queue.full():
+            # Too far behind: everything queued is superseded by a reload.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            message = RESYNC
+            self.resyncs += 1
+        self.queue.put_nowait(message)
+
+    async def next(self) -> str:
+        return await self.queue.get()
+
+
+class BoardHub:
+    """Fans coalesced risk deltas out to every subscribed client.
+
+    publish() and resync() may be called from any thread; everything else
+    runs on the event loop bound by start().
+    """
+
+    def __init__(self, flush_seconds: float = BOARD_FLUSH_MS / 1000, queue_size: int = BOARD_CLIENT_QUEUE):
+        self.flush_seconds = flush_seconds
+        self.queue_size = queue_size
+        self.seq = 0  # of the last "risk" message
+        self.changes = 0  # patient changes received while clients were connected
+        self.coalesced = 0  # of those, superseded by a newer change before they were sent
+        self._loop = None
+        self._clients = set()
+        self._pending = {}  # patient_id -> latest risk since the last flush
+        self._versions = {}  # patient_id -> newest input_version seen
+        self._flush_handle = None
+
+    def start(self, loop: asyncio.AbstractEventLoop = None):
+        """Bind to the event loop (by default the running one)."""
+        self._loop = loop or asyncio.get_running_loop()
+
+    def stop(self):
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._loop = None
+
+    def subscribe(self) -> BoardClient:
+        client = BoardClient(self.queue_size)
+        self._clients.add(client)
+        return client
+
+    def unsubscribe(self, client: BoardClient):
+        self._clients.discard(client)
+
+    # ─── Any thread ──────────────────────────────────────────────────────────
+
+    def publish(self, changes: dict):
+        """Risk listener: queue {patient_id: (input_version, risk)} changes for the next flush without blocking the writer."""
+        self._call(self._merge, dict(changes))
+
+    def resync(self):
+        """Tell every client to reload the board, e.g. after the risk rules change."""
+        self._call(self._resync_all)
+
+    def _call(self, fn, *args):
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(fn, *args)
+        except RuntimeError:
+            pass  # the loop closed during shutdown
+
+    # ─── Event loop ──────────────────────────────────────────────────────────
+
+    def _merge(self, changes: dict):
+        fresh = {}
+        for patient_id, (version, risk) in changes.items():
+            if version is None:  # deleted
+                self._versions.pop(patient_id, None)
+            elif version < self._versions.get(patient_id, 0):
+                continue  # a newer write's change got here first
+            else:
+                self._versions[patient_id] = version
+            fresh[patient_id] = risk
+        if not self._clients or not fresh:
+            return  # nobody watching: clients load the current board when they connect
+        self.changes += len(fresh)
+        self.coalesced += len(self._pending.keys() & fresh.keys())
+        self._pending.update(fresh)
+        if self._flush_handle is None and self._loop is not None:
+            self._flush_handle = self._loop.call_later(self.flush_seconds, self._flush)
+
+    def _flush(self):
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        if not pending or not self._clients:
+            return
+        self.seq += 1
+        message = json.dumps({
+            "type": "risk",
+            "seq": self.seq,
+            "deltas": [board_delta(patient_id, risk) for patient_id, risk in pending.items()],
+        })
+        for client in self._clients:
+            client.offer(message)
+
+    def _resync_all(self):
+        self._pending.clear()
+        for client in self._clients:
+            while not client.queue.empty():
+                client.queue.get_nowait()
+            client.queue.put_nowait(RESYNC)
+
+
+board_hub = BoardHub()
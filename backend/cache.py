@@ -0,0 +1,106 @@
+"""In-process caching — bounded LRU with TTL expiry and hit/miss/eviction counters."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """Thread-safe LRU cache with a per-entry time-to-live.
+
+    `get_or_load` is the read-through entry point. A loader result is only
+    stored if the key was not invalidated while the loader was running, so a
+    write that lands mid-fetch can never be papered over by the stale read.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: Optional[float] = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict = OrderedDict()  # key -> (expires_at, value)
+        self._loading: dict = {}  # key -> token of the read-through load in flight
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key: Hashable, value: Any):
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value or call `loader()` and cache its (non-None) result."""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is not sentinel:
+            return value
+        token = object()
+        with self._lock:
+            self._loading[key] = token
+        try:
+            value = loader()
+        except BaseException:
+            with self._lock:
+                if self._loading.get(key) is token:
+                    del self._loading[key]
+            raise
+        with self._lock:
+            # An invalidate() (or a newer load) while we were fetching drops our token.
+            if self._loading.get(key) is token:
+                del self._loading[key]
+                if value is not None:
+                    self._store(key, value)
+        return value
+
+    def invalidate(self, key: Hashable) -> Any:
+        """Drop one key; returns the evicted value (or None)."""
+        with self._lock:
+            self._loading.pop(key, None)
+            entry = self._entries.pop(key, None)
+            self.invalidations += 1
+            return entry[1] if entry else None
+
+    def clear(self):
+        with self._lock:
+            self._loading.clear()
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
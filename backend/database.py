@@ -1,76 +1,527 @@
-"""Database layer — Supabase (Postgres) with FHIR R4 compliant schema."""
+"""Database layer — FHIR R4 compliant schema on a pluggable storage backend.
+
+Supabase (Postgres) in production, embedded SQLite offline; see storage.py.
+"""
+import base64
+import json
 import os
+import threading
 import uuid
 from datetime import date, datetime, timedelta
 from dotenv import load_dotenv
-from supabase import create_client, Client
+
+from cache import TTLCache
+from risk_batch import score_patients
+from risk_scorer import TRIAGE_LEVELS, calculate_risk_score, current_rules, score_breakdown
+from storage import RECORD_CHILDREN, Storage, StorageError, create_storage
+from vitals_trend import TREND_CAPACITY, VitalsSeries
 
 load_dotenv(os.path.join(os.path.dirname(__file__), ".env"))
 
-SUPABASE_URL = os.environ.get("SUPABASE_URL")
-SUPABASE_KEY = os.environ.get("SUPABASE_ANON_KEY")
+# Connection pool size (HTTP/2 keep-alive for Supabase). async_database runs
+# calls on a thread pool of the same size so every worker holds a warm connection.
+DB_POOL_SIZE = int(os.environ.get("AURA_DB_POOL_SIZE", "32"))
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage() -> Storage:
+    """The configured storage backend, created on first use."""
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = create_storage(DB_POOL_SIZE)
+                print(f"🗄️ Storage backend: {_storage.name}")
+    return _storage
+
+
+# Read-through cache of (aggregated record, risk score) keyed by patient_id.
+# Each write path below invalidates exactly the patient it touched. The cache
+# is per process, so the TTL bounds staleness from writes made by other workers.
+_record_cache = TTLCache(
+    max_entries=int(os.environ.get("AURA_RECORD_CACHE_SIZE", "2048")),
+    ttl_seconds=float(os.environ.get("AURA_RECORD_CACHE_TTL", "300")),
+)
+# abha_number -> patient_id, so ABHA lookups can hit the record cache too.
+_abha_cache = TTLCache(max_entries=_record_cache.max_entries, ttl_seconds=_record_cache.ttl_seconds)
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+def close_db():
+    """Release pooled connections (called on app shutdown)."""
+    global _storage
+    with _storage_lock:
+        if _storage is not None:
+            _storage.close()
+            _storage = None
 
 
 def init_db():
-    """No-op for Supabase — schema is managed via SQL Editor migration."""
-    pass
+    """Create the schema for embedded backends; Supabase is managed via SQL Editor migration."""
+    get_storage().init_schema()
 
 
 # ─── READ: Patients ──────────────────────────────────────────────────────────
 
 def get_all_patients():
-    result = supabase.table("patients").select("*").order("name").execute()
-    return result.data
+    return get_storage().select("patients", order=("name",))
+
+
+# Columns a census page may project with `fields=`. patient_id and name are
+# always returned — they form the keyset cursor.
+PATIENT_COLUMNS = (
+    "patient_id", "abha_number", "name", "dob", "age", "gender",
+    "insurance_tier", "city", "pincode", "phone", "created_at",
+)
+PATIENT_PAGE_MAX = 500
+PATIENT_SORTS = ("name", "acuity")
+# Acuity pages with patient filters scan at most this many risk_scores batches per request.
+ACUITY_SCAN_BATCHES = 10
+
+
+def _encode_cursor(values: list) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, types: tuple) -> tuple:
+    """The key values of a cursor, checked against the page's key types (a name cursor is not a score cursor)."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Malformed cursor") from e
+    if not isinstance(values, list) or len(values) != len(types) or not all(
+            isinstance(value, kind) and not isinstance(value, bool) for value, kind in zip(values, types)):
+        raise ValueError("Malformed cursor")
+    return tuple(values)
+
+
+def get_patients_page(limit: int = 50, cursor: str = None, fields: list = None,
+                      city: str = None, insurance_tier: str = None, gender: str = None,
+                      triage_level: str = None, sort: str = None):
+    """One keyset page of the census ordered by (name, patient_id), or by acuity.
+
+    Returns (rows, next_cursor). Cost is O(limit) regardless of census size:
+    the cursor becomes a `(name, patient_id) > (last_name, last_id)` range
+    predicate served by the composite (filter, name, patient_id) indexes.
+    sort="acuity" (the default when filtering by triage_level) walks the
+    risk_scores index instead; see _acuity_page.
+    """
+    limit = max(1, min(int(limit), PATIENT_PAGE_MAX))
+    columns = ["patient_id", "name"] + [f for f in (fields or PATIENT_COLUMNS) if f not in ("patient_id", "name")]
+    unknown = set(columns) - set(PATIENT_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown patient fields: {', '.join(sorted(unknown))}")
+    if triage_level and triage_level not in TRIAGE_LEVELS:
+        raise ValueError(f"Unknown triage_level {triage_level!r} (expected one of {', '.join(TRIAGE_LEVELS)})")
+    sort = sort or ("acuity" if triage_level else "name")
+    if sort not in PATIENT_SORTS:
+        raise ValueError(f"Unknown sort {sort!r} (expected one of {', '.join(PATIENT_SORTS)})")
+    if triage_level and sort != "acuity":
+        raise ValueError("triage_level pages are ordered by acuity")
+
+    where = [(column, "eq", value) for column, value in
+             (("city", city), ("insurance_tier", insurance_tier), ("gender", gender)) if value]
+    if sort == "acuity":
+        if not _risk_store_available:
+            raise ValueError("sort=acuity needs the risk_scores table — run supabase_migration.sql")
+        return _acuity_page(limit, cursor, columns, where, triage_level)
+    after = _decode_cursor(cursor, (str, str)) if cursor else None
+    # Fetch one extra row to learn whether another page exists.
+    rows = get_storage().select_after("patients", columns, where, ("name", "patient_id"), after, limit + 1)
+    next_cursor = _encode_cursor([rows[limit - 1]["name"], rows[limit - 1]["patient_id"]]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+def _acuity_page(limit: int, cursor: str, columns: list, where: list, triage_level: str):
+    """Census page ordered by stored risk — (score, patient_id) descending, on the risk_scores index.
+
+    City / insurance / gender filters are applied to each scanned batch, so
+    a selective filter can return a short (even empty) page together with a
+    next_cursor: keep following it until it is None.
+    """
+    storage = get_storage()
+    risk_where = [("triage_level", "eq", triage_level)] if triage_level else []
+    after = _decode_cursor(cursor, (int, str)) if cursor else None
+    page = []
+    for _ in range(ACUITY_SCAN_BATCHES):
+        batch = storage.select_after("risk_scores", ["patient_id", "score"], risk_where,
+                                     ("-score", "-patient_id"), after, limit)
+        patients = {}
+        if batch:
+            ids = [risk["patient_id"] for risk in batch]
+            patients = {row["patient_id"]: row for row in
+                        storage.select("patients", where + [("patient_id", "in", ids)], columns=columns)}
+        for i, risk in enumerate(batch):
+            after = (risk["score"], risk["patient_id"])
+            if risk["patient_id"] in patients:
+                page.append(patients[risk["patient_id"]])
+                if len(page) == limit:
+                    more = len(batch) == limit or i < len(batch) - 1
+                    return page, _encode_cursor(list(after)) if more else None
+        if len(batch) < limit:
+            return page, None
+    return page, _encode_cursor(list(after))
 
 
 def get_patient(patient_id: str):
-    result = supabase.table("patients").select("*").eq("patient_id", patient_id).execute()
-    return result.data[0] if result.data else None
+    rows = get_storage().select("patients", [("patient_id", "eq", patient_id)])
+    return rows[0] if rows else None
 
 
 def get_patient_by_abha(abha_number: str):
-    result = supabase.table("patients").select("*").eq("abha_number", abha_number).execute()
-    return result.data[0] if result.data else None
+    rows = get_storage().select("patients", [("abha_number", "eq", abha_number)])
+    return rows[0] if rows else None
 
 
 def get_patient_encounters(patient_id: str):
-    result = supabase.table("encounters").select("*").eq("patient_id", patient_id).order("date", desc=True).execute()
-    return result.data
+    return get_storage().select("encounters", [("patient_id", "eq", patient_id)], ("-date",))
 
 
 def get_patient_medications(patient_id: str):
-    result = supabase.table("medications").select("*").eq("patient_id", patient_id).order("status").execute()
-    return result.data
+    return get_storage().select("medications", [("patient_id", "eq", patient_id)], ("status",))
 
 
 def get_patient_vitals(patient_id: str):
-    result = supabase.table("vitals").select("*").eq("patient_id", patient_id).order("timestamp", desc=True).limit(5).execute()
-    return result.data
+    return get_storage().select("vitals", [("patient_id", "eq", patient_id)], ("-timestamp",), limit=5)
 
 
 def get_patient_allergies(patient_id: str):
-    result = supabase.table("allergies").select("*").eq("patient_id", patient_id).execute()
-    return result.data
+    return get_storage().select("allergies", [("patient_id", "eq", patient_id)])
 
 
 def get_patient_lab_results(patient_id: str):
-    result = supabase.table("lab_results").select("*").eq("patient_id", patient_id).order("date", desc=True).execute()
-    return result.data
+    return get_storage().select("lab_results", [("patient_id", "eq", patient_id)], ("-date",))
 
 
-def get_full_patient_record(patient_id: str):
-    """Aggregate all data for a patient into a single dict."""
-    patient = get_patient(patient_id)
-    if not patient:
+def _fetch_full_record(column: str, value: str):
+    """Patient plus child collections — a single embedded select on Supabase."""
+    return get_storage().full_record(column, value)
+
+
+def _score_record(record):
+    if not record:
         return None
-    patient["encounters"] = get_patient_encounters(patient_id)
-    patient["medications"] = get_patient_medications(patient_id)
-    patient["vitals"] = get_patient_vitals(patient_id)
-    patient["allergies"] = get_patient_allergies(patient_id)
-    patient["lab_results"] = get_patient_lab_results(patient_id)
-    return patient
+    risk = get_risk_scores([record["patient_id"]]).get(record["patient_id"])
+    return record, risk or calculate_risk_score(record)
+
+
+def get_scored_patient_record(patient_id: str):
+    """Cached (record, risk) for a patient; (None, None) if the patient doesn't exist.
+
+    The returned dicts are shared with the cache — treat them as read-only.
+    """
+    entry = _record_cache.get_or_load(patient_id, lambda: _score_record(_fetch_full_record("patient_id", patient_id)))
+    return entry if entry else (None, None)
+
+
+def get_scored_patient_record_by_abha(abha_number: str):
+    """Cached (record, risk) looked up by 14-digit ABHA number."""
+    patient_id = _abha_cache.get(abha_number)
+    if patient_id:
+        record, risk = get_scored_patient_record(patient_id)
+        if record and record.get("abha_number") == abha_number:
+            return record, risk
+        _abha_cache.invalidate(abha_number)
+    entry = _score_record(_fetch_full_record("abha_number", abha_number))
+    if not entry:
+        return None, None
+    patient_id = entry[0]["patient_id"]
+    _record_cache.put(patient_id, entry)
+    _abha_cache.put(abha_number, patient_id)
+    return entry
+
+
+def get_full_patient_record(patient_id: str):
+    """Aggregate all data for a patient into a single dict (one round trip, cached)."""
+    return get_scored_patient_record(patient_id)[0]
+
+
+def get_full_patient_record_by_abha(abha_number: str):
+    """Same aggregate as get_full_patient_record, keyed by 14-digit ABHA number."""
+    return get_scored_patient_record_by_abha(abha_number)[0]
+
+
+def invalidate_patient(patient_id: str):
+    """Drop a patient's cached record after any write that touches it."""
+    if patient_id:
+        _record_cache.invalidate(patient_id)
+
+
+def _after_write(table: str, patient_ids, rows=()):
+    """Bring stored risk up to date with a write of `rows` to `table`, then drop the cached records."""
+    patient_ids = [patient_id for patient_id in dict.fromkeys(patient_ids) if patient_id]
+    if patient_ids:
+        refresh_risk_scores(patient_ids, table, rows)
+    for patient_id in patient_ids:
+        invalidate_patient(patient_id)
+
+
+def _invalidate_owner(table: str, rows: list):
+    """Refresh and invalidate the patients owning the rows returned by an update/delete."""
+    _after_write(table, [row.get("patient_id") for row in rows or []])
+
+
+def record_cache_stats() -> dict:
+    return {"records": _record_cache.stats(), "abha_index": _abha_cache.stats()}
+
+
+# ─── Risk Scores (materialized) ──────────────────────────────────────────────
+# risk_scores stores each patient's risk_scorer result. A write recomputes
+# only the factors its table feeds (see risk_rules.json) from that table
+# alone; reads are a primary-key lookup, and acuity pages walk its
+# (score, patient_id) index. input_version increments with every change and
+# guards the read-modify-write of the stored breakdown. rules_version records
+# the ruleset a score was computed under: after the rules change, a stored
+# score counts as missing and is recomputed from scratch.
+
+RISK_UPDATE_ATTEMPTS = 5
+RISK_BUILD_CHUNK = 500  # patients per full_records fetch when scoring from scratch
+
+# Flipped off the first time the risk_scores table is unavailable (e.g. the
+# Supabase migration has not been run): risk is then computed on every read.
+_risk_store_available = True
+
+_CHILD_QUERIES = {table: (order, limit) for table, order, limit in RECORD_CHILDREN}
+
+# Each patient's recent vitals as a vitals_trend ring, so a vitals write
+# updates the vitals and trend factors in O(1) rather than re-reading the
+# series. A ring is trusted only while the stored input_version equals its
+# synced_version (the version this process last stored from it): any write
+# it didn't see — another worker's, a reseed — moves the version on, and
+# the ring is reloaded from the vitals table.
+_trend_cache = TTLCache(max_entries=int(os.environ.get("AURA_TREND_CACHE_SIZE", "4096")), ttl_seconds=None)
+_trend_lock = threading.Lock()
+
+
+def _risk_store_failed(e: StorageError):
+    global _risk_store_available
+    if _risk_store_available:
+        print(f"⚠️ risk_scores unavailable ({e.message}) — run supabase_migration.sql; scoring on every read.")
+    _risk_store_available = False
+
+
+def _risk_fields(risk: dict, input_version: int, rules) -> dict:
+    return {
+        "score": risk["score"],
+        "triage_level": risk["triage_level"],
+        "breakdown": risk["breakdown"],
+        "input_version": input_version,
+        "rules_version": rules.key,
+        "updated_at": datetime.now().isoformat(),
+    }
+
+
+def _factor_inputs(patient_ids: list, table: str) -> dict:
+    """{patient_id: what `table`'s factors read} — the patient row, or its rows in record order."""
+    storage = get_storage()
+    if table == "patients":
+        inputs = {patient_id: {} for patient_id in patient_ids}
+        inputs.update((row["patient_id"], row) for row in storage.select_all("patients", [("patient_id", "in", patient_ids)]))
+        return inputs
+    order, limit = _CHILD_QUERIES[table]
+    inputs = {patient_id: [] for patient_id in patient_ids}
+    where = [("patient_id", "in", patient_ids)]
+    if len(patient_ids) == 1 and limit is not None:
+        # One patient: let the query apply the record limit (only the newest vitals are read).
+        selected = storage.select(table, where, order, limit)
+    else:
+        selected = storage.select_all(table, where, order)
+    for row in selected:
+        rows = inputs[row["patient_id"]]
+        if limit is None or len(rows) < limit:
+            rows.append(row)
+    return inputs
+
+
+def _load_series(patient_ids: list) -> dict:
+    series = {patient_id: VitalsSeries.from_rows(rows) for patient_id, rows in _factor_inputs(patient_ids, "vitals").items()}
+    for patient_id, ring in series.items():
+        _trend_cache.put(patient_id, ring)
+    return series
+
+
+def _vitals_series(versions: dict, rows) -> dict:
+    """{patient_id: VitalsSeries} current as of `versions`, with the just-written `rows` appended."""
+    series, stale = {}, []
+    for patient_id, version in versions.items():
+        ring = _trend_cache.get(patient_id)
+        if ring is not None and ring.synced_version == version:
+            series[patient_id] = ring
+        else:
+            stale.append(patient_id)
+    if stale:
+        series.update(_load_series(stale))
+    written = {}
+    for row in rows:
+        written.setdefault(row["patient_id"], []).append(row)
+    with _trend_lock:
+        # A backdated reading can't be appended: reload that series (the table already has it).
+        backdated = [patient_id for patient_id, new_rows in written.items()
+                     if patient_id in series and not series[patient_id].extend(new_rows)]
+    if backdated:
+        series.update(_load_series(backdated))
+    return series
+
+
+def get_risk_scores(patient_ids: list) -> dict:
+    """{patient_id: risk} from the stored scores — one lookup for many patients; unscored ones are scored now."""
+    if not patient_ids:
+        return {}
+    rules = current_rules()
+    if not _risk_store_available:
+        return _score_records(patient_ids, rules)
+    try:
+        rows = get_storage().select_all("risk_scores", [("patient_id", "in", list(patient_ids))])
+    except StorageError as e:
+        _risk_store_failed(e)
+        return _score_records(patient_ids, rules)
+    risks = {row["patient_id"]: score_breakdown(row["breakdown"]) for row in rows if row["rules_version"] == rules.key}
+    missing = [patient_id for patient_id in patient_ids if patient_id not in risks]
+    if missing:
+        risks.update(rebuild_risk_scores(missing, rules))
+    return risks
+
+
+def refresh_risk_scores(patient_ids: list, table: str, rows=()) -> dict:
+    """Recompute the factors `table` feeds after a write of `rows` to it, and store the new risks.
+
+    Only `table` is re-read (vitals come from the trend rings, which take the
+    written rows); the other factors come from the stored breakdown.
+    Each update is conditional on the input_version that was read, so when a
+    concurrent write to the same patient commits first this one re-reads and
+    retries instead of overwriting that write's factor. Patients with no
+    stored score under the current rules are scored from scratch.
+    Risk listeners hear about the patients whose score or triage level changed.
+    """
+    rules = current_rules()
+    factors = rules.table_factors(table)
+    if not _risk_store_available or not factors:
+        return {}
+    storage = get_storage()
+    risks, changed, pending = {}, {}, list(patient_ids)
+    for _ in range(RISK_UPDATE_ATTEMPTS):
+        try:
+            current = storage.select("risk_scores", [("patient_id", "in", pending)])
+        except StorageError as e:
+            _risk_store_failed(e)
+            return {}
+        current = [row for row in current if row["rules_version"] == rules.key]
+        if not current:
+            break
+        versions = {row["patient_id"]: row["input_version"] for row in current}
+        if table == "vitals":
+            inputs = _vitals_series(versions, rows)
+        else:
+            inputs = _factor_inputs(list(versions), table)
+        with _trend_lock:  # rings may be appended to concurrently
+            computed = {patient_id: {f: rules.factors[f][1](inputs[patient_id]) for f in factors} for patient_id in versions}
+        for row in current:
+            patient_id, version = row["patient_id"], row["input_version"]
+            risk = score_breakdown({**row["breakdown"], **computed[patient_id]})
+            if storage.update("risk_scores", _risk_fields(risk, version + 1, rules),
+                              [("patient_id", "eq", patient_id), ("input_version", "eq", version)]):
+                risks[patient_id] = risk
+                if (risk["score"], risk["triage_level"]) != (row["score"], row["triage_level"]):
+                    changed[patient_id] = (version + 1, risk)
+                ring = inputs[patient_id] if table == "vitals" else _trend_cache.get(patient_id)
+                if isinstance(ring, VitalsSeries) and (table == "vitals" or ring.synced_version == version):
+                    ring.synced_version = version + 1  # complete as of the version just stored
+        pending = [patient_id for patient_id in pending if patient_id not in risks]
+        if all(row["patient_id"] in risks for row in current):
+            break
+    _notify_risk_listeners(changed)
+    if pending:
+        risks.update(rebuild_risk_scores(pending, rules, notify=True))
+    return risks
+
+
+def _score_records(patient_ids: list, rules) -> dict:
+    """{patient_id: risk} computed from the patients' full records in one batch (risk_batch)."""
+    records = get_storage().full_records("patient_id", patient_ids)
+    tables = {table: [row for record in records for row in record[table]] for table, _, _ in RECORD_CHILDREN}
+    return score_patients(records, **tables, rules=rules)
+
+
+def rebuild_risk_scores(patient_ids, rules=None, notify: bool = False) -> dict:
+    """Score patients from scratch under `rules` (default: the active ones), RISK_BUILD_CHUNK at a time, and store the results.
+
+    With `notify`, risk listeners hear about every stored result.
+    """
+    rules = rules or current_rules()
+    storage = get_storage()
+    patient_ids, risks = list(patient_ids), {}
+    for start in range(0, len(patient_ids), RISK_BUILD_CHUNK):
+        chunk = patient_ids[start:start + RISK_BUILD_CHUNK]
+        scored = _score_records(chunk, rules)
+        risks.update(scored)
+        if not _risk_store_available:
+            continue
+        try:
+            versions = {row["patient_id"]: row["input_version"] for row in storage.select(
+                "risk_scores", [("patient_id", "in", chunk)], columns=("patient_id", "input_version"))}
+            stored = {patient_id: (versions.get(patient_id, 0) + 1, risk) for patient_id, risk in scored.items()}
+            storage.upsert("risk_scores", [
+                {"patient_id": patient_id, **_risk_fields(risk, version, rules)}
+                for patient_id, (version, risk) in stored.items()
+            ])
+        except StorageError as e:
+            _risk_store_failed(e)
+            continue
+        if notify:
+            _notify_risk_listeners(stored)
+    return risks
+
+
+def backfill_risk_scores(rebuild: bool = False) -> int:
+    """Score every patient without a current stored risk (every patient with `rebuild`); returns how many.
+
+    A stored risk is current when it was computed under the active rules, so
+    this also rescores everyone after the rules change.
+    """
+    rules = current_rules()
+    patient_ids = [row["patient_id"] for row in _fetch_all_rows("patients", "patient_id", columns=("patient_id",))]
+    if not rebuild:
+        try:
+            scored = {row["patient_id"] for row in _fetch_all_rows("risk_scores", "patient_id", columns=("patient_id", "rules_version"))
+                      if row["rules_version"] == rules.key}
+        except StorageError as e:
+            _risk_store_failed(e)
+            return 0
+        patient_ids = [patient_id for patient_id in patient_ids if patient_id not in scored]
+    if not _risk_store_available:
+        return 0
+    rebuild_risk_scores(patient_ids, rules)
+    return len(patient_ids)
+
+
+# ─── Risk Change Listeners ───────────────────────────────────────────────────
+# Called on the writing thread with {patient_id: (input_version, risk)} after a
+# write changes stored scores — (None, None) for a deleted patient. Writes to
+# the same patient on two threads can notify out of order; the input_version
+# tells which is newer. main.py feeds /ws/board.
+
+_risk_listeners = []
+
+
+def add_risk_listener(listener):
+    _risk_listeners.append(listener)
+
+
+def remove_risk_listener(listener):
+    if listener in _risk_listeners:
+        _risk_listeners.remove(listener)
+
+
+def _notify_risk_listeners(changes: dict):
+    if not changes:
+        return
+    for listener in list(_risk_listeners):
+        try:
+            listener(changes)
+        except Exception as e:
+            print(f"⚠️ Risk listener failed: {e}")
 
 
 # ─── CRUD: Patients ──────────────────────────────────────────────────────────
@@ -89,7 +540,8 @@ def create_patient(data: dict) -> dict:
         "pincode": data.get("pincode"),
         "phone": data.get("phone"),
     }
-    supabase.table("patients").insert(row).execute()
+    get_storage().insert("patients", row)
+    _after_write("patients", [patient_id])
     return get_patient(patient_id)
 
 
@@ -99,14 +551,19 @@ def update_patient(patient_id: str, data: dict) -> dict:
         if key in data:
             update_fields[key] = data[key]
     if update_fields:
-        supabase.table("patients").update(update_fields).eq("patient_id", patient_id).execute()
+        get_storage().update("patients", update_fields, [("patient_id", "eq", patient_id)])
+        _after_write("patients", [patient_id])
     return get_patient(patient_id)
 
 
 def delete_patient(patient_id: str) -> bool:
-    # CASCADE handles child records automatically in Supabase/Postgres
-    result = supabase.table("patients").delete().eq("patient_id", patient_id).execute()
-    return len(result.data) > 0 if result.data else False
+    # ON DELETE CASCADE handles child records in both backends
+    deleted = get_storage().delete("patients", [("patient_id", "eq", patient_id)])
+    invalidate_patient(patient_id)
+    _trend_cache.invalidate(patient_id)
+    if deleted:
+        _notify_risk_listeners({patient_id: (None, None)})
+    return bool(deleted)
 
 
 # ─── CRUD: Encounters ────────────────────────────────────────────────────────
@@ -121,29 +578,35 @@ def create_encounter(patient_id: str, data: dict) -> dict:
         "symptoms": data.get("symptoms", ""),
         "notes": data.get("notes", ""),
     }
-    supabase.table("encounters").insert(row).execute()
+    get_storage().insert("encounters", row)
+    _after_write("encounters", [patient_id])
     return {"encounter_id": encounter_id, "patient_id": patient_id, **data}
 
 
 def delete_encounter(encounter_id: str) -> bool:
-    result = supabase.table("encounters").delete().eq("encounter_id", encounter_id).execute()
-    return len(result.data) > 0 if result.data else False
+    deleted = get_storage().delete("encounters", [("encounter_id", "eq", encounter_id)])
+    _invalidate_owner("encounters", deleted)
+    return bool(deleted)
 
 
 # ─── CRUD: Medications ───────────────────────────────────────────────────────
 
-def create_medication(patient_id: str, data: dict) -> dict:
-    med_id = data.get("med_id", f"M{uuid.uuid4().hex[:8].upper()}")
-    row = {
-        "med_id": med_id,
+def _medication_row(patient_id: str, data: dict) -> dict:
+    return {
+        "med_id": data.get("med_id", f"M{uuid.uuid4().hex[:8].upper()}"),
         "patient_id": patient_id,
         "drug_name": data["drug_name"],
         "dosage": data.get("dosage", ""),
         "frequency": data.get("frequency", "OD"),
         "status": data.get("status", "active"),
     }
-    supabase.table("medications").insert(row).execute()
-    return {"med_id": med_id, "patient_id": patient_id, **data}
+
+
+def create_medication(patient_id: str, data: dict) -> dict:
+    row = _medication_row(patient_id, data)
+    get_storage().insert("medications", row)
+    _after_write("medications", [patient_id])
+    return {"med_id": row["med_id"], "patient_id": patient_id, **data}
 
 
 def update_medication(med_id: str, data: dict) -> bool:
@@ -153,21 +616,28 @@ def update_medication(med_id: str, data: dict) -> bool:
             update_fields[key] = data[key]
     if not update_fields:
         return False
-    supabase.table("medications").update(update_fields).eq("med_id", med_id).execute()
-    return True
+    updated = get_storage().update("medications", update_fields, [("med_id", "eq", med_id)])
+    _invalidate_owner("medications", updated)
+    return bool(updated)
 
 
 def delete_medication(med_id: str) -> bool:
-    result = supabase.table("medications").delete().eq("med_id", med_id).execute()
-    return len(result.data) > 0 if result.data else False
+    deleted = get_storage().delete("medications", [("med_id", "eq", med_id)])
+    _invalidate_owner("medications", deleted)
+    return bool(deleted)
 
 
 # ─── CRUD: Vitals ────────────────────────────────────────────────────────────
 
-def create_vitals(patient_id: str, data: dict) -> dict:
-    vital_id = data.get("vital_id", f"V{uuid.uuid4().hex[:8].upper()}")
-    row = {
-        "vital_id": vital_id,
+VITAL_MEASUREMENTS = (
+    "heart_rate", "blood_pressure_systolic", "blood_pressure_diastolic",
+    "temperature", "oxygen_saturation", "respiratory_rate",
+)
+
+
+def _vitals_row(patient_id: str, data: dict) -> dict:
+    return {
+        "vital_id": data.get("vital_id", f"V{uuid.uuid4().hex[:8].upper()}"),
         "patient_id": patient_id,
         "timestamp": data.get("timestamp", datetime.now().isoformat()),
         "heart_rate": data.get("heart_rate"),
@@ -177,8 +647,13 @@ def create_vitals(patient_id: str, data: dict) -> dict:
         "oxygen_saturation": data.get("oxygen_saturation"),
         "respiratory_rate": data.get("respiratory_rate"),
     }
-    supabase.table("vitals").insert(row).execute()
-    return {"vital_id": vital_id, "patient_id": patient_id, **data}
+
+
+def create_vitals(patient_id: str, data: dict) -> dict:
+    row = _vitals_row(patient_id, data)
+    get_storage().insert("vitals", row)
+    _after_write("vitals", [patient_id], [row])
+    return {"vital_id": row["vital_id"], "patient_id": patient_id, **data}
 
 
 # ─── CRUD: Allergies ─────────────────────────────────────────────────────────
@@ -192,21 +667,22 @@ def create_allergy(patient_id: str, data: dict) -> dict:
         "severity": data.get("severity", "moderate"),
         "reaction": data.get("reaction", ""),
     }
-    supabase.table("allergies").insert(row).execute()
+    get_storage().insert("allergies", row)
+    _after_write("allergies", [patient_id])
     return {"allergy_id": allergy_id, "patient_id": patient_id, **data}
 
 
 def delete_allergy(allergy_id: str) -> bool:
-    result = supabase.table("allergies").delete().eq("allergy_id", allergy_id).execute()
-    return len(result.data) > 0 if result.data else False
+    deleted = get_storage().delete("allergies", [("allergy_id", "eq", allergy_id)])
+    _invalidate_owner("allergies", deleted)
+    return bool(deleted)
 
 
 # ─── CRUD: Lab Results ───────────────────────────────────────────────────────
 
-def create_lab_result(patient_id: str, data: dict) -> dict:
-    lab_id = data.get("lab_id", f"L{uuid.uuid4().hex[:8].upper()}")
-    row = {
-        "lab_id": lab_id,
+def _lab_row(patient_id: str, data: dict) -> dict:
+    return {
+        "lab_id": data.get("lab_id", f"L{uuid.uuid4().hex[:8].upper()}"),
         "patient_id": patient_id,
         "test_name": data["test_name"],
         "result_value": data.get("result_value", ""),
@@ -215,33 +691,176 @@ def create_lab_result(patient_id: str, data: dict) -> dict:
         "date": data.get("date", date.today().isoformat()),
         "status": data.get("status", "final"),
     }
-    supabase.table("lab_results").insert(row).execute()
-    return {"lab_id": lab_id, "patient_id": patient_id, **data}
+
+
+def create_lab_result(patient_id: str, data: dict) -> dict:
+    row = _lab_row(patient_id, data)
+    get_storage().insert("lab_results", row)
+    _after_write("lab_results", [patient_id])
+    return {"lab_id": row["lab_id"], "patient_id": patient_id, **data}
+
+
+# ─── Bulk Writes ─────────────────────────────────────────────────────────────
+# Monitor feeds and lab interfaces deliver hundreds of rows at once. Each batch
+# is validated row by row, written as ONE multi-row upsert (so a resent batch
+# with the same ids is idempotent), and refreshes each touched patient's risk once.
+
+MAX_BATCH_ROWS = 1000
+
+
+def _validate_vitals(data: dict):
+    present = [k for k in VITAL_MEASUREMENTS if data.get(k) is not None]
+    if not present:
+        return "at least one vital measurement is required"
+    for key in present:
+        if isinstance(data[key], bool) or not isinstance(data[key], (int, float)):
+            return f"{key} must be a number"
+    return None
+
+
+def _validate_medication(data: dict):
+    return None if data.get("drug_name") else "drug_name is required"
+
+
+def _validate_lab(data: dict):
+    if not data.get("patient_id"):
+        return "patient_id is required"
+    return None if data.get("test_name") else "test_name is required"
+
+
+def _existing_patient_ids(patient_ids: set) -> set:
+    if not patient_ids:
+        return set()
+    rows = get_storage().select("patients", [("patient_id", "in", list(patient_ids))], columns=("patient_id",))
+    return {row["patient_id"] for row in rows}
+
+
+def _write_batch(table: str, id_key: str, rows: list, validate, build) -> dict:
+    """Validate → one upsert → one risk refresh for the touched patients. `build(data)` returns the DB row."""
+    if len(rows) > MAX_BATCH_ROWS:
+        raise ValueError(f"Batch too large: {len(rows)} rows (max {MAX_BATCH_ROWS})")
+    errors, valid = [], []
+    for index, data in enumerate(rows):
+        error = "row must be an object" if not isinstance(data, dict) else validate(data)
+        if error:
+            errors.append({"index": index, "error": error})
+        else:
+            valid.append((index, build(data)))
+
+    known = _existing_patient_ids({row["patient_id"] for _, row in valid})
+    to_write = []
+    for index, row in valid:
+        if row["patient_id"] in known:
+            to_write.append(row)
+        else:
+            errors.append({"index": index, "error": f"unknown patient_id {row['patient_id']}"})
+
+    if to_write:
+        get_storage().upsert(table, to_write)
+        _after_write(table, [row["patient_id"] for row in to_write], to_write)
+    errors.sort(key=lambda e: e["index"])
+    return {"inserted": len(to_write), "ids": [row[id_key] for row in to_write], "errors": errors}
+
+
+def create_vitals_batch(patient_id: str, rows: list) -> dict:
+    return _write_batch("vitals", "vital_id", rows, _validate_vitals, lambda d: _vitals_row(patient_id, d))
+
+
+def create_medications_batch(patient_id: str, rows: list) -> dict:
+    return _write_batch("medications", "med_id", rows, _validate_medication, lambda d: _medication_row(patient_id, d))
+
+
+def create_lab_results_batch(rows: list) -> dict:
+    """Cross-patient lab ingest — every row carries its own patient_id."""
+    return _write_batch("lab_results", "lab_id", rows, _validate_lab, lambda d: _lab_row(d["patient_id"], d))
+
+
+# ─── Bulk Reads ──────────────────────────────────────────────────────────────
+
+# PostgREST caps a single response (Supabase default: 1000 rows), so catalog
+# loads walk the table in pages.
+BULK_PAGE_SIZE = 1000
+
+
+def _fetch_all_rows(table: str, *order_by: str, columns=None) -> list:
+    rows, start = [], 0
+    while True:
+        page = get_storage().select(table, order=order_by, limit=BULK_PAGE_SIZE, offset=start, columns=columns)
+        rows.extend(page)
+        if len(page) < BULK_PAGE_SIZE:
+            return rows
+        start += BULK_PAGE_SIZE
+
+
+# ─── Seeding Support ─────────────────────────────────────────────────────────
+
+def get_seed_state() -> dict:
+    """dataset -> {checksum, row_hashes} recorded by the last seed run."""
+    try:
+        rows = get_storage().select("seed_state")
+    except StorageError as e:
+        print(f"⚠️ seed_state unavailable ({e.message}) — run supabase_migration.sql; treating data as unseeded.")
+        return {}
+    return {row["dataset"]: row for row in rows}
+
+
+def save_seed_state(dataset: str, checksum: str, row_hashes: dict):
+    try:
+        get_storage().upsert("seed_state", [{
+            "dataset": dataset,
+            "checksum": checksum,
+            "row_hashes": row_hashes,
+            "applied_at": datetime.now().isoformat(),
+        }])
+    except StorageError as e:
+        print(f"⚠️ Could not record seed state for {dataset}: {e.message}")
+
+
+def upsert_rows(table: str, rows: list):
+    """Multi-row upsert in BULK_PAGE_SIZE chunks (idempotent on primary key)."""
+    for start in range(0, len(rows), BULK_PAGE_SIZE):
+        get_storage().upsert(table, rows[start:start + BULK_PAGE_SIZE])
+
+
+def delete_rows_in(table: str, column: str, values):
+    values = list(values)
+    for start in range(0, len(values), BULK_PAGE_SIZE):
+        get_storage().delete(table, [(column, "in", values[start:start + BULK_PAGE_SIZE])])
+
+
+def invalidate_all_patients():
+    """Drop every cached record — used after bulk changes such as seeding."""
+    _record_cache.clear()
+    _abha_cache.clear()
+    _trend_cache.clear()
 
 
 # ─── Jan Aushadhi Queries ────────────────────────────────────────────────────
 
 def get_jan_aushadhi_alternative(brand_name: str):
-    result = supabase.table("jan_aushadhi_drugs").select("*").ilike("brand_name", f"%{brand_name}%").eq("pmbjp_available", True).execute()
-    return result.data[0] if result.data else None
+    rows = get_storage().select("jan_aushadhi_drugs", [
+        ("brand_name", "ilike", f"%{brand_name}%"), ("pmbjp_available", "eq", True),
+    ])
+    return rows[0] if rows else None
 
 
 def get_all_jan_aushadhi_drugs():
-    result = supabase.table("jan_aushadhi_drugs").select("*").order("generic_name").execute()
-    return result.data
+    return _fetch_all_rows("jan_aushadhi_drugs", "generic_name", "drug_id")
 
 
 def get_jan_aushadhi_by_molecule(molecule: str):
-    result = supabase.table("jan_aushadhi_drugs").select("*").or_(f"molecule.ilike.%{molecule}%,generic_name.ilike.%{molecule}%").execute()
-    return result.data
+    return get_storage().select("jan_aushadhi_drugs", [(("molecule", "generic_name"), "ilike_any", f"%{molecule}%")])
 
 
 # ─── Diagnostic Center Queries ───────────────────────────────────────────────
 
+def get_all_diagnostic_centers():
+    """Every center/test row — loaded once into the lab_router spatial index."""
+    return _fetch_all_rows("diagnostic_centers", "center_id")
+
+
 def get_diagnostic_centers(test_name: str, pincode: str = None, limit: int = 3):
-    query = supabase.table("diagnostic_centers").select("*").ilike("test_name", f"%{test_name}%").order("price_inr").limit(limit)
-    result = query.execute()
-    return result.data
+    return get_storage().select("diagnostic_centers", [("test_name", "ilike", f"%{test_name}%")], ("price_inr",), limit)
 
 
 # ─── ABHA Consent ────────────────────────────────────────────────────────────
@@ -258,13 +877,13 @@ def create_consent_request(patient_id: str, doctor_id: str, purpose: str, pin: s
         "expires_at": (datetime.now() + timedelta(hours=1)).isoformat(),
         "status": "PENDING",
     }
-    supabase.table("consent_log").insert(row).execute()
+    get_storage().insert("consent_log", row)
     return consent_id
 
 
 def verify_consent(consent_id: str, pin: str) -> bool:
-    result = supabase.table("consent_log").select("*").eq("consent_id", consent_id).eq("consent_pin", pin).eq("status", "PENDING").execute()
-    if result.data:
-        supabase.table("consent_log").update({"status": "GRANTED"}).eq("consent_id", consent_id).execute()
-        return True
-    return False
+    # Conditional update: only a PENDING consent with the right PIN flips to GRANTED.
+    granted = get_storage().update("consent_log", {"status": "GRANTED"}, [
+        ("consent_id", "eq", consent_id), ("consent_pin", "eq", pin), ("status", "eq", "PENDING"),
+    ])
+    return bool(granted)
@@ -0,0 +1,132 @@
+"""Jan Aushadhi Drug Index — in-memory fuzzy search over the PMBJP generic catalog.
+
+The catalog (~2,000 SKUs) is small enough to hold in memory, so brand/generic/
+molecule lookups are served from a trigram inverted index instead of an
+`ilike '%q%'` scan per request. Matching tolerates typos and brand spellings
+such as "Dolo650", "dolo-650" or "Glycomet-GP".
+"""
+import hashlib
+import heapq
+import json
+import re
+import threading
+from collections import defaultdict
+
+from cache import TTLCache
+
+SEARCH_FIELDS = ("brand_name", "generic_name", "molecule")
+MIN_SCORE = 0.35
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_ALPHA_DIGIT = re.compile(r"(?<=[a-z])(?=\d)|(?<=\d)(?=[a-z])")
+
+
+def normalize_drug_text(text: str) -> str:
+    """'Glycomet-GP 2' → 'glycomet gp 2', 'Dolo650' → 'dolo 650'."""
+    text = _NON_ALNUM.sub(" ", (text or "").lower())
+    return " ".join(_ALPHA_DIGIT.sub(" ", text).split())
+
+
+def _trigrams(compact: str) -> set:
+    padded = f"  {compact} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _Snapshot:
+    """Immutable index built from one version of the catalog."""
+
+    def __init__(self, drugs: list):
+        self.drugs = drugs
+        # One entry per *distinct* normalized key — molecules and generic names
+        # repeat across strengths, so this is far smaller than 3 × SKUs.
+        self.keys = []  # (compact, tokens, trigram_count, [drug_idx, ...])
+        key_ids = {}
+        self.postings = defaultdict(list)  # trigram -> [key_idx, ...]
+        for drug_idx, drug in enumerate(drugs):
+            for field in SEARCH_FIELDS:
+                normalized = normalize_drug_text(drug.get(field))
+                if not normalized:
+                    continue
+                key_idx = key_ids.get(normalized)
+                if key_idx is None:
+                    compact = normalized.replace(" ", "")
+                    grams = _trigrams(compact)
+                    key_idx = key_ids[normalized] = len(self.keys)
+                    self.keys.append((compact, normalized.split(), len(grams), []))
+                    for gram in grams:
+                        self.postings[gram].append(key_idx)
+                owners = self.keys[key_idx][3]
+                if not owners or owners[-1] != drug_idx:
+                    owners.append(drug_idx)
+        self.results = TTLCache(max_entries=4096, ttl_seconds=None)
+
+    def search(self, query: str, limit: int) -> list:
+        normalized = normalize_drug_text(query)
+        if not normalized:
+            return []
+        compact = normalized.replace(" ", "")
+        grams = _trigrams(compact)
+        q_tokens = [t for t in normalized.split() if len(t) >= 3 and not t.isdigit()]
+
+        overlap = defaultdict(int)
+        for gram in grams:
+            for key_idx in self.postings.get(gram, ()):
+                overlap[key_idx] += 1
+
+        # Keys sharing under half the query's trigrams (e.g. only a "650" strength)
+        # are not meaningful matches — skip scoring them.
+        floor = max(1, len(grams) // 2)
+        best = {}  # drug_idx -> score
+        for key_idx, common in overlap.items():
+            if common < floor:
+                continue
+            key_compact, key_tokens, key_grams, owners = self.keys[key_idx]
+            score = 2 * common / (len(grams) + key_grams)  # Dice coefficient
+            if len(compact) >= 3 and compact in key_compact:
+                score = max(score, 0.9 if key_compact.startswith(compact) else 0.8)
+            if q_tokens and score < 0.75:
+                hits = sum(1 for t in q_tokens if any(k.startswith(t) for k in key_tokens))
+                score = max(score, 0.75 * hits / len(q_tokens))
+            if score < MIN_SCORE:
+                continue
+            for drug_idx in owners:
+                if score > best.get(drug_idx, 0.0):
+                    best[drug_idx] = score
+
+        # Highest score first; cheapest generic breaks ties.
+        ranked = heapq.nsmallest(
+            limit, best.items(), key=lambda item: (-item[1], self.drugs[item[0]].get("jan_aushadhi_price_inr") or 0)
+        )
+        return [{**self.drugs[i], "match_score": round(s, 3)} for i, s in ranked]
+
+
+class DrugIndex:
+    """Swappable handle to the current catalog snapshot (safe to search while reloading)."""
+
+    def __init__(self):
+        self._snapshot = _Snapshot([])
+        self._fingerprint = None
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return len(self._snapshot.drugs)
+
+    def load(self, drugs: list) -> bool:
+        """Rebuild from catalog rows; returns False (and keeps the index) if nothing changed."""
+        fingerprint = hashlib.sha256(json.dumps(drugs, sort_keys=True, default=str).encode()).hexdigest()
+        with self._lock:
+            if fingerprint == self._fingerprint:
+                return False
+            self._snapshot = _Snapshot(list(drugs))
+            self._fingerprint = fingerprint
+            return True
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """Best-matching drugs for a brand, generic or molecule query, highest score first."""
+        snapshot = self._snapshot
+        key = (query, limit)
+        return snapshot.results.get_or_load(key, lambda: snapshot.search(query, limit))
+
+
+jan_aushadhi_index = DrugIndex()
@@ -0,0 +1,247 @@
+"""Diagnostic Lab Router — nearest-and-cheapest lab selection by patient pincode.
+
+Every center row is placed on the globe from its pincode and filed into a
+per-test k-d tree. A routing query pulls the k nearest centers offering the
+test and ranks them on a blend of price, distance and turnaround time, so a
+patient in Patna is sent to a Patna lab rather than the cheapest one in Chennai.
+"""
+import csv
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+import threading
+from collections import defaultdict
+from typing import Optional
+
+EARTH_RADIUS_KM = 6371.0
+
+# Ranking weights — lower blended score is better. Each factor is min-max
+# normalised across the candidate pool before weighting.
+ROUTE_WEIGHTS = {"price": 0.5, "distance": 0.35, "turnaround": 0.15}
+
+# Candidates pulled from the k-d tree per requested result before ranking.
+CANDIDATES_PER_RESULT = 8
+
+
+# ─── Pincode → Lat/Long ──────────────────────────────────────────────────────
+# Post-office centroids for the pincodes we serve today. A full India Post
+# directory can be dropped in via AURA_PINCODE_CSV (columns: pincode,lat,lng).
+PINCODE_COORDS = {
+    "110001": (28.6328, 77.2197),  # New Delhi GPO / Connaught Place
+    "110002": (28.6415, 77.2409),  # Darya Ganj
+    "110003": (28.5894, 77.2270),  # Lodhi Road
+    "110005": (28.6519, 77.1909),  # Karol Bagh
+    "400001": (18.9388, 72.8354),  # Mumbai GPO / Fort
+    "400003": (18.9530, 72.8353),  # Masjid Bunder
+    "400005": (18.9067, 72.8147),  # Colaba
+    "560001": (12.9757, 77.6051),  # Bengaluru MG Road
+    "560002": (12.9620, 77.5775),  # Bengaluru City
+    "560005": (12.9976, 77.6150),  # Fraser Town
+    "600001": (13.0900, 80.2880),  # Chennai Parrys
+    "600005": (13.0587, 80.2757),  # Triplicane
+    "500001": (17.3916, 78.4747),  # Hyderabad Abids
+    "500003": (17.4399, 78.4983),  # Secunderabad
+    "500005": (17.3220, 78.4790),  # Chandrayangutta
+    "226001": (26.8467, 80.9462),  # Lucknow GPO
+    "221001": (25.3176, 82.9739),  # Varanasi
+    "800001": (25.6093, 85.1376),  # Patna GPO
+    "302001": (26.9124, 75.7873),  # Jaipur
+    "380001": (23.0225, 72.5714),  # Ahmedabad
+}
+
+# Sorting-district (first 3 digits) centroids — coarse fallback for pincodes
+# missing from the table above.
+PINCODE_PREFIX_COORDS = {
+    "110": (28.6139, 77.2090), "122": (28.4595, 77.0266), "160": (30.7333, 76.7794),
+    "201": (28.6692, 77.4538), "208": (26.4499, 80.3319), "221": (25.3176, 82.9739),
+    "226": (26.8467, 80.9462), "302": (26.9124, 75.7873), "380": (23.0225, 72.5714),
+    "395": (21.1702, 72.8311), "400": (19.0760, 72.8777), "411": (18.5204, 73.8567),
+    "440": (21.1458, 79.0882), "452": (22.7196, 75.8577), "462": (23.2599, 77.4126),
+    "500": (17.3850, 78.4867), "560": (12.9716, 77.5946), "600": (13.0827, 80.2707),
+    "641": (11.0168, 76.9558), "682": (9.9312, 76.2673), "700": (22.5726, 88.3639),
+    "751": (20.2961, 85.8245), "781": (26.1445, 91.7362), "800": (25.5941, 85.1376),
+    "834": (23.3441, 85.3096),
+}
+
+
+def _load_pincode_csv(path: str):
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            try:
+                PINCODE_COORDS[row["pincode"].strip()] = (float(row["lat"]), float(row["lng"]))
+            except (KeyError, ValueError):
+                continue
+
+
+if os.environ.get("AURA_PINCODE_CSV") and os.path.exists(os.environ["AURA_PINCODE_CSV"]):
+    _load_pincode_csv(os.environ["AURA_PINCODE_CSV"])
+
+
+def pincode_to_coords(pincode) -> Optional[tuple]:
+    pincode = str(pincode or "").strip()
+    return PINCODE_COORDS.get(pincode) or PINCODE_PREFIX_COORDS.get(pincode[:3])
+
+
+def _to_xyz(lat: float, lng: float) -> tuple:
+    """Unit-sphere point — Euclidean chord length is monotonic in great-circle distance."""
+    phi, lam = math.radians(lat), math.radians(lng)
+    return (math.cos(phi) * math.cos(lam), math.cos(phi) * math.sin(lam), math.sin(phi))
+
+
+def _chord_to_km(chord: float) -> float:
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+def normalize_test_name(name: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", (name or "").lower()).split())
+
+
+# ─── k-d Tree ────────────────────────────────────────────────────────────────
+
+class _KDTree:
+    """Static 3-d tree over (point, row) pairs with k-nearest-neighbour search."""
+
+    def __init__(self, items: list):
+        self.root = self._build(items, 0)
+
+    def _build(self, items: list, depth: int):
+        if not items:
+            return None
+        axis = depth % 3
+        items.sort(key=lambda it: it[0][axis])
+        mid = len(items) // 2
+        return (items[mid], axis, self._build(items[:mid], depth + 1), self._build(items[mid + 1:], depth + 1))
+
+    def nearest(self, point: tuple, k: int) -> list:
+        """[(chord_distance, row), ...] for the k closest items, nearest first."""
+        heap = []  # max-heap via negated squared distance
+        counter = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            (node_point, row), axis, left, right = node
+            d2 = (node_point[0] - point[0]) ** 2 + (node_point[1] - point[1]) ** 2 + (node_point[2] - point[2]) ** 2
+            counter += 1
+            if len(heap) < k:
+                heapq.heappush(heap, (-d2, counter, row))
+            elif d2 < -heap[0][0]:
+                heapq.heapreplace(heap, (-d2, counter, row))
+            diff = point[axis] - node_point[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            # Visit the far side only if the splitting plane is closer than the current k-th best.
+            if len(heap) < k or diff * diff < -heap[0][0]:
+                stack.append(far)
+            stack.append(near)
+        return [(math.sqrt(-d2), row) for d2, _, row in sorted(heap, reverse=True)]
+
+
+# ─── Router ──────────────────────────────────────────────────────────────────
+
+class _Snapshot:
+    def __init__(self, centers: list):
+        located = defaultdict(list)
+        self.unlocated = defaultdict(list)  # test -> rows whose pincode we can't place
+        for row in centers:
+            test = normalize_test_name(row.get("test_name"))
+            coords = pincode_to_coords(row.get("pincode"))
+            if coords:
+                located[test].append((_to_xyz(*coords), row))
+            else:
+                self.unlocated[test].append(row)
+        self.trees = {test: _KDTree(items) for test, items in located.items()}
+        self.tests = sorted(set(self.trees) | set(self.unlocated))
+        self.size = len(centers)
+
+    def matching_tests(self, test_name: str) -> list:
+        needle = normalize_test_name(test_name)
+        return [t for t in self.tests if needle in t] if needle else []
+
+
+def _rank(candidates: list, limit: int, weights: dict) -> list:
+    """Blend min-max normalised price / distance / turnaround; lowest score wins."""
+    def spread(key):
+        values = [c[key] for c in candidates if c.get(key) is not None]
+        lo, hi = (min(values), max(values)) if values else (0, 0)
+        return lo, (hi - lo) or 1.0
+
+    price_lo, price_span = spread("price_inr")
+    dist_lo, dist_span = spread("distance_km")
+    tat_lo, tat_span = spread("turnaround_hours")
+    for c in candidates:
+        # Unknown distance ranks as the farthest candidate.
+        dist = c["distance_km"] if c.get("distance_km") is not None else dist_lo + dist_span
+        c["route_score"] = round(
+            weights["price"] * ((c.get("price_inr") or 0) - price_lo) / price_span
+            + weights["distance"] * (dist - dist_lo) / dist_span
+            + weights["turnaround"] * ((c.get("turnaround_hours") or 0) - tat_lo) / tat_span,
+            4,
+        )
+    return sorted(candidates, key=lambda c: c["route_score"])[:limit]
+
+
+class LabRouter:
+    """Swappable handle to the current spatial index over diagnostic_centers rows."""
+
+    def __init__(self):
+        self._snapshot = _Snapshot([])
+        self._fingerprint = None
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._snapshot.size
+
+    def load(self, centers: list) -> bool:
+        """Rebuild from diagnostic_centers rows; returns False (and keeps the index) if nothing changed."""
+        fingerprint = hashlib.sha256(json.dumps(centers, sort_keys=True, default=str).encode()).hexdigest()
+        with self._lock:
+            if fingerprint == self._fingerprint:
+                return False
+            self._snapshot = _Snapshot(list(centers))
+            self._fingerprint = fingerprint
+            return True
+
+    def route(self, test_name: str, pincode: str = None, limit: int = 3, weights: dict = None) -> list:
+        """Best `limit` centers for a test near `pincode`, ranked by price/distance/turnaround."""
+        snapshot = self._snapshot
+        weights = weights or ROUTE_WEIGHTS
+        tests = snapshot.matching_tests(test_name)
+        origin = pincode_to_coords(pincode)
+        if not origin:
+            # No location to route from — cheapest first, as before.
+            rows = [row for t in tests for _, row in _iter_tree(snapshot.trees.get(t))] + \
+                   [row for t in tests for row in snapshot.unlocated.get(t, [])]
+            return [dict(row) for row in sorted(rows, key=lambda r: r.get("price_inr") or 0)[:limit]]
+
+        point = _to_xyz(*origin)
+        k = max(limit * CANDIDATES_PER_RESULT, 16)
+        candidates = []
+        for test in tests:
+            tree = snapshot.trees.get(test)
+            if tree:
+                for chord, row in tree.nearest(point, k):
+                    candidates.append({**row, "distance_km": round(_chord_to_km(chord), 1)})
+        candidates.sort(key=lambda c: c["distance_km"])
+        candidates = candidates[:k]
+        if len(candidates) < limit:
+            for test in tests:
+                candidates += [{**row, "distance_km": None} for row in snapshot.unlocated.get(test, [])]
+        return _rank(candidates, limit, weights)
+
+
+def _iter_tree(tree):
+    stack = [tree.root] if tree else []
+    while stack:
+        node = stack.pop()
+        if node is None:
+            continue
+        yield node[0]
+        stack.extend((node[2], node[3]))
+
+
+lab_router = LabRouter()
@@ -0,0 +1,144 @@
+"""Clinical lexicon files and the compiled artifact (SymSpell deletion table) built from them.
+
+Each lexicon is a versioned JSON file in lexicons/ ({"lexicon", "version",
+"description", "entries"}). Regional additions go in extension files next to
+it — hinglish.marathi.json, icd10.cm.json — which are merged after the base
+file in name order, later entries winning.
+
+nlp_engine compiles the merged lexicons into its matchers on every load;
+all of that is linear in the lexicon size except the SymSpell deletion
+table, which is built once per content fingerprint and stored as an
+artifact file: a small JSON header followed by the packed table. Later
+starts — and every batch worker process — read the table in place from a
+memory map instead of rebuilding it, never deserializing it, and share its
+pages through the OS cache.
+
+Trust boundary: an artifact is plain data, never code. Loading one parses
+a small JSON header and probes the packed table, so whoever can write to
+ARTIFACT_DIR can at worst make fuzzy matching wrong, not run code in the
+API or its workers. Keep the directory writable by the service user only.
+A malformed or mismatched artifact is rebuilt.
+"""
+import glob
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+LEXICON_DIR = os.environ.get("AURA_LEXICON_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "lexicons")
+# Must be writable for artifacts to persist; otherwise every start compiles in memory.
+ARTIFACT_DIR = os.environ.get("AURA_LEXICON_ARTIFACT_DIR") or os.path.join(LEXICON_DIR, ".compiled")
+
+# Lexicon name -> type of its "entries"
+LEXICON_KINDS = {
+    "prescription_abbrevs": dict,
+    "hinglish": dict,
+    "icd10": dict,
+    "severity": dict,
+    "body_parts": list,
+    "transliteration_variants": dict,
+}
+
+_MAGIC = b"AURALEX\x02"
+_HEADER = struct.Struct("<8sQ")  # magic, JSON header length
+
+
+def lexicon_files(directory: str = LEXICON_DIR) -> dict:
+    """{lexicon name: [base file, extension files...]} in merge order."""
+    files = {}
+    for kind in LEXICON_KINDS:
+        base = os.path.join(directory, f"{kind}.json")
+        if not os.path.exists(base):
+            raise ValueError(f"missing lexicon file {base}")
+        files[kind] = [base] + sorted(glob.glob(os.path.join(directory, f"{kind}.*.json")))
+    return files
+
+
+def file_signature(directory: str = LEXICON_DIR) -> tuple:
+    """(path, mtime, size) of every lexicon file — a cheap has-anything-changed check."""
+    signature = []
+    for paths in lexicon_files(directory).values():
+        for path in paths:
+            st = os.stat(path)
+            signature.append((path, st.st_mtime_ns, st.st_size))
+    return tuple(signature)
+
+
+def read_lexicons(directory: str = LEXICON_DIR) -> tuple:
+    """(merged entries by lexicon, manifest, content fingerprint) for the lexicon files.
+
+    Raises ValueError for a malformed file, so a half-written edit is never loaded.
+    """
+    digest = hashlib.sha256()
+    data, manifest = {}, []
+    for kind, paths in lexicon_files(directory).items():
+        expected = LEXICON_KINDS[kind]
+        merged = expected()
+        for path in paths:
+            with open(path, "rb") as f:
+                raw = f.read()
+            name = os.path.basename(path)
+            try:
+                doc = json.loads(raw)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                raise ValueError(f"{name}: invalid JSON ({e})")
+            entries = doc.get("entries") if isinstance(doc, dict) else None
+            if not isinstance(entries, expected) or not isinstance(doc.get("version"), str):
+                raise ValueError(f"{name}: expected a 'version' string and {expected.__name__} 'entries'")
+            if expected is dict:
+                merged.update(entries)
+            else:
+                merged += [e for e in entries if e not in merged]
+            digest.update(name.encode() + b"\0" + raw + b"\0")
+            manifest.append({"file": name, "lexicon": kind, "version": doc["version"], "entries": len(entries)})
+        data[kind] = merged
+    return data, manifest, digest.hexdigest()
+
+
+def artifact_path(fingerprint: str, fmt: int) -> str:
+    return os.path.join(ARTIFACT_DIR, f"{fingerprint[:32]}.v{fmt}.lexc")
+
+
+def write_artifact(path: str, header: dict, blob: bytes):
+    """Atomically write `header` (as JSON) followed by a raw `blob`; older artifacts are removed."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    payload = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode()
+    padding = -(_HEADER.size + len(payload)) % 8  # keep the blob 8-byte aligned
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, len(payload) + padding))
+        f.write(payload + b" " * padding)  # JSON whitespace
+        f.write(blob)
+    os.replace(tmp, path)
+    # Processes still mapping an old artifact keep reading it after the unlink.
+    for old in glob.glob(os.path.join(os.path.dirname(path), "*.lexc")):
+        if old != path:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+def read_artifact(path: str) -> tuple:
+    """(header, memory map, blob offset) for an artifact written by write_artifact.
+
+    Raises FileNotFoundError if there is none, ValueError if it is not an artifact.
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mapped) < _HEADER.size:
+        raise ValueError(f"truncated lexicon artifact {path}")
+    magic, length = _HEADER.unpack_from(mapped)
+    if magic != _MAGIC:
+        raise ValueError(f"not a lexicon artifact: {path}")
+    offset = _HEADER.size + length
+    if offset > len(mapped):
+        raise ValueError(f"truncated lexicon artifact {path}")
+    try:
+        header = json.loads(mapped[_HEADER.size:offset])
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValueError(f"corrupt lexicon artifact header {path}: {e}")
+    if not isinstance(header, dict):
+        raise ValueError(f"corrupt lexicon artifact header {path}")
+    return header, mapped, offset
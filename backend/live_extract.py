@@ -0,0 +1,153 @@
+"""Incremental symptom extraction for a note that is being edited (/ws/extract).
+
+The client sends edits as replacements ({"start", "end", "text"} over the
+current text). Only mentions near an edit can change: Hinglish phrases,
+transliteration variants, severity / body-part windows and negation scope
+all reach a bounded distance. So each edit re-runs extract_symptoms on a
+slice covering the edit plus REACH characters either side — whose mentions
+are replaced — and another REACH of context around that, so those mentions
+see exactly what a full scan would. Everything else is shifted, not rescanned.
+
+A change of symptom, ICD-10 code, severity, body part, negation or mention
+count is reported as a delta against the previous state.
+"""
+import bisect
+
+import nlp_engine
+from nlp_engine import extract_symptoms
+
+# How far (in original characters) an edit can influence a mention: the
+# 80-char severity window is measured in normalized text, which Hinglish
+# replacement can shrink ~2x, plus the transliteration-variant margin.
+REACH = 256
+_SNAP = 32  # chars a slice boundary may move outward to land on whitespace
+
+
+def _snap_left(text: str, i: int) -> int:
+    stop = max(0, i - _SNAP)
+    while i > stop and not text[i - 1].isspace():
+        i -= 1
+    return i
+
+
+def _snap_right(text: str, i: int) -> int:
+    stop = min(len(text), i + _SNAP)
+    while i < stop and not text[i].isspace():
+        i += 1
+    return i
+
+
+def _summarize(mentions: list) -> dict:
+    """{symptom: entry} in extract_symptoms' top-level shape, plus a mention count."""
+    by_symptom = {}
+    for mention in mentions:
+        by_symptom.setdefault(mention["symptom"], []).append(mention)
+    summary = {}
+    for symptom, found in by_symptom.items():
+        primary = next((m for m in found if not m["negated"]), found[0])
+        summary[symptom] = {
+            "symptom": symptom,
+            "icd10": primary["icd10"],
+            "severity": primary["severity"],
+            "body_part": primary["body_part"],
+            "negated": primary["negated"],
+            "mentions": len(found),
+        }
+    return summary
+
+
+class LiveNote:
+    """One note's text and symptom mentions, kept current edit by edit."""
+
+    def __init__(self, text: str = ""):
+        self.text = ""
+        self.mentions = []  # {"start", "end", "symptom", "icd10", "negated", "severity", "body_part"}, by start
+        self.summary = {}
+        self.lexicon_version = nlp_engine.LEXICON_VERSION
+        if text:
+            self.reset(text)
+
+    def reset(self, text: str) -> dict:
+        """Replace the whole text; returns the delta."""
+        self.text = text
+        self.lexicon_version = nlp_engine.LEXICON_VERSION
+        self.mentions = self._scan(0, len(text), 0, len(text))
+        return self._delta()
+
+    def apply(self, changes: list) -> dict:
+        """Apply [{"start", "end", "text"}, ...] in order and rescan around them; returns the delta.
+
+        Offsets of each change refer to the text after the previous one.
+        Raises ValueError for a malformed or out-of-range change.
+        """
+        dirty = None
+        for change in changes:
+            start, end, new = self._validate(change)
+            delta = len(new) - (end - start)
+            self.text = self.text[:start] + new + self.text[end:]
+            # Mentions starting inside the replaced range are gone; later ones shift.
+            self.mentions = [m for m in self.mentions if not start <= m["start"] < end]
+            for mention in self.mentions:
+                if mention["start"] >= end:
+                    mention["start"] += delta
+                    mention["end"] += delta
+            if dirty is None:
+                dirty = (start, start + len(new))
+            else:
+                lo, hi = (p if p <= start else max(start, p + delta) for p in dirty)
+                dirty = (min(lo, start), max(hi, start + len(new)))
+        if dirty is None:
+            return self._delta()
+        if self.lexicon_version != nlp_engine.LEXICON_VERSION:
+            return self.reset(self.text)  # lexicons reloaded — earlier mentions may be stale
+
+        lo = _snap_left(self.text, max(0, dirty[0] - REACH))
+        hi = _snap_right(self.text, min(len(self.text), dirty[1] + REACH))
+        starts = [m["start"] for m in self.mentions]
+        first, last = bisect.bisect_left(starts, lo), bisect.bisect_left(starts, hi)
+        self.mentions[first:last] = self._scan(lo, hi, _snap_left(self.text, max(0, lo - REACH)),
+                                               _snap_right(self.text, min(len(self.text), hi + REACH)))
+        return self._delta()
+
+    def symptoms(self) -> list:
+        """The full extraction, shaped like extract_symptoms() (occurrences included)."""
+        return extract_symptoms(self.text)
+
+    def _validate(self, change) -> tuple:
+        if not isinstance(change, dict):
+            raise ValueError("each change must be an object with start, end and text")
+        start, end, new = change.get("start"), change.get("end", change.get("start")), change.get("text", "")
+        if not all(isinstance(v, int) and not isinstance(v, bool) for v in (start, end)) or not isinstance(new, str):
+            raise ValueError("change start/end must be integers and text a string")
+        if not 0 <= start <= end <= len(self.text):
+            raise ValueError(f"change [{start}, {end}) is outside the text (length {len(self.text)})")
+        return start, end, new
+
+    def _scan(self, lo: int, hi: int, context_lo: int, context_hi: int) -> list:
+        """Mentions starting in [lo, hi), extracted from text[context_lo:context_hi]."""
+        found = []
+        for entry in extract_symptoms(self.text[context_lo:context_hi]):
+            for occurrence in entry["occurrences"]:
+                start = occurrence["start"] + context_lo
+                if lo <= start < hi:
+                    found.append({
+                        "start": start,
+                        "end": occurrence["end"] + context_lo,
+                        "symptom": entry["symptom"],
+                        "icd10": entry["icd10"],
+                        "negated": occurrence["negated"],
+                        "severity": occurrence["severity"],
+                        "body_part": occurrence["body_part"],
+                    })
+        found.sort(key=lambda m: (m["start"], m["symptom"]))
+        return found
+
+    def _delta(self) -> dict:
+        summary = _summarize(self.mentions)
+        previous, self.summary = self.summary, summary
+        return {
+            "added": [entry for symptom, entry in summary.items() if symptom not in previous],
+            "updated": [entry for symptom, entry in summary.items() if symptom in previous and previous[symptom] != entry],
+            "removed": [symptom for symptom in previous if symptom not in summary],
+            "length": len(self.text),
+        }
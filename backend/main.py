@@ -4,18 +4,23 @@ import asyncio
 import os
 import sys
 import uuid
+import time
 import base64
 
 sys.path.insert(0, os.path.dirname(__file__))
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, UploadFile, File, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from contextlib import asynccontextmanager
 
 from database import (
-    init_db, get_all_patients, get_patient, get_full_patient_record,
-    get_patient_by_abha, get_jan_aushadhi_alternative, get_all_jan_aushadhi_drugs,
-    get_jan_aushadhi_by_molecule, get_diagnostic_centers,
+    init_db, record_cache_stats, backfill_risk_scores, invalidate_all_patients, add_risk_listener, remove_risk_listener,
+)
+from async_database import (
+    shutdown as shutdown_db, get_patients_page, get_patient,
+    get_scored_patient_record, get_scored_patient_record_by_abha, get_risk_scores, get_jan_aushadhi_alternative, get_all_jan_aushadhi_drugs,
+    get_jan_aushadhi_by_molecule, get_diagnostic_centers, get_all_diagnostic_centers,
     create_consent_request, verify_consent,
     create_patient, update_patient, delete_patient,
     create_encounter, delete_encounter,
@@ -23,23 +28,108 @@ from database import (
     create_vitals,
     create_allergy, delete_allergy,
     create_lab_result,
+    create_vitals_batch, create_medications_batch, create_lab_results_batch,
 )
 from seed_data import seed
-from nlp_engine import extract_symptoms, format_extraction_report, normalize_hinglish, decode_prescription_abbreviations
-from risk_scorer import calculate_risk_score
+from drug_index import jan_aushadhi_index
+from lab_router import lab_router
+from nlp_engine import analyze_text, nlp_cache_stats, decode_prescription_abbreviations, reload_lexicons, lexicon_info
+import nlp_batch
+from risk_scorer import reload_risk_rules, risk_rules_info
+from live_extract import LiveNote
+from board import board_hub
 from agents import run_crew_streaming
 from ocr_engine import decode_prescription_image
 from audio_engine import transcribe_audio
 from pdf_parser import parse_pdf
 
 
+# Startup seeding is idempotent and cheap when nothing changed; set to 0 to
+# leave seeding to an explicit `python seed_data.py` deploy step.
+SEED_ON_STARTUP = os.environ.get("AURA_SEED_ON_STARTUP", "1") != "0"
+
+# How often the in-memory catalog indexes (Jan Aushadhi, lab routing) re-read their tables.
+CATALOG_REFRESH_SECONDS = float(os.environ.get("AURA_CATALOG_REFRESH_SECONDS", "300"))
+# How often the NLP lexicon files are checked for edits (0 = only via /api/nlp/lexicons/reload).
+LEXICON_RELOAD_SECONDS = float(os.environ.get("AURA_LEXICON_RELOAD_SECONDS", "30"))
+# How often risk_rules.json is checked for edits (0 = only via /api/risk/rules/reload).
+RISK_RULES_RELOAD_SECONDS = float(os.environ.get("AURA_RISK_RULES_RELOAD_SECONDS", "30"))
+
+
+async def _refresh_catalog_indexes():
+    drugs, centers = await asyncio.gather(get_all_jan_aushadhi_drugs(), get_all_diagnostic_centers())
+    if jan_aushadhi_index.load(drugs):
+        print(f"💊 Jan Aushadhi index rebuilt: {jan_aushadhi_index.size} SKUs")
+    if lab_router.load(centers):
+        print(f"🧪 Lab routing index rebuilt: {lab_router.size} center-test rows")
+
+
+async def _catalog_refresher():
+    while True:
+        await asyncio.sleep(CATALOG_REFRESH_SECONDS)
+        try:
+            await _refresh_catalog_indexes()
+        except Exception as e:
+            print(f"⚠️ Catalog index refresh failed: {e}")
+
+
+async def _lexicon_watcher():
+    while True:
+        await asyncio.sleep(LEXICON_RELOAD_SECONDS)
+        try:
+            # Compiling a new lexicon version is CPU work — keep it off the event loop.
+            if await asyncio.to_thread(reload_lexicons):
+                print(f"📚 NLP lexicons reloaded: version {lexicon_info()['version']}")
+        except Exception as e:
+            print(f"⚠️ NLP lexicon reload failed, keeping the current version: {e}")
+
+
+def _apply_risk_rules() -> bool:
+    """Reload risk_rules.json; on a change, rescore every patient under the new rules."""
+    if not reload_risk_rules():
+        return False
+    scored = backfill_risk_scores()
+    invalidate_all_patients()  # cached records carry the old scores
+    board_hub.resync()
+    print(f"⚖️ Risk rules {risk_rules_info()['key']} loaded: rescored {scored} patients")
+    return True
+
+
+async def _risk_rules_watcher():
+    while True:
+        await asyncio.sleep(RISK_RULES_RELOAD_SECONDS)
+        try:
+            await asyncio.to_thread(_apply_risk_rules)
+        except Exception as e:
+            print(f"⚠️ Risk rules reload failed, keeping the current version: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize DB and seed data on startup."""
     init_db()
-    seed()
+    if SEED_ON_STARTUP:
+        seed()  # checksum-gated: a no-op unless seed_data.py changed
+    scored = backfill_risk_scores()  # unscored patients, or ones scored under other risk rules
+    if scored:
+        print(f"📊 Risk scores computed for {scored} patients")
     print("🇮🇳 AuraTriage India — Database initialized and seeded.")
+    await _refresh_catalog_indexes()
+    board_hub.start()
+    add_risk_listener(board_hub.publish)
+    refresher = asyncio.create_task(_catalog_refresher())
+    watcher = asyncio.create_task(_lexicon_watcher()) if LEXICON_RELOAD_SECONDS > 0 else None
+    rules_watcher = asyncio.create_task(_risk_rules_watcher()) if RISK_RULES_RELOAD_SECONDS > 0 else None
     yield
+    refresher.cancel()
+    if watcher:
+        watcher.cancel()
+    if rules_watcher:
+        rules_watcher.cancel()
+    remove_risk_listener(board_hub.publish)
+    board_hub.stop()
+    shutdown_db()
+    nlp_batch.shutdown()
 
 
 app = FastAPI(
@@ -61,41 +151,50 @@ app.add_middleware(
 # ─── REST Endpoints ──────────────────────────────────────────────────────────
 
 @app.get("/api/patients")
-async def list_patients():
-    """Get all patients — lightweight query (no sub-resource fetching)."""
-    patients = get_all_patients()
-    # Lightweight risk: age-based only (full risk calculated on patient detail view)
+async def list_patients(limit: int = 50, cursor: str = None, fields: str = None,
+                        city: str = None, insurance_tier: str = None, gender: str = None,
+                        triage_level: str = None, sort: str = None):
+    """Keyset-paginated census — pass `next_cursor` back as `cursor` for the next page.
+
+    `fields` is a comma-separated projection (patient_id and name are always included);
+    city / insurance_tier / gender / triage_level filter server-side. `sort` is
+    "name" (default) or "acuity" (highest risk first; the default with triage_level).
+    """
+    try:
+        patients, next_cursor = await get_patients_page(
+            limit=limit,
+            cursor=cursor,
+            fields=[f.strip() for f in fields.split(",") if f.strip()] if fields else None,
+            city=city,
+            insurance_tier=insurance_tier,
+            gender=gender,
+            triage_level=triage_level,
+            sort=sort,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Stored risk scores for the whole page, one lookup
+    risks = await get_risk_scores([p["patient_id"] for p in patients])
     for p in patients:
-        age = p.get("age", 30)
-        if age >= 70:
-            p["risk"] = {"score": 55, "triage_level": "YELLOW"}
-        elif age >= 50:
-            p["risk"] = {"score": 35, "triage_level": "GREEN"}
-        elif age <= 5:
-            p["risk"] = {"score": 45, "triage_level": "YELLOW"}
-        else:
-            p["risk"] = {"score": 20, "triage_level": "GREEN"}
-    return {"patients": patients}
+        p["risk"] = risks.get(p["patient_id"])
+    return {"patients": patients, "next_cursor": next_cursor}
 
 
 @app.get("/api/patients/{patient_id}")
 async def get_patient_detail(patient_id: str):
     """Get full patient record with risk score."""
-    record = get_full_patient_record(patient_id)
+    record, risk = await get_scored_patient_record(patient_id)
     if not record:
         raise HTTPException(status_code=404, detail="Patient not found")
-    risk = calculate_risk_score(record)
     return {"patient": record, "risk": risk}
 
 
 @app.get("/api/patients/abha/{abha_number}")
 async def get_patient_by_abha_number(abha_number: str):
     """Look up patient by 14-digit ABHA Health ID."""
-    patient = get_patient_by_abha(abha_number)
-    if not patient:
+    record, risk = await get_scored_patient_record_by_abha(abha_number)
+    if not record:
         raise HTTPException(status_code=404, detail="ABHA number not found")
-    record = get_full_patient_record(patient["patient_id"])
-    risk = calculate_risk_score(record)
     return {"patient": record, "risk": risk}
 
 
@@ -106,24 +205,24 @@ async def create_patient_endpoint(payload: dict):
     """Create a new patient record (FHIR Patient resource)."""
     if not payload.get("name"):
         raise HTTPException(status_code=400, detail="Patient name is required")
-    patient = create_patient(payload)
+    patient = await create_patient(payload)
     return {"patient": patient, "message": "Patient created successfully"}
 
 
 @app.put("/api/patients/{patient_id}")
 async def update_patient_endpoint(patient_id: str, payload: dict):
     """Update an existing patient record."""
-    existing = get_patient(patient_id)
+    existing = await get_patient(patient_id)
     if not existing:
         raise HTTPException(status_code=404, detail="Patient not found")
-    updated = update_patient(patient_id, payload)
+    updated = await update_patient(patient_id, payload)
     return {"patient": updated, "message": "Patient updated successfully"}
 
 
 @app.delete("/api/patients/{patient_id}")
 async def delete_patient_endpoint(patient_id: str):
     """Delete a patient and all associated records (cascade)."""
-    deleted = delete_patient(patient_id)
+    deleted = await delete_patient(patient_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Patient not found")
     return {"message": f"Patient {patient_id} and all records deleted"}
@@ -134,16 +233,16 @@ async def delete_patient_endpoint(patient_id: str):
 @app.post("/api/patients/{patient_id}/encounters")
 async def create_encounter_endpoint(patient_id: str, payload: dict):
     """Create a new clinical encounter for a patient."""
-    existing = get_patient(patient_id)
+    existing = await get_patient(patient_id)
     if not existing:
         raise HTTPException(status_code=404, detail="Patient not found")
-    encounter = create_encounter(patient_id, payload)
+    encounter = await create_encounter(patient_id, payload)
     return {"encounter": encounter, "message": "Encounter created"}
 
 
 @app.delete("/api/encounters/{encounter_id}")
 async def delete_encounter_endpoint(encounter_id: str):
-    deleted = delete_encounter(encounter_id)
+    deleted = await delete_encounter(encounter_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Encounter not found")
     return {"message": "Encounter deleted"}
@@ -156,13 +255,13 @@ async def create_medication_endpoint(patient_id: str, payload: dict):
     """Add a medication to a patient's chart."""
     if not payload.get("drug_name"):
         raise HTTPException(status_code=400, detail="drug_name is required")
-    med = create_medication(patient_id, payload)
+    med = await create_medication(patient_id, payload)
     return {"medication": med, "message": "Medication added"}
 
 
 @app.put("/api/medications/{med_id}")
 async def update_medication_endpoint(med_id: str, payload: dict):
-    updated = update_medication(med_id, payload)
+    updated = await update_medication(med_id, payload)
     if not updated:
         raise HTTPException(status_code=404, detail="Medication not found")
     return {"message": "Medication updated"}
@@ -170,7 +269,7 @@ async def update_medication_endpoint(med_id: str, payload: dict):
 
 @app.delete("/api/medications/{med_id}")
 async def delete_medication_endpoint(med_id: str):
-    deleted = delete_medication(med_id)
+    deleted = await delete_medication(med_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Medication not found")
     return {"message": "Medication deleted"}
@@ -181,7 +280,7 @@ async def delete_medication_endpoint(med_id: str):
 @app.post("/api/patients/{patient_id}/vitals")
 async def create_vitals_endpoint(patient_id: str, payload: dict):
     """Record new vitals for a patient."""
-    vitals = create_vitals(patient_id, payload)
+    vitals = await create_vitals(patient_id, payload)
     return {"vitals": vitals, "message": "Vitals recorded"}
 
 
@@ -192,13 +291,13 @@ async def create_allergy_endpoint(patient_id: str, payload: dict):
     """Add an allergy to a patient's chart."""
     if not payload.get("allergen"):
         raise HTTPException(status_code=400, detail="allergen is required")
-    allergy = create_allergy(patient_id, payload)
+    allergy = await create_allergy(patient_id, payload)
     return {"allergy": allergy, "message": "Allergy added"}
 
 
 @app.delete("/api/allergies/{allergy_id}")
 async def delete_allergy_endpoint(allergy_id: str):
-    deleted = delete_allergy(allergy_id)
+    deleted = await delete_allergy(allergy_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Allergy not found")
     return {"message": "Allergy deleted"}
@@ -211,10 +310,45 @@ async def create_lab_result_endpoint(patient_id: str, payload: dict):
     """Add a lab result to a patient's chart."""
     if not payload.get("test_name"):
         raise HTTPException(status_code=400, detail="test_name is required")
-    lab = create_lab_result(patient_id, payload)
+    lab = await create_lab_result(patient_id, payload)
     return {"lab_result": lab, "message": "Lab result added"}
 
 
+# ─── Bulk Ingest ─────────────────────────────────────────────────────────────
+
+def _batch_rows(payload: dict) -> list:
+    rows = payload.get("rows")
+    if not isinstance(rows, list) or not rows:
+        raise HTTPException(status_code=400, detail="'rows' must be a non-empty list")
+    return rows
+
+
+async def _run_batch(write, *args) -> dict:
+    try:
+        result = await write(*args)
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    return {**result, "message": f"{result['inserted']} rows written, {len(result['errors'])} rejected"}
+
+
+@app.post("/api/patients/{patient_id}/vitals:batch")
+async def create_vitals_batch_endpoint(patient_id: str, payload: dict):
+    """Record a batch of vitals (e.g. a bedside monitor feed) in one upsert."""
+    return await _run_batch(create_vitals_batch, patient_id, _batch_rows(payload))
+
+
+@app.post("/api/patients/{patient_id}/medications:batch")
+async def create_medications_batch_endpoint(patient_id: str, payload: dict):
+    """Add several medications to a patient's chart in one upsert."""
+    return await _run_batch(create_medications_batch, patient_id, _batch_rows(payload))
+
+
+@app.post("/api/ingest/labs")
+async def ingest_labs_endpoint(payload: dict):
+    """Cross-patient lab interface batch — each row carries its own patient_id."""
+    return await _run_batch(create_lab_results_batch, _batch_rows(payload))
+
+
 @app.post("/api/extract-symptoms")
 async def extract_symptoms_endpoint(payload: dict):
     """Extract symptoms from free text (supports Hinglish) using NLP engine."""
@@ -222,37 +356,104 @@ async def extract_symptoms_endpoint(payload: dict):
     if not text:
         raise HTTPException(status_code=400, detail="No text provided")
     
-    # Normalize Hinglish → English first
-    normalized = normalize_hinglish(text)
-    symptoms = extract_symptoms(text)
-    report = format_extraction_report(symptoms)
-    
+    # Hinglish normalization, extraction and report in one memoized pass
+    # (spans let the UI highlight the source phrases)
+    analysis = analyze_text(text)
+
     # Also decode any prescription abbreviations
     decoded = decode_prescription_abbreviations(text)
-    
+
     return {
-        "symptoms": symptoms,
-        "report": report,
+        "symptoms": analysis["symptoms"],
+        "report": analysis["report"],
         "original_text": text,
-        "normalized_text": normalized,
+        "normalized_text": analysis["normalized_text"],
+        "normalized_spans": [
+            {"start": start, "end": end, "original_start": orig_start, "original_end": orig_end}
+            for start, end, orig_start, orig_end in analysis["normalized_spans"]
+        ],
         "decoded_abbreviations": decoded,
     }
 
 
+@app.post("/api/extract-symptoms/batch")
+async def extract_symptoms_batch_endpoint(request: Request):
+    """Back-fill extraction: NDJSON (or a JSON array) of notes in, NDJSON results out in the same order.
+
+    Each note is a string or {"id": ..., "text": ...}. Each output line is
+    {"index", "id", "symptoms"}, or {"index", "id", "error"} for a malformed note.
+    """
+    if "ndjson" in request.headers.get("content-type", ""):
+        notes = nlp_batch.ndjson_lines(request.stream())
+    else:
+        try:
+            notes = json.loads(await request.body())
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=400, detail="Body must be NDJSON (application/x-ndjson) or a JSON array")
+        if not isinstance(notes, list):
+            raise HTTPException(status_code=400, detail="Body must be NDJSON (application/x-ndjson) or a JSON array")
+
+    async def lines():
+        async for result in nlp_batch.extract_stream(notes):
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+# ─── NLP Lexicons ────────────────────────────────────────────────────────────
+
+@app.get("/api/nlp/lexicons")
+async def get_lexicons():
+    """Active NLP lexicon version and the version of each lexicon file."""
+    return lexicon_info()
+
+
+@app.post("/api/nlp/lexicons/reload")
+async def reload_lexicons_endpoint():
+    """Load edited lexicon files now instead of waiting for the watcher."""
+    try:
+        reloaded = await asyncio.to_thread(reload_lexicons)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Lexicon files rejected: {e}")
+    return {"reloaded": reloaded, **lexicon_info()}
+
+
+# ─── Risk Rules ──────────────────────────────────────────────────────────────
+
+@app.get("/api/risk/rules")
+async def get_risk_rules():
+    """Active risk rules version and the table each factor reads."""
+    return risk_rules_info()
+
+
+@app.post("/api/risk/rules/reload")
+async def reload_risk_rules_endpoint():
+    """Load an edited risk_rules.json now and rescore every patient under it."""
+    try:
+        reloaded = await asyncio.to_thread(_apply_risk_rules)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Risk rules rejected: {e}")
+    return {"reloaded": reloaded, **risk_rules_info()}
+
+
 # ─── Jan Aushadhi / PMBJP Endpoints ─────────────────────────────────────────
 
 @app.get("/api/jan-aushadhi")
 async def list_jan_aushadhi_drugs():
     """Get all Jan Aushadhi generic drug alternatives."""
-    drugs = get_all_jan_aushadhi_drugs()
+    drugs = await get_all_jan_aushadhi_drugs()
     return {"drugs": drugs, "count": len(drugs)}
 
 
 @app.get("/api/jan-aushadhi/search/{query}")
-async def search_jan_aushadhi(query: str):
-    """Search Jan Aushadhi alternatives by brand name or molecule."""
-    by_molecule = get_jan_aushadhi_by_molecule(query)
-    by_brand = get_jan_aushadhi_alternative(query)
+async def search_jan_aushadhi(query: str, limit: int = 10):
+    """Search Jan Aushadhi alternatives by brand name or molecule (typo-tolerant)."""
+    if jan_aushadhi_index.size:
+        return {"query": query, "alternatives": jan_aushadhi_index.search(query, limit=limit)}
+    # Index not loaded yet (e.g. catalog fetch failed at startup) — fall back to ilike scans.
+    by_molecule, by_brand = await asyncio.gather(
+        get_jan_aushadhi_by_molecule(query), get_jan_aushadhi_alternative(query)
+    )
     results = by_molecule if by_molecule else ([by_brand] if by_brand else [])
     return {"query": query, "alternatives": results}
 
@@ -260,12 +461,23 @@ async def search_jan_aushadhi(query: str):
 # ─── Diagnostic Center Routing ───────────────────────────────────────────────
 
 @app.get("/api/diagnostics/{test_name}")
-async def find_diagnostic_centers(test_name: str, pincode: str = None):
-    """Find cheapest diagnostic labs for a test near patient's pincode."""
-    centers = get_diagnostic_centers(test_name, pincode, limit=5)
+async def find_diagnostic_centers(test_name: str, pincode: str = None, limit: int = 5):
+    """Find the best diagnostic labs for a test near the patient's pincode (price × distance × turnaround)."""
+    if lab_router.size:
+        centers = lab_router.route(test_name, pincode, limit=limit)
+    else:
+        centers = await get_diagnostic_centers(test_name, pincode, limit=limit)
     return {"test": test_name, "pincode": pincode, "centers": centers}
 
 
+# ─── Cache Stats ─────────────────────────────────────────────────────────────
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Hit/miss/eviction counters for the in-process patient record and NLP caches."""
+    return {**record_cache_stats(), "nlp": nlp_cache_stats()}
+
+
 # ─── Prescription OCR ────────────────────────────────────────────────────────
 
 @app.post("/api/ocr-prescription")
@@ -314,7 +526,7 @@ async def request_consent(payload: dict):
     
     # Generate a mock 4-digit consent PIN
     pin = str(uuid.uuid4().int)[:4]
-    consent_id = create_consent_request(patient_id, doctor_id, purpose, pin)
+    consent_id = await create_consent_request(patient_id, doctor_id, purpose, pin)
     
     return {
         "consent_id": consent_id,
@@ -334,7 +546,7 @@ async def verify_consent_endpoint(payload: dict):
     if not consent_id or not pin:
         raise HTTPException(status_code=400, detail="consent_id and pin required")
     
-    granted = verify_consent(consent_id, pin)
+    granted = await verify_consent(consent_id, pin)
     
     if granted:
         return {
@@ -354,16 +566,13 @@ async def triage_sync(payload: dict):
     patient_id = payload.get("patient_id")
     symptoms_text = payload.get("symptoms", "")
 
-    record = get_full_patient_record(patient_id)
+    record, risk = await get_scored_patient_record(patient_id)
     if not record:
         raise HTTPException(status_code=404, detail="Patient not found")
 
     # Extract NLP symptoms (with Hinglish normalization)
-    nlp_symptoms = extract_symptoms(symptoms_text)
-    nlp_report = format_extraction_report(nlp_symptoms)
-
-    # Risk score
-    risk = calculate_risk_score(record)
+    nlp = analyze_text(symptoms_text)
+    nlp_symptoms, nlp_report = nlp["symptoms"], nlp["report"]
 
     # Format patient context for agents
     patient_context = _format_patient_context(record)
@@ -401,7 +610,7 @@ async def websocket_triage(websocket: WebSocket, patient_id: str):
         symptoms_text = message.get("symptoms", "")
 
         # Get patient record
-        record = get_full_patient_record(patient_id)
+        record, risk = await get_scored_patient_record(patient_id)
         if not record:
             await websocket.send_text(json.dumps({
                 "type": "error",
@@ -411,8 +620,8 @@ async def websocket_triage(websocket: WebSocket, patient_id: str):
             return
 
         # Send NLP extraction (with Hinglish support)
-        nlp_symptoms = extract_symptoms(symptoms_text)
-        nlp_report = format_extraction_report(nlp_symptoms)
+        nlp = analyze_text(symptoms_text)
+        nlp_symptoms, nlp_report = nlp["symptoms"], nlp["report"]
         await websocket.send_text(json.dumps({
             "type": "nlp_extraction",
             "symptoms": nlp_symptoms,
@@ -420,7 +629,6 @@ async def websocket_triage(websocket: WebSocket, patient_id: str):
         }))
 
         # Send risk score
-        risk = calculate_risk_score(record)
         await websocket.send_text(json.dumps({
             "type": "risk_score",
             "risk": risk,
@@ -500,6 +708,104 @@ def _format_patient_context(record: dict) -> str:
     return "\n".join(lines)
 
 
+# ─── WebSocket Endpoint (Live Triage Board) ─────────────────────────────────
+
+@app.websocket("/ws/board")
+async def websocket_board(websocket: WebSocket):
+    """Live triage board — pushed risk changes instead of polling /api/patients.
+
+    Server messages:
+      {"type": "ready", "seq"}  — subscribed: load /api/patients now, then apply deltas
+      {"type": "risk", "seq", "deltas": [{"patient_id", "score", "triage_level"} | {"patient_id", "removed": true}]}
+      {"type": "resync"}        — deltas were dropped (client too slow, or the risk rules changed): reload /api/patients
+    Deltas are coalesced per patient every AURA_BOARD_FLUSH_MS; the client sends nothing.
+    """
+    await websocket.accept()
+    client = board_hub.subscribe()
+
+    async def send():
+        await websocket.send_text(json.dumps({"type": "ready", "seq": board_hub.seq}))
+        while True:
+            await websocket.send_text(await client.next())
+
+    async def receive():
+        while True:
+            await websocket.receive_text()  # nothing expected; returns control on disconnect
+
+    tasks = [asyncio.create_task(send()), asyncio.create_task(receive())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.exception()  # a disconnect ends the session either way
+    finally:
+        for task in tasks:
+            task.cancel()
+        board_hub.unsubscribe(client)
+
+
+# ─── WebSocket Endpoint (Live Symptom Extraction) ───────────────────────────
+
+@app.websocket("/ws/extract")
+async def websocket_extract(websocket: WebSocket):
+    """Incremental extraction while a note is typed.
+
+    Client messages:
+      {"type": "reset", "text": "..."}                             — start over with a full text
+      {"type": "edit", "changes": [{"start", "end", "text"}, ...]}  — replacements, applied in order
+      {"type": "snapshot"}                                          — full extract_symptoms() result
+    Each reset/edit is answered with a "delta" of added / updated / removed symptoms.
+    """
+    await websocket.accept()
+    note = LiveNote()
+    seq = 0
+
+    try:
+        while True:
+            message = json.loads(await websocket.receive_text())
+            kind = message.get("type")
+            try:
+                if kind == "snapshot":
+                    await websocket.send_text(json.dumps({
+                        "type": "snapshot",
+                        "seq": seq,
+                        "symptoms": note.symptoms(),
+                    }))
+                    continue
+                start = time.perf_counter()
+                if kind == "reset":
+                    delta = note.reset(str(message.get("text", "")))
+                elif kind == "edit":
+                    delta = note.apply(message.get("changes") or [])
+                else:
+                    raise ValueError(f"unknown message type {kind!r}")
+            except ValueError as e:
+                # The client's view of the text is out of sync — it should send a reset.
+                await websocket.send_text(json.dumps({
+                    "type": "error",
+                    "seq": seq,
+                    "message": str(e),
+                }))
+                continue
+            seq += 1
+            await websocket.send_text(json.dumps({
+                "type": "delta",
+                "seq": seq,
+                **delta,
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+            }))
+
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        try:
+            await websocket.send_text(json.dumps({
+                "type": "error",
+                "message": str(e),
+            }))
+        except Exception:
+            pass
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
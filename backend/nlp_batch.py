@@ -0,0 +1,158 @@
+"""Batch symptom extraction on a process pool — for back-filling historical encounters.
+
+extract_symptoms is pure Python and CPU-bound, so running it on the event loop
+(or the DB thread pool) serializes every request behind the GIL. Batches are
+cut into chunks and fanned out to worker processes; results stream back in
+input order with a bounded number of chunks in flight, so memory stays flat
+however long the upload is.
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from nlp_engine import extract_symptoms, reload_lexicons
+
+NLP_WORKERS = int(os.environ.get("AURA_NLP_WORKERS", "0")) or os.cpu_count() or 1
+NLP_CHUNK_SIZE = int(os.environ.get("AURA_NLP_CHUNK_SIZE", "64"))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """The extraction worker pool, created on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # forkserver: workers are forked from a clean single-threaded
+                # server, not from the API process with its DB threads.
+                _pool = ProcessPoolExecutor(
+                    max_workers=NLP_WORKERS, mp_context=multiprocessing.get_context("forkserver")
+                )
+                print(f"🧠 NLP extraction pool: {NLP_WORKERS} worker processes")
+    return _pool
+
+
+def shutdown():
+    """Stop the worker processes (if any were started)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+def extract_chunk(texts: list) -> list:
+    """Worker entry point: extract_symptoms for each text, in order."""
+    # Workers pick up edited lexicon files on their next chunk (a few stat() calls
+    # when nothing changed; new versions map the artifact the API process compiled).
+    try:
+        reload_lexicons()
+    except ValueError as e:
+        print(f"⚠️ NLP worker keeping current lexicons: {e}")
+    return [extract_symptoms(text) for text in texts]
+
+
+def decode_line(line: bytes):
+    """The JSON value of one NDJSON line; ValueError if it isn't valid JSON."""
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"invalid JSON: {e.msg}")
+
+
+def parse_note(item) -> tuple:
+    """(id, text) from a JSON-array element or a raw NDJSON line (bytes).
+
+    A note is either a string or an object with a "text" string and an
+    optional "id". Raises ValueError for anything else.
+    """
+    if isinstance(item, bytes):
+        item = decode_line(item)
+    if isinstance(item, str):
+        note_id, text = None, item
+    elif isinstance(item, dict):
+        note_id, text = item.get("id"), item.get("text")
+    else:
+        note_id, text = None, None
+    if not isinstance(text, str) or not text:
+        raise ValueError("each note must be a non-empty string or an object with a non-empty 'text'")
+    return note_id, text
+
+
+async def ndjson_lines(chunks):
+    """Split an async byte stream (e.g. request.stream()) into non-blank lines."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+
+async def extract_stream(items, chunk_size: int = None, pool: ProcessPoolExecutor = None, max_in_flight: int = None):
+    """Yield one result dict per input item, in input order.
+
+    `items` is an (async) iterable of notes as accepted by parse_note. Each
+    result is {"index", "id", "symptoms"} or, for a malformed note,
+    {"index", "id", "error"}. At most `max_in_flight` chunks (default two per
+    worker) are queued at once; reading pauses until the oldest completes.
+    """
+    chunk_size = chunk_size or NLP_CHUNK_SIZE
+    pool = pool or get_pool()
+    loop = asyncio.get_running_loop()
+    in_flight = deque()  # (future, results-with-placeholders) per chunk
+    max_in_flight = max_in_flight or 2 * NLP_WORKERS
+
+    def submit(chunk):
+        texts = [entry["text"] for entry in chunk if "text" in entry]
+        in_flight.append((loop.run_in_executor(pool, extract_chunk, texts) if texts else None, chunk))
+
+    async def drain_oldest():
+        future, chunk = in_flight.popleft()
+        extracted = iter(await future) if future is not None else iter(())
+        out = []
+        for entry in chunk:
+            if "text" in entry:
+                out.append({"index": entry["index"], "id": entry["id"], "symptoms": next(extracted)})
+            else:
+                out.append(entry)
+        return out
+
+    async def entries():
+        if hasattr(items, "__aiter__"):
+            async for item in items:
+                yield item
+        else:
+            for item in items:
+                yield item
+
+    chunk, index = [], 0
+    async for item in entries():
+        try:
+            if isinstance(item, bytes):
+                item = decode_line(item)  # decoded first, so an error row can still carry the note's id
+            note_id, text = parse_note(item)
+            chunk.append({"index": index, "id": note_id, "text": text})
+        except ValueError as e:
+            chunk.append({"index": index, "id": item.get("id") if isinstance(item, dict) else None, "error": str(e)})
+        index += 1
+        if len(chunk) == chunk_size:
+            submit(chunk)
+            chunk = []
+            if len(in_flight) >= max_in_flight:
+                for result in await drain_oldest():
+                    yield result
+    if chunk:
+        submit(chunk)
+    while in_flight:
+        for result in await drain_oldest():
+            yield result
@@ -1,282 +1,555 @@
-"""NLP Symptom Extraction Engine — India-specific with Hinglish + prescription abbreviations."""
+"""NLP Symptom Extraction Engine — India-specific with Hinglish + prescription abbreviations.
+
+The lexicons (prescription abbreviations, Hinglish phrases, ICD-10 codes,
+severity keywords, body parts, transliteration variants) are versioned JSON
+files in lexicons/ — see lexicon_store. They are compiled into matchers once
+per version, and reload_lexicons() swaps in edited files without a restart.
+"""
+import bisect
+import functools
+import hashlib
+import os
 import re
-from typing import Optional
-
-
-# ─── Indian Prescription Abbreviations ──────────────────────────────────────
-PRESCRIPTION_ABBREVS = {
-    "OD": "Once daily",
-    "BD": "Twice daily",
-    "TDS": "Thrice daily (Three times a day)",
-    "QDS": "Four times a day",
-    "SOS": "If needed (as required)",
-    "HS": "At bedtime (Hora Somni)",
-    "BBF": "Before breakfast",
-    "ABF": "After breakfast",
-    "PC": "After food (Post Cibum)",
-    "AC": "Before food (Ante Cibum)",
-    "STAT": "Immediately",
-    "PRN": "As needed",
-    "TAB": "Tablet",
-    "CAP": "Capsule",
-    "SYP": "Syrup",
-    "INJ": "Injection",
-    "IU": "International Units",
-    "ML": "Millilitres",
-    "GM": "Grams",
-    "MG": "Milligrams",
-    "MCG": "Micrograms",
-}
-
-
-# ─── Hinglish → English Symptom Mappings ────────────────────────────────────
-HINGLISH_MAP = {
-    # Hindi/Hinglish phrase → standard English symptom
-    "seene mein dard": "chest pain",
-    "chhati mein dard": "chest pain",
-    "sine mein dard": "chest pain",
-    "dil mein dard": "chest pain",
-    "sir dard": "headache",
-    "sar dard": "headache",
-    "sir mein dard": "headache",
-    "ulti": "vomiting",
-    "matli": "nausea",
-    "ji machlana": "nausea",
-    "bukhar": "fever",
-    "tez bukhar": "high fever",
-    "badan garam": "fever",
-    "khansi": "cough",
-    "suukhi khansi": "dry cough",
-    "balgam wali khansi": "productive cough",
-    "saans phoolna": "shortness of breath",
-    "saans lene mein taklif": "shortness of breath",
-    "dam ghutna": "shortness of breath",
-    "chakkar aana": "dizziness",
-    "sir ghoomna": "dizziness",
-    "aankhon ke aage andhera": "syncope",
-    "pet dard": "abdominal pain",
-    "pet mein dard": "abdominal pain",
-    "pet mein marod": "abdominal cramps",
-    "kamar dard": "back pain",
-    "peeth dard": "back pain",
-    "jodon mein dard": "joint pain",
-    "haath pair mein dard": "limb pain",
-    "ghutno mein dard": "knee pain",
-    "sujan": "swelling",
-    "soojan": "swelling",
-    "khujli": "pruritus",
-    "chamdi pe dane": "skin rash",
-    "dane nikal aaye": "skin rash",
-    "dhundla dikhna": "blurred vision",
-    "nazar kamzor": "blurred vision",
-    "bhoolna": "memory loss",
-    "yaaddaasht kamzor": "memory loss",
-    "ghabrahat": "anxiety",
-    "neend nahi aati": "insomnia",
-    "kaanpna": "tremor",
-    "jhunjhunahat": "tingling",
-    "sunnpan": "numbness",
-    "seeti ki awaaz": "wheezing",
-    "gala kharab": "sore throat",
-    "dast": "diarrhea",
-    "qabz": "constipation",
-    "wajan kam hona": "weight loss",
-    "zyada peshab": "polyuria",
-    "zyada pyaas": "polydipsia",
-    "pasina aana": "diaphoresis",
-    "naak se khoon": "epistaxis",
-    "neel padna": "bruising",
-    "dil ki dhadkan tez": "palpitations",
-    "jakdan": "chest tightness",
-    "thakan": "fatigue",
-    "kamzori": "weakness",
-    "pairon mein sujan": "pedal edema",
-    "khoon ki ulti": "hematemesis",
-    "latrine mein khoon": "rectal bleeding",
-    "zyada peshab aana": "polyuria",
-    "zyada pyaas lagna": "polydipsia",
-    "pairon mein jhunjhunahat": "peripheral neuropathy",
-}
-
-
-# ─── Symptom → ICD-10 Mapping (expanded for India) ──────────────────────────
-ICD10_MAP = {
-    # General
-    "chest pain": "R07.9",
-    "shortness of breath": "R06.0",
-    "dyspnea": "R06.0",
-    "headache": "R51.9",
-    "migraine": "G43.909",
-    "nausea": "R11.0",
-    "vomiting": "R11.10",
-    "fever": "R50.9",
-    "high fever": "R50.9",
-    "cough": "R05.9",
-    "dry cough": "R05.9",
-    "productive cough": "R05.09",
-    "fatigue": "R53.83",
-    "weakness": "R53.1",
-    "dizziness": "R42",
-    "syncope": "R55",
-    "palpitations": "R00.2",
-    "chest tightness": "R07.89",
-    "abdominal pain": "R10.9",
-    "abdominal cramps": "R10.84",
-    "back pain": "M54.9",
-    "joint pain": "M25.50",
-    "knee pain": "M25.569",
-    "limb pain": "M79.609",
-    "swelling": "R60.9",
-    "pedal edema": "R60.0",
-    "skin rash": "R21",
-    "pruritus": "L29.9",
-    "blurred vision": "H53.8",
-    "memory loss": "R41.3",
-    "confusion": "R41.0",
-    "anxiety": "F41.9",
-    "depression": "F32.9",
-    "insomnia": "G47.00",
-    "tremor": "R25.1",
-    "numbness": "R20.0",
-    "tingling": "R20.2",
-    "peripheral neuropathy": "G62.9",
-    "wheezing": "R06.2",
-    "sore throat": "J02.9",
-    "diarrhea": "R19.7",
-    "constipation": "K59.00",
-    "weight loss": "R63.4",
-    "polyuria": "R35.8",
-    "polydipsia": "R63.1",
-    "diaphoresis": "R61",
-    "epistaxis": "R04.0",
-    "bruising": "R23.3",
-    "rebound tenderness": "R10.9",
-    "hematemesis": "K92.0",
-    "rectal bleeding": "K62.5",
-
-    # India-prevalent tropical / infectious diseases
-    "dengue": "A90",
-    "dengue hemorrhagic fever": "A91",
-    "typhoid": "A01.0",
-    "malaria": "B50.9",
-    "falciparum malaria": "B50.0",
-    "vivax malaria": "B51.9",
-    "tuberculosis": "A15.0",
-    "pulmonary TB": "A15.0",
-    "chikungunya": "A92.0",
-    "leptospirosis": "A27.9",
-    "Japanese encephalitis": "A83.0",
-    "kala-azar": "B55.0",
-    "filariasis": "B74.9",
-    "cholera": "A00.9",
-    "hepatitis A": "B15.9",
-    "hepatitis E": "B17.2",
-    "scrub typhus": "A75.3",
-    "H1N1 influenza": "J09.X2",
-}
-
-
-SEVERITY_KEYWORDS = {
-    "severe": "high",
-    "tez": "high",     # Hindi for intense/fast
-    "bahut": "high",   # Hindi for very much
-    "acute": "high",
-    "intense": "high",
-    "excruciating": "high",
-    "worsening": "high",
-    "badh rahi": "high",  # increasing (Hindi)
-    "critical": "high",
-    "jyada": "high",   # more/excessive (Hindi)
-    "moderate": "medium",
-    "thoda": "low",    # a little (Hindi)
-    "halka": "low",    # light/mild (Hindi)
-    "mild": "low",
-    "slight": "low",
-    "intermittent": "low",
-    "chronic": "medium",
-    "persistent": "medium",
-    "kabhi kabhi": "low",  # sometimes (Hindi)
-}
-
-BODY_PARTS = [
-    "head", "chest", "abdomen", "back", "neck", "throat", "arm", "leg",
-    "knee", "ankle", "wrist", "shoulder", "hip", "foot", "hand", "eye",
-    "ear", "stomach", "lung", "heart", "liver", "kidney", "spine",
-    "pelvis", "groin", "flank", "trunk",
-    # Hindi body parts
-    "sir", "seena", "pet", "peeth", "kamar", "gala", "baazu", "tang",
-    "ghutna", "haath", "pair", "aankh", "kaan", "dil", "jigar", "gurda",
-]
+import threading
+from typing import Iterable, Iterator
+
+import lexicon_store
+from cache import TTLCache
+from symspell import PackedDeletes, SymSpellIndex, delete_table, pack_deletes, transliteration_key, words_by_key
+
+
+# ─── Compiled Lexicons ───────────────────────────────────────────────────────
+# Each lexicon is compiled into a set of per-token conditions ("gates") that
+# is checked against each *distinct* space-separated token the first time it
+# is seen. That tells us which phrases can possibly occur; only those are then
+# located in the full text with C-speed str.find, so a long note costs a set
+# difference over its vocabulary plus work proportional to its findings
+# instead of one full-text scan per lexicon entry. Compiling is linear in the
+# lexicon size, so it is simply redone on every load.
+
+_SEP = "\x00"
+_TOKEN_MEMO_SIZE = 200_000  # distinct tokens remembered per lexicon before starting over
+
+
+class _Lexicon:
+    """Finds which phrases of a fixed lexicon can occur in a text.
+
+    A phrase "a b c" can only occur where some token ends with "a", a token
+    equals "b" and a token starts with "c"; a single-word phrase only inside a
+    token. Those gates are looked up in each token wrapped in separators, at
+    the positions whose first two characters begin some gate. The result is a
+    superset of the phrases present — callers confirm each candidate against
+    the real text.
+    """
+
+    def __init__(self, phrases):
+        self.words = set()  # single-word phrases: the phrase is its own gate
+        self.multi = {}  # phrase -> frozenset of gates
+        for phrase in dict.fromkeys(phrases):
+            parts = phrase.split(" ")
+            if len(parts) == 1:
+                self.words.add(phrase)
+            else:
+                self.multi[phrase] = frozenset(
+                    (parts[0] + _SEP,) + tuple(_SEP + p + _SEP for p in parts[1:-1]) + (_SEP + parts[-1],)
+                )
+        self.gates = self.words.union(*self.multi.values())
+        lengths = {}  # first two characters -> lengths of the gates starting with them
+        for gate in self.gates:
+            lengths.setdefault(gate[:2], set()).add(len(gate))
+        self.lengths_by_head = {head: sorted(n) for head, n in lengths.items() if len(head) == 2}
+        self.short_gates = {gate for gate in self.gates if len(gate) < 2}
+        self._reset_memo()
+
+    def _reset_memo(self):
+        # Gates never span tokens, so each distinct token is matched once and
+        # remembered; clinical vocabulary repeats heavily across notes.
+        self._token_gates = {}
+        self._gated_tokens = set()
+
+    def _gates_in(self, token: str) -> frozenset:
+        wrapped = _SEP + token + _SEP
+        size = len(wrapped)
+        found = [ch for ch in token if ch in self.short_gates] if self.short_gates else []
+        for i in range(size - 1):
+            lengths = self.lengths_by_head.get(wrapped[i:i + 2])
+            if lengths:
+                for n in lengths:
+                    if i + n > size:
+                        break
+                    if wrapped[i:i + n] in self.gates:
+                        found.append(wrapped[i:i + n])
+        return frozenset(found)
+
+    def candidates(self, text: str) -> set:
+        tokens = set(text.split(" "))
+        fresh = tokens.difference(self._token_gates)
+        if fresh:
+            if len(self._token_gates) > _TOKEN_MEMO_SIZE:
+                self._token_gates.clear()
+                self._gated_tokens.clear()
+                fresh = tokens
+            for token in fresh:
+                gates = self._gates_in(token)
+                self._token_gates[token] = gates
+                if gates:
+                    self._gated_tokens.add(token)
+        found = set()
+        for token in tokens & self._gated_tokens:
+            found |= self._token_gates[token]
+        present = found & self.words
+        present.update(phrase for phrase, gates in self.multi.items() if gates <= found)
+        return present
+
+
+# ─── Hinglish Normalizer ─────────────────────────────────────────────────────
+# HINGLISH_MAP phrases are matched on whole tokens (runs of word characters)
+# separated by whitespace, so "dast" no longer fires inside "dastavez". One
+# left-to-right pass takes the longest phrase starting at each token via a
+# token trie and copies everything else through untouched.
+
+def _token_trie(phrases: dict) -> dict:
+    """Nested {token: {...}} dicts; the "" key of a node holds the phrase's replacement."""
+    trie = {}
+    for phrase, replacement in phrases.items():
+        node = trie
+        for token in phrase.split():
+            node = node.setdefault(token, {})
+        node[""] = replacement
+    return trie
+
+
+_WORD_CHAR = re.compile(r"\w")
+_NEXT_TOKEN = re.compile(r"\s+(\w+)")
+
+
+def _phrase_starts(lex, text: str) -> list:
+    """(start, end, token) for every whole-token occurrence of a phrase's first token, in text order."""
+    starts = []
+    # Only places where a phrase's first token occurs are walked from.
+    for token in lex.hinglish_starts.candidates(text):
+        i = text.find(token)
+        while i != -1:
+            end = i + len(token)
+            if not (i and _WORD_CHAR.match(text, i - 1)) and not _WORD_CHAR.match(text, end):
+                starts.append((i, end, token))
+            i = text.find(token, end)
+    starts.sort()
+    return starts
+
+
+# ─── Transliteration Variants ────────────────────────────────────────────────
+# "bukhaar", "bhukar", "chati me dard", "vomitting": tokens that are not in
+# the lexicon are looked up in a SymSpell deletion index over every token of
+# HINGLISH_MAP and ICD10_MAP, and corrected only when that completes a whole
+# lexicon phrase around them. Single-word phrases (where one typo would be a
+# whole finding) must match on spelling-folded form alone, or within one edit
+# for words of 7+ letters. Results are memoised per token, so a note whose
+# vocabulary has been seen before only pays for a set difference.
+
+# Set AURA_NLP_FUZZY=0 to match exact lexicon spellings only.
+FUZZY_MATCHING = os.environ.get("AURA_NLP_FUZZY", "1") != "0"
+
+# transliteration_variants.json lists short function words that are too far
+# from their lexicon spelling in edits ("me" → "mein") and British spellings.
+
+_WORD_TOKEN = re.compile(r"\w+")
+
+
+def _max_edits(word: str, token: str, single_word: bool) -> int:
+    """Edit budget for reading `word` as lexicon `token` (short words get none)."""
+    length = len(transliteration_key(token))
+    if len(word) < 4:
+        return 0
+    if single_word:
+        return 1 if length >= 7 else 0
+    return 0 if length < 5 else 1 if length < 8 else 2
+
+
+def _variant_candidates(lex, word: str) -> dict:
+    """{lexicon token: edits} that `word` could be a misspelling of (empty for lexicon words)."""
+    found = lex.variant_memo.get(word)
+    if found is None:
+        if len(lex.variant_memo) > _TOKEN_MEMO_SIZE:
+            lex.variant_memo.clear()
+        if word in lex.fuzzy_vocab or len(word) < 2 or word.isdigit():
+            found = {}
+        elif word in lex.transliteration_variants:
+            found = {lex.transliteration_variants[word]: 0}
+        else:
+            found = {
+                token: edits for token, edits in lex.variant_index.lookup(word, 2).items()
+                if (token in lex.phrase_words and edits <= _max_edits(word, token, False))
+                or (token in lex.single_word_phrases and edits <= _max_edits(word, token, True))
+            }
+        lex.variant_memo[word] = found
+    return found
+
+
+def _variant_tokens(lex, text: str) -> set:
+    """The note's whitespace-delimited tokens containing a word with variant candidates."""
+    tokens = set(text.split())
+    fresh = tokens.difference(lex.raw_token_memo)
+    if fresh:
+        if len(lex.raw_token_memo) > _TOKEN_MEMO_SIZE:
+            lex.raw_token_memo.clear()
+            lex.variant_raw_tokens.clear()
+            fresh = tokens
+        for token in fresh:
+            lex.raw_token_memo[token] = flagged = any(_variant_candidates(lex, w) for w in _WORD_TOKEN.findall(token))
+            if flagged:
+                lex.variant_raw_tokens.add(token)
+    return tokens & lex.variant_raw_tokens
+
+
+def _phrase_fits(lex, text: str, phrase: tuple, window: list) -> bool:
+    exact = len(phrase) == 1  # a single word already passed the strict budget
+    for n, ((start, _, word), token) in enumerate(zip(window, phrase)):
+        gap = text[window[n - 1][1]:start] if n else " "
+        if not (gap.isspace() or gap == "-"):
+            return False
+        if word == token:
+            exact = True
+            continue
+        edits = _variant_candidates(lex, word).get(token)
+        if edits is None or edits > _max_edits(word, token, len(phrase) == 1):
+            return False
+        exact = exact or edits == 0
+    return exact
+
+
+def _match_variants_around(lex, text: str, start: int, end: int, corrections: dict):
+    """Test every lexicon phrase that a variant word in text[start:end] could belong to."""
+    # Phrases are at most a few short tokens, so a fixed margin covers them.
+    lo, hi = max(0, start - 64), min(len(text), end + 64)
+    tokens = [(m.start(), m.end(), m.group()) for m in _WORD_TOKEN.finditer(text, lo, hi)]
+    if tokens and lo and _WORD_CHAR.match(text, lo - 1):
+        tokens.pop(0)  # cut off by the margin
+    if tokens and hi < len(text) and _WORD_CHAR.match(text, hi):
+        tokens.pop()
+    for i, (word_start, _, word) in enumerate(tokens):
+        if not start <= word_start < end:
+            continue
+        for token in _variant_candidates(lex, word):
+            for phrase, position in lex.phrases_by_token[token]:
+                first = i - position
+                window = tokens[first:first + len(phrase)] if first >= 0 else []
+                if len(window) == len(phrase) and _phrase_fits(lex, text, phrase, window):
+                    for (s, e, w), t in zip(window, phrase):
+                        # Overlapping readings: the longer phrase wins.
+                        if w != t and len(phrase) > corrections.get(s, (0, "", 0))[2]:
+                            corrections[s] = (e, t, len(phrase))
+
+
+def _correct_variants(lex, text: str) -> tuple[str, list]:
+    """Respell variant tokens that complete a lexicon phrase; returns (text, spans) like the normalizer."""
+    flagged = {raw: _WORD_TOKEN.findall(raw) for raw in _variant_tokens(lex, text)}
+    if not flagged:
+        return text, []
+    # A multi-word phrase needs one token spelled exactly (or a zero-edit
+    # variant) somewhere in the note — skip variants whose phrases can't.
+    zero_edit = {t for words in flagged.values() for w in words for t, e in _variant_candidates(lex, w).items() if not e}
+    occurs = {}
+
+    def viable(word):
+        for token in _variant_candidates(lex, word):
+            for phrase, position in lex.phrases_by_token[token]:
+                if len(phrase) == 1:
+                    return True
+                for k, t in enumerate(phrase):
+                    if k != position:
+                        if t not in occurs:
+                            occurs[t] = t in zero_edit or t in text
+                        if occurs[t]:
+                            return True
+        return False
+
+    corrections = {}  # start -> (end, lexicon token, phrase length)
+    for raw, words in flagged.items():
+        if not any(viable(w) for w in words):
+            continue
+        i = text.find(raw)
+        while i != -1:
+            end = i + len(raw)
+            if (not i or text[i - 1].isspace()) and (end == len(text) or text[end].isspace()):
+                _match_variants_around(lex, text, i, end, corrections)
+            i = text.find(raw, end)
+    if not corrections:
+        return text, []
+    pieces, spans = [], []
+    copied = shift = 0
+    for start in sorted(corrections):
+        end, token, _ = corrections[start]
+        pieces += [text[copied:start], token]
+        spans.append((start + shift, start + shift + len(token), start, end))
+        shift += len(token) - (end - start)
+        copied = end
+    pieces.append(text[copied:])
+    return "".join(pieces), spans
+
+
+def _compose_spans(inner: list, outer: list) -> list:
+    """Chain offset spans: `inner` maps stage-1 text to the original, `outer` stage-2 text to stage 1."""
+    inner_starts = [span[0] for span in inner]
+    composed = [(start, end, *_original_span(inner, inner_starts, mid_start, mid_end))
+                for start, end, mid_start, mid_end in outer]
+    outer_starts = [span[2] for span in outer]
+    for mid_start, mid_end, orig_start, orig_end in inner:
+        k = bisect.bisect_right(outer_starts, mid_start) - 1
+        if k >= 0 and mid_start < outer[k][3]:
+            continue  # swallowed by a phrase replacement, already covered above
+        shift = outer[k][1] - outer[k][3] if k >= 0 else 0
+        composed.append((mid_start + shift, mid_end + shift, orig_start, orig_end))
+    composed.sort()
+    return composed
+
+
+def normalize_hinglish_with_offsets(text: str) -> tuple[str, list[tuple[int, int, int, int]]]:
+    """Normalize Hinglish and report where each replacement came from.
+
+    Returns the lowercased, normalized text plus one (start, end,
+    original_start, original_end) tuple per replaced phrase. Text outside those
+    spans is copied through unchanged; see original_span() to map a range back.
+    """
+    return _normalize(_lexicons, text)
+
+
+def _normalize(lex, text: str) -> tuple[str, list]:
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # A handful of characters (e.g. "İ") lengthen when lowercased — keep
+        # those as-is so every offset still lines up with the original.
+        lowered = "".join(ch if len(ch.lower()) != 1 else ch.lower() for ch in text)
+    lowered, respelled = _correct_variants(lex, lowered) if FUZZY_MATCHING else (lowered, [])
+
+    pieces, spans = [], []
+    copied = shift = 0
+    for start, end, token in _phrase_starts(lex, lowered):
+        if start < copied:
+            continue
+        node = lex.hinglish_trie[token]
+        match = (end, node[""]) if "" in node else None
+        while True:
+            nxt = _NEXT_TOKEN.match(lowered, end)
+            if not nxt or nxt.group(1) not in node:
+                break
+            node, end = node[nxt.group(1)], nxt.end()
+            if "" in node:
+                match = (end, node[""])
+        if match is None:
+            continue
+        end, english = match
+        pieces.append(lowered[copied:start])
+        pieces.append(english)
+        spans.append((start + shift, start + shift + len(english), start, end))
+        shift += len(english) - (end - start)
+        copied = end
+    pieces.append(lowered[copied:])
+    return "".join(pieces), _compose_spans(respelled, spans) if respelled else spans
+
+
+def original_span(spans: list, start: int, end: int) -> tuple[int, int]:
+    """Map a [start, end) range of normalized text back onto the original text.
+
+    A range touching a replaced phrase widens to cover the whole original phrase.
+    """
+    return _original_span(spans, [span[0] for span in spans], start, end)
+
+
+def _original_span(spans: list, starts: list, start: int, end: int) -> tuple[int, int]:
+    i = bisect.bisect_right(starts, start) - 1
+    if i >= 0:
+        _, norm_end, orig_start, orig_end = spans[i]
+        start = orig_start if start < norm_end else start - norm_end + orig_end
+    j = bisect.bisect_left(starts, end) - 1
+    if j >= 0:
+        _, norm_end, _, orig_end = spans[j]
+        end = orig_end if end <= norm_end else end - norm_end + orig_end
+    return start, end
 
 
 def normalize_hinglish(text: str) -> str:
     """Translate Hinglish symptoms to standard English before extraction."""
-    text_lower = text.lower()
-    for hindi, english in sorted(HINGLISH_MAP.items(), key=lambda x: -len(x[0])):
-        text_lower = text_lower.replace(hindi, english)
-    return text_lower
+    return normalize_hinglish_with_offsets(text)[0]
+
+
+# ─── Prescription Abbreviation Decoder ───────────────────────────────────────
+# One case-insensitive alternation, longest abbreviation first. Consecutive
+# dosing-schedule abbreviations on a line ("OD BBF", "TDS SOS") are expanded
+# together; everything is matched in a single pass, so an expansion is never
+# re-scanned.
+
+_SCHEDULE_ABBREVS = ("OD", "BD", "TDS", "QDS", "SOS", "HS", "BBF", "ABF", "PC", "AC", "STAT", "PRN")
+
+
+def _alternation(words) -> str:
+    return "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True)) or "(?!)"
+
+
+def _compile_abbreviations(abbrevs: dict) -> tuple:
+    """(decoder regex, stream-tail regex) for upper-cased abbreviation keys."""
+    schedule = _alternation(k for k in _SCHEDULE_ABBREVS if k in abbrevs)
+    decoder = re.compile(
+        rf"\b(?:(?P<run>(?:{schedule})(?:[ \t]+(?:{schedule}))*)"
+        rf"|(?P<one>{_alternation(k for k in abbrevs if k not in _SCHEDULE_ABBREVS)}))\b",
+        re.IGNORECASE,
+    )
+    # Tail of a chunk that the next chunk could still extend: a trailing schedule
+    # run (plus whitespace) and/or a possibly cut-off token.
+    tail = re.compile(rf"(?:\b(?:{schedule})[ \t]+)*\S*\Z", re.IGNORECASE)
+    return decoder, tail
+
+
+def _expand_abbreviation(abbrevs: dict, match) -> str:
+    tokens = match.group().upper().split()
+    return f"{' '.join(tokens)} ({', '.join(abbrevs[t] for t in tokens)})"
 
 
 def decode_prescription_abbreviations(text: str) -> str:
     """Replace Indian prescription abbreviations with full text."""
-    result = text
-    for abbrev, full in PRESCRIPTION_ABBREVS.items():
-        # Match abbreviation as a whole word
-        result = re.sub(rf'\b{abbrev}\b', f"{abbrev} ({full})", result, flags=re.IGNORECASE)
-    return result
+    return _decode(_lexicons, text)
 
 
-def extract_symptoms(text: str) -> list[dict]:
-    """Extract structured symptoms from free-text clinician input (supports Hinglish)."""
-    # First normalize Hinglish
-    text_normalized = normalize_hinglish(text)
-    text_lower = text_normalized.lower()
-    found = []
+def _decode(lex, text: str) -> str:
+    return lex.abbrev_re.sub(lex.expand_abbreviation, text)
 
-    for symptom, icd_code in ICD10_MAP.items():
-        if symptom in text_lower:
-            severity = _detect_severity(text_lower, symptom)
-            body_part = _detect_body_part(text_lower, symptom)
-            found.append({
-                "symptom": symptom,
-                "icd10": icd_code,
-                "severity": severity,
-                "body_part": body_part,
-            })
 
-    return found
+def decode_prescription_stream(chunks: Iterable[str]) -> Iterator[str]:
+    """Decode text arriving in chunks (OCR pages, PDF text runs) as it streams.
 
+    Anything the next chunk could still extend is held back, so the joined
+    output always equals decode_prescription_abbreviations() on the whole text.
+    """
+    lex = _lexicons  # one lexicon version for the whole stream
+    pending = ""
+    for chunk in chunks:
+        pending += chunk
+        # A held-back tail never spans a newline, so only the last line is searched.
+        cut = lex.abbrev_tail.search(pending, pending.rfind("\n") + 1).start()
+        if cut:
+            yield _decode(lex, pending[:cut])
+            pending = pending[cut:]
+    if pending:
+        yield _decode(lex, pending)
 
-def _detect_severity(text: str, symptom: str) -> str:
-    """Detect severity modifiers near the symptom mention."""
-    idx = text.find(symptom)
-    if idx == -1:
-        return "unknown"
 
-    window_start = max(0, idx - 80)
-    window_end = min(len(text), idx + len(symptom) + 80)
-    window = text[window_start:window_end]
+# ─── Symptom Extraction ──────────────────────────────────────────────────────
+# Every occurrence of every symptom is reported. Modifier occurrences are
+# collected once per note and sorted, so each symptom mention only looks at
+# the severity keywords / body parts that actually fall in its window, and
+# negation is decided from the few tokens around the mention.
 
-    for keyword, level in SEVERITY_KEYWORDS.items():
-        if keyword in window:
-            return level
-    return "medium"
+SEVERITY_WINDOW = 80   # chars either side of a mention searched for severity keywords
+BODY_PART_WINDOW = 50  # chars either side searched for body parts
+NEGATION_TOKENS_BEFORE = 5  # scope of a leading cue ("no", "denies")
+NEGATION_TOKENS_AFTER = 3   # scope of a trailing cue ("nahi", "ruled out")
 
+_PRE_NEGATION = re.compile(
+    r"\b(?:no|not|denies|denied|deny|without|negative for|free of|absence of|never had)\b"
+)
+_POST_NEGATION = re.compile(r"\b(?:nahi|nahin|nahi hai|absent|ruled out|not present|negative|resolved)\b")
+# Negation never crosses a sentence/clause boundary or a contrastive conjunction.
+_CLAUSE_BREAK = re.compile(r"[.;:!?\n]|\b(?:but|however|lekin|magar|although)\b")
 
-def _detect_body_part(text: str, symptom: str) -> Optional[str]:
-    """Detect body part mentions near the symptom."""
-    idx = text.find(symptom)
-    if idx == -1:
-        return None
 
-    window_start = max(0, idx - 50)
-    window_end = min(len(text), idx + len(symptom) + 50)
-    window = text[window_start:window_end]
+def _occurrences(text: str, term: str) -> list:
+    positions, i = [], text.find(term)
+    while i != -1:
+        positions.append(i)
+        i = text.find(term, i + len(term))
+    return positions
 
-    for part in BODY_PARTS:
-        if part in window:
-            return part
-    return None
+
+def _modifier_hits(text: str, terms) -> list:
+    """Sorted (start, end, rank, value) for every occurrence of each (term, value) in priority order."""
+    hits = [
+        (i, i + len(term), rank, value)
+        for rank, (term, value) in enumerate(terms)
+        for i in _occurrences(text, term)
+    ]
+    hits.sort()
+    return hits
+
+
+def _best_in_window(hits: list, starts: list, lo: int, hi: int):
+    """Highest-priority hit lying entirely inside [lo, hi), or None."""
+    best = None
+    for k in range(bisect.bisect_left(starts, lo), len(hits)):
+        start, end, rank, value = hits[k]
+        if start >= hi:
+            break
+        if end <= hi and (best is None or rank < best[0]):
+            best = (rank, value)
+    return best[1] if best else None
+
+
+def _is_negated(text: str, start: int, end: int) -> bool:
+    # Fixed-size slices are plenty for a handful of tokens and keep this O(1)
+    # per mention; clause and token limits are only applied when a cue is there.
+    before = text[max(0, start - 100):start]
+    if _PRE_NEGATION.search(before):
+        before = _CLAUSE_BREAK.split(before)[-1]
+        if _PRE_NEGATION.search(" ".join(before.split()[-NEGATION_TOKENS_BEFORE:])):
+            return True
+    after = text[end:end + 60]
+    if _POST_NEGATION.search(after):
+        after = _CLAUSE_BREAK.split(after, maxsplit=1)[0]
+        return bool(_POST_NEGATION.search(" ".join(after.split()[:NEGATION_TOKENS_AFTER])))
+    return False
+
+
+def extract_symptoms(text: str) -> list[dict]:
+    """Extract structured symptoms from free-text clinician input (supports Hinglish).
+
+    One entry per symptom. `occurrences` lists every mention with start/end
+    offsets into the original `text` plus its own negation, severity and body
+    part; the top-level severity/body_part come from the first non-negated
+    mention, and `negated` is true only when every mention is negated.
+    """
+    lex = _lexicons
+    return _extract_normalized(lex, *_normalize(lex, text))
+
+
+def _extract_normalized(lex, text_lower: str, spans: list) -> list[dict]:
+    found = []
+
+    present = lex.extraction.candidates(text_lower)
+    # Only modifiers that occur somewhere in the note can occur in a window.
+    severity_hits = _modifier_hits(text_lower, [(k, level) for k, level in lex.severity_keywords.items() if k in present])
+    body_hits = _modifier_hits(text_lower, [(part, part) for part in lex.body_parts if part in present])
+    severity_starts = [hit[0] for hit in severity_hits]
+    body_starts = [hit[0] for hit in body_hits]
+    span_starts = [span[0] for span in spans]
+
+    for symptom, icd_code in lex.icd10.items():
+        if symptom not in present:
+            continue
+        mentions = []
+        for idx in _occurrences(text_lower, symptom):
+            end = idx + len(symptom)
+            orig_start, orig_end = _original_span(spans, span_starts, idx, end)
+            mentions.append({
+                "start": orig_start,
+                "end": orig_end,
+                "negated": _is_negated(text_lower, idx, end),
+                "severity": _best_in_window(
+                    severity_hits, severity_starts, idx - SEVERITY_WINDOW, end + SEVERITY_WINDOW
+                ) or "medium",
+                "body_part": _best_in_window(body_hits, body_starts, idx - BODY_PART_WINDOW, end + BODY_PART_WINDOW),
+            })
+        if not mentions:
+            continue
+        primary = next((m for m in mentions if not m["negated"]), mentions[0])
+        found.append({
+            "symptom": symptom,
+            "icd10": icd_code,
+            "severity": primary["severity"],
+            "body_part": primary["body_part"],
+            "negated": primary["negated"],
+            "occurrences": mentions,
+        })
+
+    return found
 
 
 def format_extraction_report(symptoms: list[dict]) -> str:
@@ -285,10 +558,188 @@ def format_extraction_report(symptoms: list[dict]) -> str:
         return "No specific symptoms could be extracted from the input."
 
     lines = ["## NLP Symptom Extraction Report", ""]
+    denied = [s["symptom"] for s in symptoms if s.get("negated")]
+    symptoms = [s for s in symptoms if not s.get("negated")]
     for i, s in enumerate(symptoms, 1):
         severity_emoji = {"high": "🔴", "medium": "🟡", "low": "🟢"}.get(s["severity"], "⚪")
         body = f" ({s['body_part']})" if s["body_part"] else ""
         lines.append(
             f"{i}. {severity_emoji} **{s['symptom'].title()}**{body} — ICD-10: `{s['icd10']}` | Severity: {s['severity']}"
         )
+    if denied:
+        lines += ["", "Negated / denied: " + ", ".join(denied)]
     return "\n".join(lines)
+
+
+# ─── Memoized Analysis ───────────────────────────────────────────────────────
+# /api/extract-symptoms, /api/triage and /ws/triage all run the same pipeline
+# on text that repeats (re-triage, retries, the same complaint sent twice).
+# Results are cached by content hash; the key includes the lexicon version,
+# so editing a dictionary never serves a stale extraction.
+
+_analysis_cache = TTLCache(
+    max_entries=int(os.environ.get("AURA_NLP_CACHE_SIZE", "4096")),
+    ttl_seconds=None,  # entries only go stale through LEXICON_VERSION
+)
+
+
+def _analyze(lex, text: str) -> dict:
+    normalized, spans = _normalize(lex, text)
+    symptoms = _extract_normalized(lex, normalized, spans)
+    return {
+        "normalized_text": normalized,
+        "normalized_spans": spans,
+        "symptoms": symptoms,
+        "report": format_extraction_report(symptoms),
+    }
+
+
+def analyze_text(text: str) -> dict:
+    """Normalized text, its Hinglish spans, extracted symptoms and report — computed once per distinct text.
+
+    The returned dict is shared between callers; treat it as read-only.
+    """
+    lex = _lexicons
+    digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    return _analysis_cache.get_or_load((lex.version, FUZZY_MATCHING, digest), lambda: _analyze(lex, text))
+
+
+def nlp_cache_stats() -> dict:
+    return {**_analysis_cache.stats(), "lexicon_version": LEXICON_VERSION}
+
+
+# ─── Lexicon Snapshots ───────────────────────────────────────────────────────
+# Everything compiled from one version of the lexicon files lives in one
+# immutable snapshot. Each entry point reads `_lexicons` once and passes it
+# down, so a reload swapping in a new snapshot never mixes two versions
+# within a call. The module-level PRESCRIPTION_ABBREVS, HINGLISH_MAP,
+# ICD10_MAP, SEVERITY_KEYWORDS, BODY_PARTS, TRANSLITERATION_VARIANTS and
+# LEXICON_VERSION always name the active snapshot's data.
+
+_ARTIFACT_FORMAT = 2  # bump whenever the stored deletion table changes shape
+_MAX_EDITS = 2
+
+
+def _compile(data: dict) -> dict:
+    """The matchers for one set of lexicons, except the SymSpell deletion table (see _load_snapshot)."""
+    trie = _token_trie(data["hinglish"])
+    phrases = [tuple(_WORD_TOKEN.findall(p.lower())) for p in dict.fromkeys([*data["hinglish"], *data["icd10"]])]
+    phrases_by_token = {}  # token -> [(phrase tokens, position of token in phrase)]
+    for phrase in phrases:
+        for position, token in enumerate(phrase):
+            phrases_by_token.setdefault(token, []).append((phrase, position))
+    vocab = {token for phrase in phrases for token in phrase}
+    return {
+        "extraction": _Lexicon([*data["icd10"], *data["severity"], *data["body_parts"]]),
+        "hinglish_trie": trie,
+        "hinglish_starts": _Lexicon(trie),
+        "fuzzy_vocab": vocab,
+        "single_word_phrases": {phrase[0] for phrase in phrases if len(phrase) == 1},
+        "phrase_words": {token for phrase in phrases if len(phrase) > 1 for token in phrase},
+        "phrases_by_token": phrases_by_token,
+        "variant_words_by_key": words_by_key(vocab),
+    }
+
+
+class _LexiconSnapshot:
+    """One version of the lexicons and their compiled matchers."""
+
+    def __init__(self, data: dict, compiled: dict, version: str, manifest: list, source: str):
+        self.version = version
+        self.manifest = manifest
+        self.source = source  # "artifact" (memory-mapped) or "compiled" (in memory)
+        self.prescription_abbrevs = {k.upper(): v for k, v in data["prescription_abbrevs"].items()}
+        self.hinglish = data["hinglish"]
+        self.icd10 = data["icd10"]
+        self.severity_keywords = data["severity"]
+        self.body_parts = data["body_parts"]
+        self.transliteration_variants = data["transliteration_variants"]
+
+        self.extraction = compiled["extraction"]
+        self.hinglish_trie = compiled["hinglish_trie"]
+        self.hinglish_starts = compiled["hinglish_starts"]
+        self.fuzzy_vocab = compiled["fuzzy_vocab"]
+        self.single_word_phrases = compiled["single_word_phrases"]
+        self.phrase_words = compiled["phrase_words"]
+        self.phrases_by_token = compiled["phrases_by_token"]
+        self.variant_index = SymSpellIndex.from_parts(compiled["variant_words_by_key"], compiled["variant_deletes"], _MAX_EDITS)
+        self.variant_memo = {}  # word -> {lexicon token: edits}
+        self.raw_token_memo = {}  # whitespace-delimited token -> whether any word in it has a variant match
+        self.variant_raw_tokens = set()
+
+        self.abbrev_re, self.abbrev_tail = _compile_abbreviations(self.prescription_abbrevs)
+        self.expand_abbreviation = functools.partial(_expand_abbreviation, self.prescription_abbrevs)
+
+
+def _load_snapshot() -> _LexiconSnapshot:
+    """Compile the matchers and map this version's deletion table, building (and storing) it first if there is none.
+
+    The deletion table dominates compile time and memory, so it is the only
+    part kept in the artifact; it is read in place, never deserialized.
+    """
+    data, manifest, fingerprint = lexicon_store.read_lexicons()
+    version = fingerprint[:16]
+    compiled = _compile(data)
+    path = lexicon_store.artifact_path(fingerprint, _ARTIFACT_FORMAT)
+    try:
+        header, mapped, offset = lexicon_store.read_artifact(path)
+        if header.get("format") != _ARTIFACT_FORMAT or header.get("fingerprint") != fingerprint:
+            raise ValueError("built from other lexicon files")
+        compiled["variant_deletes"] = PackedDeletes(mapped, offset)
+        return _LexiconSnapshot(data, compiled, version, manifest, "artifact")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"⚠️ Unreadable lexicon artifact {path}, recompiling: {e}")
+    deletes = delete_table(compiled["variant_words_by_key"], _MAX_EDITS)
+    header = {"format": _ARTIFACT_FORMAT, "fingerprint": fingerprint, "deletes": len(deletes)}
+    try:
+        lexicon_store.write_artifact(path, header, pack_deletes(deletes))
+        print(f"📚 Compiled NLP lexicons {version} → {path}")
+    except OSError as e:
+        print(f"⚠️ Could not store lexicon artifact ({e}); using in-memory matchers")
+    compiled["variant_deletes"] = deletes
+    return _LexiconSnapshot(data, compiled, version, manifest, "compiled")
+
+
+def _install(snapshot: _LexiconSnapshot):
+    global _lexicons, PRESCRIPTION_ABBREVS, HINGLISH_MAP, ICD10_MAP, SEVERITY_KEYWORDS, BODY_PARTS
+    global TRANSLITERATION_VARIANTS, LEXICON_VERSION
+    PRESCRIPTION_ABBREVS = snapshot.prescription_abbrevs
+    HINGLISH_MAP = snapshot.hinglish
+    ICD10_MAP = snapshot.icd10
+    SEVERITY_KEYWORDS = snapshot.severity_keywords
+    BODY_PARTS = snapshot.body_parts
+    TRANSLITERATION_VARIANTS = snapshot.transliteration_variants
+    LEXICON_VERSION = snapshot.version
+    _lexicons = snapshot
+
+
+_reload_lock = threading.Lock()
+_lexicon_signature = lexicon_store.file_signature()
+_install(_load_snapshot())
+
+
+def reload_lexicons() -> bool:
+    """Swap in the lexicon files' current contents; returns False if nothing changed.
+
+    Raises ValueError (and keeps serving the current lexicons) if a file is malformed.
+    """
+    global _lexicon_signature
+    with _reload_lock:
+        signature = lexicon_store.file_signature()
+        if signature == _lexicon_signature:
+            return False
+        snapshot = _load_snapshot()
+        _lexicon_signature = signature
+        if snapshot.version == _lexicons.version:
+            return False  # touched but not edited
+        _install(snapshot)
+        _analysis_cache.clear()
+        return True
+
+
+def lexicon_info() -> dict:
+    """Active lexicon version, where its matchers came from, and each file's version and size."""
+    lex = _lexicons
+    return {"version": lex.version, "source": lex.source, "files": lex.manifest}
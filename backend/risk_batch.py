@@ -0,0 +1,233 @@
+"""Census-wide risk scoring — the risk rules evaluated over NumPy columns.
+
+calculate_risk_score walks one aggregated patient record, and assembling that
+record costs a query per child table, so scoring a whole census list that way
+is too slow. score_patients takes flat rows instead — one query per table for
+any number of patients — and evaluates each factor of the active ruleset
+(risk_rules) for all of them at once. Every rule test is the compiled
+predicate calculate_risk_score uses, applied once per distinct column value
+and mapped back to a boolean column. Bands then become np.select over those
+columns, and per-patient sums and counts are np.bincount. Keywords are found
+with one scan per keyword over all the encounter texts joined together.
+Vitals trends are fitted from per-patient bincount sums over each window.
+Results are identical to calculate_risk_score
+(benchmarks/bench_risk_batch.py checks this).
+
+Without NumPy, the rows are grouped into records and scored one at a time.
+"""
+import re
+from itertools import repeat
+
+from risk_scorer import TRIAGE_LEVELS, calculate_risk_score, current_rules
+from vitals_trend import (
+    MEASURES, MIN_SPREAD, RULES, TREND_CAPACITY, TREND_MAX_POINTS, TREND_MIN_READINGS, WINDOW_SECONDS,
+    parse_seconds, scaled,
+)
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+def score_patients(patients: list, encounters=(), medications=(), vitals=(), allergies=(), lab_results=(),
+                   rules=None) -> dict:
+    """{patient_id: risk} for every row in `patients`, shaped like calculate_risk_score's result.
+
+    Child rows may be in any order except that each patient's vitals and
+    encounters must be newest first (the first one seen is scored, as
+    record["vitals"][0] is); rows of patients not in `patients` are ignored.
+    `rules` defaults to the active ruleset.
+    """
+    rules = rules or current_rules()
+    if not NUMPY_AVAILABLE:
+        records = assemble_records(patients, encounters, medications, vitals, allergies, lab_results)
+        return {pid: calculate_risk_score(record, rules) for pid, record in records.items()}
+    if not patients:
+        return {}
+
+    ids = [p["patient_id"] for p in patients]
+    index = {pid: i for i, pid in enumerate(ids)}
+    n = len(ids)
+    tables = {"patients": patients, "encounters": encounters, "medications": medications, "vitals": vitals,
+              "allergies": allergies, "lab_results": lab_results}
+
+    scores = {name: _factor_points(spec, index, tables[spec["table"]]) for name, spec in rules.specs.items()}
+    total = np.minimum(sum(scores.values(), np.zeros(n, dtype=np.int64)), 100)
+    levels = sorted(TRIAGE_LEVELS, key=lambda level: -TRIAGE_LEVELS[level]["min"])
+    level = np.select([total >= TRIAGE_LEVELS[lv]["min"] for lv in levels[:-1]], levels[:-1], levels[-1])
+
+    names = list(scores)
+    columns = zip(ids, total.tolist(), level.tolist(), zip(*(scores[name].tolist() for name in names)))
+    return {
+        pid: {
+            "score": score,
+            "triage_level": lv,
+            "triage_label": TRIAGE_LEVELS[lv]["label"],
+            "triage_color": TRIAGE_LEVELS[lv]["color"],
+            "breakdown": dict(zip(names, points)),
+        }
+        for pid, score, lv, points in columns
+    }
+
+
+def _factor_points(spec: dict, index: dict, rows) -> "np.ndarray":
+    """One factor's points for every census patient."""
+    n, kind = len(index), spec["kind"]
+    if kind == "vitals_trend":
+        return _trend_points(index, rows)
+    if kind == "latest" and spec["table"] == "patients":
+        points = _check_points(spec["checks"], rows)  # the census rows themselves, in order
+    elif kind in ("latest", "keywords"):
+        # Only each patient's newest row counts; patients without one score 0
+        rows, owner = _latest(index, rows)
+        points = np.zeros(n, dtype=np.int64)
+        points[owner] = _check_points(spec["checks"], rows) if kind == "latest" else _keyword_points(spec, rows)
+    else:
+        owner = _owners(index, rows)
+        known = owner >= 0
+        if kind == "each":
+            points = np.bincount(owner[known], weights=_check_points(spec["checks"], rows)[known], minlength=n)
+            points = points.astype(np.int64)
+        else:  # count
+            matched = _condition(spec["where"], rows, {}) if spec["where"] else np.ones(len(rows), dtype=bool)
+            count = np.bincount(owner[known & matched], minlength=n)
+            points = np.select([count >= at_least for at_least, _ in spec["bands"]], [p for _, p in spec["bands"]], 0)
+    return points if spec["max"] is None else np.minimum(points, spec["max"])
+
+
+def _check_points(checks: list, rows) -> "np.ndarray":
+    """Per-row points: for each check, the points of its first matching band."""
+    points = np.zeros(len(rows), dtype=np.int64)
+    columns = {}  # field -> factored column, shared by every test on it
+    for bands in checks:
+        conditions = [np.ones(len(rows), dtype=bool) if cond is None else _condition(cond, rows, columns)
+                      for cond, _ in bands]
+        points += np.select(conditions, [p for _, p in bands], 0)
+    return points
+
+
+def _condition(cond: tuple, rows, columns: dict) -> "np.ndarray":
+    mode, tests = cond
+    matches = []
+    for test in tests:
+        if test["field"] not in columns:
+            columns[test["field"]] = _factored(rows, test["field"])
+        distinct, inverse = columns[test["field"]]
+        matches.append(np.fromiter(map(test["predicate"], distinct), dtype=bool, count=len(distinct))[inverse])
+    combine = np.logical_or if mode == "any" else np.logical_and
+    return combine.reduce(matches) if len(matches) > 1 else matches[0]
+
+
+def _keyword_points(spec: dict, rows: list) -> "np.ndarray":
+    """Keyword points of each row's joined, lowercased text fields."""
+    columns = [list(map(dict.get, rows, repeat(field))) for field in spec["fields"]]
+    texts = _joined([" ".join("" if value is None else str(value) for value in values).lower()
+                     for values in zip(*columns)])
+    points = np.zeros(len(rows), dtype=np.int64)
+    for group_points, match, keywords in spec["groups"]:
+        for keyword in keywords:
+            pattern = rf"\b{re.escape(keyword)}\b" if match == "word" else re.escape(keyword)
+            points += group_points * _contains(texts, pattern)
+    return points
+
+
+def assemble_records(patients: list, encounters=(), medications=(), vitals=(), allergies=(), lab_results=()) -> dict:
+    """{patient_id: aggregated record} — the per-patient shape calculate_risk_score reads."""
+    records = {p["patient_id"]: {**p, "encounters": [], "medications": [], "vitals": [], "allergies": [],
+                                 "lab_results": []} for p in patients}
+    for table, rows in (("encounters", encounters), ("medications", medications), ("vitals", vitals),
+                        ("allergies", allergies), ("lab_results", lab_results)):
+        for row in rows:
+            record = records.get(row.get("patient_id"))
+            if record is not None:
+                record[table].append(row)
+    return records
+
+
+def _factored(rows: list, key: str) -> tuple:
+    """(distinct values of row[key], each row's position among them).
+
+    Rule predicates then run once per distinct value — status, flag and test
+    columns repeat a lot, and vitals readings repeat too.
+    """
+    values = list(map(dict.get, rows, repeat(key)))
+    positions = {value: i for i, value in enumerate(dict.fromkeys(values))}
+    return list(positions), np.fromiter(map(positions.__getitem__, values), dtype=np.int64, count=len(values))
+
+
+def _mapped(rows: list, key: str, fn) -> list:
+    """fn(row[key]) for each row, called once per distinct value."""
+    values = list(map(dict.get, rows, repeat(key)))
+    results = {value: fn(value) for value in set(values)}
+    return list(map(results.__getitem__, values))
+
+
+def _owners(index: dict, rows) -> "np.ndarray":
+    """Census position of each row's patient (-1 for patients outside the census)."""
+    pids = map(dict.get, rows, repeat("patient_id"))
+    return np.fromiter(map(index.get, pids, repeat(-1)), dtype=np.int64, count=len(rows))
+
+
+def _latest(index: dict, rows) -> tuple:
+    """(first row of each census patient, their positions) — rows are newest first per patient."""
+    owner = _owners(index, rows)
+    owner, first = np.unique(owner, return_index=True)  # return_index gives each patient's first row
+    keep = owner >= 0
+    return [rows[j] for j in first[keep].tolist()], owner[keep]
+
+
+def _trend_points(index: dict, rows) -> "np.ndarray":
+    """vitals_trend points per census patient, from integer sums over each patient's window."""
+    n = len(index)
+    if not len(rows):
+        return np.zeros(n, dtype=np.int64)
+    owner = _owners(index, rows)
+    # Unparseable times and missing values become NaN (epoch seconds and hundredths are exact in float64)
+    seconds = np.array(_mapped(rows, "timestamp", parse_seconds), dtype=float)
+    # A patient's first TREND_CAPACITY rows (newest first), as a record carries them
+    order = np.argsort(owner, kind="stable")
+    grouped = owner[order]
+    position = np.arange(len(rows))
+    starts = np.maximum.accumulate(np.where(np.r_[True, grouped[1:] != grouped[:-1]], position, 0))
+    rank = np.empty(len(rows), dtype=np.int64)
+    rank[order] = position - starts
+    keep = np.flatnonzero((owner >= 0) & ~np.isnan(seconds) & (rank < TREND_CAPACITY))
+    owner = owner[keep]
+    t = seconds[keep].astype(np.int64)
+    newest = np.full(n, np.iinfo(np.int64).min)
+    np.maximum.at(newest, owner, t)
+    # Times relative to the patient's newest reading keep every sum well inside int64 (and exact in float64).
+    t -= newest[owner]
+    window = t >= -WINDOW_SECONDS
+    keep, owner, t = keep[window], owner[window], t[window]
+
+    points = np.zeros(n, dtype=np.int64)
+    for measure in MEASURES:
+        values = np.array(_mapped(rows, measure, scaled), dtype=float)[keep]
+        present = ~np.isnan(values)
+        o, tm, v = owner[present], t[present], values[present].astype(np.int64)
+        count = np.bincount(o, minlength=n)
+        st, sv, stt, stv = (np.bincount(o, weights=w, minlength=n).astype(np.int64) for w in (tm, v, tm * tm, tm * v))
+        num, den = count * stv - st * sv, count * stt - st * st
+        fitted = (count >= TREND_MIN_READINGS) & (den >= count * count * MIN_SPREAD)
+        direction, bands = RULES[measure]
+        rise = direction * num * 3600
+        points += np.select([fitted & (rise >= change * den) for change, _ in bands], [p for _, p in bands], 0)
+    return np.minimum(points, TREND_MAX_POINTS)
+
+
+def _joined(texts: list) -> tuple:
+    """(texts joined by newlines, offset just past each text's newline) for _contains."""
+    return "\n".join(texts), np.cumsum(np.fromiter(map(len, texts), dtype=np.int64, count=len(texts)) + 1)
+
+
+def _contains(joined: tuple, pattern: str) -> "np.ndarray":
+    """Boolean array: whether `pattern` matches in each joined text, from one scan of the whole buffer."""
+    buffer, ends = joined
+    found = np.zeros(len(ends), dtype=bool)
+    hits = np.fromiter((m.start() for m in re.finditer(pattern, buffer)), dtype=np.int64)
+    # Keywords have no newline, so each hit lies inside the text whose end follows it.
+    found[np.searchsorted(ends, hits, side="right")] = True
+    return found
@@ -0,0 +1,370 @@
+"""Risk rule tables — the risk score model as data, compiled into Python at load.
+
+risk_rules.json ({"ruleset", "version", "description", "factors"}) describes
+each factor of the score: the table it reads, its point bands or keywords,
+and its cap. compile_rules() validates the file and generates one
+straight-line Python function per factor, with constants inlined and each
+field read once per row. The tables are interpreted once, at load, instead
+of on every score. risk_scorer swaps in a new ruleset when the file changes.
+
+Factor kinds:
+  latest        bands over one row: the patient row, or the newest row of a
+                child table (0 points without one)
+  each          bands per row of a child table, summed
+  count         rows matching "where", counted, then banded by "bands":
+                [[at least, points], ...]
+  keywords      keyword groups found in the newest row's "fields" (joined,
+                lowercased); each keyword found adds its group's points once.
+                "match": "word" finds whole words only, "substring" (default)
+                finds them anywhere
+  vitals_trend  vitals_trend slopes over the vitals series (rules live there)
+
+"checks" is a list of band lists. Each band is {"when": condition, "points": n};
+a band without "when" always matches. The first matching band of each check
+scores. A condition is a test [field, op, value], {"any": [tests]} or
+{"all": [tests]}. A NULL field reads as its "defaults" entry. "field|lower"
+and "field|upper" compare the text case-insensitively. The ops are
+> >= < <= == != and contains. contains takes a string or a list of strings,
+and matches if any of them is a substring.
+"""
+import hashlib
+import json
+import os
+import re
+
+RULES_PATH = os.environ.get("AURA_RISK_RULES") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "risk_rules.json")
+
+TABLES = ("patients", "encounters", "medications", "vitals", "allergies", "lab_results")
+FACTOR_KINDS = ("latest", "each", "count", "keywords", "vitals_trend")
+ORDERING_OPS = (">", ">=", "<", "<=")
+OPS = ORDERING_OPS + ("==", "!=", "contains")
+TRANSFORMS = ("lower", "upper")
+_NAME = re.compile(r"[a-z_][a-z0-9_]*\Z")
+
+
+def file_signature(path: str = RULES_PATH) -> tuple:
+    """(mtime, size) of the rule file — a cheap has-it-changed check."""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def read_rules(path: str = RULES_PATH) -> tuple:
+    """(rule document, content fingerprint). Raises ValueError for unreadable JSON."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    try:
+        doc = json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValueError(f"{os.path.basename(path)}: invalid JSON ({e})")
+    if not isinstance(doc, dict) or not isinstance(doc.get("factors"), dict) or not doc["factors"]:
+        raise ValueError(f"{os.path.basename(path)}: expected an object with a non-empty \"factors\" object")
+    return doc, hashlib.sha256(raw).hexdigest()
+
+
+class RuleSet:
+    """One compiled version of the rule file."""
+
+    def __init__(self, doc: dict, fingerprint: str, factors: dict, specs: dict, source: str):
+        self.ruleset = doc.get("ruleset", "risk")
+        self.version = str(doc.get("version", "0"))
+        self.description = doc.get("description", "")
+        self.fingerprint = fingerprint
+        self.key = f"{self.version}:{fingerprint[:12]}"  # stored with every score computed under these rules
+        self.factors = factors  # breakdown key -> (table, fn(patient row or child rows) -> points)
+        self.specs = specs  # breakdown key -> validated rule (with a predicate per test) for risk_batch
+        self.source = source  # the generated Python
+
+    def table_factors(self, table: str) -> list:
+        """Breakdown keys of the factors that read `table`."""
+        return [name for name, (factor_table, _) in self.factors.items() if factor_table == table]
+
+    def info(self) -> dict:
+        return {
+            "ruleset": self.ruleset,
+            "version": self.version,
+            "fingerprint": self.fingerprint[:16],
+            "key": self.key,  # stamped on stored scores (risk_scores.rules_version)
+            "description": self.description,
+            "factors": {name: {"kind": spec["kind"], "table": spec["table"]} for name, spec in self.specs.items()},
+        }
+
+
+# ─── Validation ──────────────────────────────────────────────────────────────
+
+def _number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _points(value, where: str) -> int:
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise ValueError(f"{where}: points must be a non-negative integer")
+    return value
+
+
+def _test(raw, defaults: dict, where: str) -> dict:
+    if not isinstance(raw, list) or len(raw) != 3 or not isinstance(raw[0], str):
+        raise ValueError(f"{where}: a test is [field, op, value]")
+    field, _, transform = raw[0].partition("|")
+    op, value = raw[1], raw[2]
+    if not _NAME.match(field):
+        raise ValueError(f"{where}: bad field name {field!r}")
+    if transform and transform not in TRANSFORMS:
+        raise ValueError(f"{where}: unknown transform {transform!r} (expected one of {', '.join(TRANSFORMS)})")
+    if op not in OPS:
+        raise ValueError(f"{where}: unknown op {op!r} (expected one of {' '.join(OPS)})")
+    if op in ORDERING_OPS and (transform or not _number(value)):
+        raise ValueError(f"{where}: {op} compares a field with a number")
+    if op == "contains":
+        value = [value] if isinstance(value, str) else value
+        if not isinstance(value, list) or not value or not all(isinstance(v, str) and v for v in value):
+            raise ValueError(f"{where}: contains takes a string or a list of strings")
+        value = tuple(value)
+    elif not (_number(value) or isinstance(value, str)):
+        raise ValueError(f"{where}: {op} compares with a number or a string")
+    return {"field": field, "transform": transform, "op": op, "value": value, "default": defaults.get(field)}
+
+
+def _condition(raw, defaults: dict, where: str):
+    """(mode, tests) with mode "any" or "all"; None for a missing condition (always true)."""
+    if raw is None:
+        return None
+    if isinstance(raw, dict):
+        if len(raw) != 1 or next(iter(raw)) not in ("any", "all") or not isinstance(next(iter(raw.values())), list):
+            raise ValueError(f"{where}: a compound condition is {{\"any\": [tests]}} or {{\"all\": [tests]}}")
+        mode, tests = next(iter(raw.items()))
+        if not tests:
+            raise ValueError(f"{where}: empty {mode} condition")
+        return mode, tuple(_test(test, defaults, where) for test in tests)
+    return "all", (_test(raw, defaults, where),)
+
+
+def _checks(raw, defaults: dict, where: str) -> list:
+    if not isinstance(raw, list) or not raw:
+        raise ValueError(f"{where}: checks must be a non-empty list of band lists")
+    checks = []
+    for i, bands in enumerate(raw):
+        if not isinstance(bands, list) or not bands:
+            raise ValueError(f"{where}.checks[{i}]: must be a non-empty list of bands")
+        compiled = []
+        for j, band in enumerate(bands):
+            at = f"{where}.checks[{i}][{j}]"
+            if not isinstance(band, dict):
+                raise ValueError(f"{at}: a band is {{\"when\": condition, \"points\": n}}")
+            if compiled and compiled[-1][0] is None:
+                raise ValueError(f"{at}: unreachable (follows a band without \"when\")")
+            compiled.append((_condition(band.get("when"), defaults, at), _points(band.get("points"), at)))
+        checks.append(compiled)
+    return checks
+
+
+def _spec(name: str, raw, builtins: dict) -> dict:
+    where = f"factors.{name}"
+    if not _NAME.match(name):
+        raise ValueError(f"{where}: bad factor name")
+    if not isinstance(raw, dict):
+        raise ValueError(f"{where}: must be an object")
+    kind, table = raw.get("kind"), raw.get("table")
+    if kind not in FACTOR_KINDS:
+        raise ValueError(f"{where}: unknown kind {kind!r} (expected one of {', '.join(FACTOR_KINDS)})")
+    if table not in TABLES or (table == "patients" and kind != "latest"):
+        raise ValueError(f"{where}: {kind} can't read table {table!r}")
+    spec = {"kind": kind, "table": table}
+    if kind == "vitals_trend":
+        if table != "vitals" or kind not in builtins:
+            raise ValueError(f"{where}: vitals_trend reads the vitals table")
+        return spec
+    cap = raw.get("max")
+    spec["max"] = None if cap is None else _points(cap, f"{where}.max")
+    defaults = raw.get("defaults", {})
+    if not isinstance(defaults, dict) or not all(_NAME.match(k) and (_number(v) or isinstance(v, str))
+                                                 for k, v in defaults.items()):
+        raise ValueError(f"{where}.defaults: must map field names to numbers or strings")
+    if kind in ("latest", "each"):
+        spec["checks"] = _checks(raw.get("checks"), defaults, where)
+    elif kind == "count":
+        spec["where"] = _condition(raw.get("where"), defaults, f"{where}.where")
+        bands = raw.get("bands")
+        if not isinstance(bands, list) or not bands or not all(
+                isinstance(b, list) and len(b) == 2 and isinstance(b[0], int) and not isinstance(b[0], bool) for b in bands):
+            raise ValueError(f"{where}.bands: must be a non-empty list of [at least, points]")
+        spec["bands"] = [(at_least, _points(points, f"{where}.bands")) for at_least, points in bands]
+    else:  # keywords
+        fields = raw.get("fields")
+        if not isinstance(fields, list) or not fields or not all(isinstance(f, str) and _NAME.match(f) for f in fields):
+            raise ValueError(f"{where}.fields: must be a non-empty list of field names")
+        spec["fields"] = fields
+        groups = raw.get("groups")
+        if not isinstance(groups, list) or not groups:
+            raise ValueError(f"{where}.groups: must be a non-empty list")
+        spec["groups"] = []
+        for i, group in enumerate(groups):
+            at = f"{where}.groups[{i}]"
+            keywords = group.get("keywords") if isinstance(group, dict) else None
+            if not isinstance(keywords, list) or not all(isinstance(k, str) and k.strip() and "\n" not in k for k in keywords):
+                raise ValueError(f"{at}: keywords must be a list of non-empty single-line strings")
+            match = group.get("match", "substring")
+            if match not in ("substring", "word"):
+                raise ValueError(f"{at}: match must be \"substring\" or \"word\"")
+            # Text is lowercased before matching, so keywords are too.
+            spec["groups"].append((_points(group.get("points"), at), match, tuple(k.lower() for k in keywords)))
+    return spec
+
+
+# ─── Code generation ─────────────────────────────────────────────────────────
+
+def _value_expr(var: str, test: dict) -> str:
+    """The value `test` compares, from the variable holding the raw field (NULL already defaulted)."""
+    if test["transform"] or test["op"] == "contains":
+        text = f"str({var})" if test["default"] is not None else f"('' if {var} is None else str({var}))"
+        return f"{text}.{test['transform']}()" if test["transform"] else text
+    return var
+
+
+def _test_expr(x: str, test: dict) -> str:
+    op, value = test["op"], test["value"]
+    if op == "contains":
+        return "(" + " or ".join(f"{needle!r} in {x}" for needle in value) + ")"
+    if op in ORDERING_OPS and test["default"] is None:
+        return f"({x} is not None and {x} {op} {value!r})"
+    return f"{x} {op} {value!r}"
+
+
+class _Emitter:
+    """Generated source for one factor: reads each field (and each transformed form) once per row."""
+
+    def __init__(self, tests: list):
+        self.lines = []
+        self.fields = {}  # field -> variable
+        self.values = {}  # value expression -> variable
+        for test in tests:
+            if test["field"] not in self.fields:
+                self.fields[test["field"]] = f"f{len(self.fields)}"
+
+    def reads(self, tests: list, indent: str):
+        seen = set()
+        for test in tests:
+            var = self.fields[test["field"]]
+            if var not in seen:
+                seen.add(var)
+                self.lines.append(f"{indent}{var} = row.get({test['field']!r})")
+                if test["default"] is not None:
+                    self.lines.append(f"{indent}if {var} is None:")
+                    self.lines.append(f"{indent}    {var} = {test['default']!r}")
+        for test in tests:
+            expr = _value_expr(self.fields[test["field"]], test)
+            if expr not in self.values and expr != self.fields[test["field"]]:
+                self.values[expr] = f"v{len(self.values)}"
+                self.lines.append(f"{indent}{self.values[expr]} = {expr}")
+
+    def condition(self, cond) -> str:
+        mode, tests = cond
+        parts = []
+        for test in tests:
+            expr = _value_expr(self.fields[test["field"]], test)
+            parts.append(_test_expr(self.values.get(expr, expr), test))
+        return f" {'or' if mode == 'any' else 'and'} ".join(parts)
+
+    def checks(self, checks: list, indent: str):
+        for bands in checks:
+            for i, (cond, points) in enumerate(bands):
+                if cond is None:
+                    self.lines.append(f"{indent}{'else' if i else 'if True'}:")
+                else:
+                    self.lines.append(f"{indent}{'elif' if i else 'if'} {self.condition(cond)}:")
+                self.lines.append(f"{indent}    points += {points}")
+
+
+def _tests(spec: dict) -> list:
+    conds = [cond for bands in spec.get("checks", ()) for cond, _ in bands] + [spec.get("where")]
+    return [test for cond in conds if cond for test in cond[1]]
+
+
+def _emit(name: str, spec: dict, constants: dict) -> list:
+    kind, tests = spec["kind"], _tests(spec)
+    out = _Emitter(tests)
+    lines = out.lines
+    fn = f"factor_{name}"
+    if kind == "latest" and spec["table"] == "patients":
+        lines.append(f"def {fn}(row):")
+        out.reads(tests, "    ")
+        lines.append("    points = 0")
+        out.checks(spec["checks"], "    ")
+    elif kind == "latest":
+        lines += [f"def {fn}(rows):", "    if not rows:", "        return 0", "    row = rows[0]"]
+        out.reads(tests, "    ")
+        lines.append("    points = 0")
+        out.checks(spec["checks"], "    ")
+    elif kind == "each":
+        lines += [f"def {fn}(rows):", "    points = 0", "    for row in rows:"]
+        out.reads(tests, "        ")
+        out.checks(spec["checks"], "        ")
+    elif kind == "count":
+        lines += [f"def {fn}(rows):", "    count = 0", "    for row in rows:"]
+        if spec["where"]:
+            out.reads(tests, "        ")
+            lines += [f"        if {out.condition(spec['where'])}:", "            count += 1"]
+        else:
+            lines.append("        count += 1")
+        lines.append("    points = 0")
+        for i, (at_least, points) in enumerate(spec["bands"]):
+            lines += [f"    {'elif' if i else 'if'} count >= {at_least!r}:", f"        points = {points}"]
+    else:  # keywords
+        lines += [f"def {fn}(rows):", "    if not rows:", "        return 0", "    row = rows[0]"]
+        parts = []
+        for i, field in enumerate(spec["fields"]):
+            lines.append(f"    f{i} = row.get({field!r})")
+            parts.append(f"('' if f{i} is None else str(f{i}))")
+        joined = " + ' ' + ".join(parts)
+        lines.append(f"    text = ({joined}).lower()")
+        lines.append("    points = 0")
+        for i, (points, match, keywords) in enumerate(spec["groups"]):
+            const = f"{name.upper()}_{i}"
+            if match == "word":
+                # The substring test skips the regex for the (usual) texts without the keyword
+                constants[const] = tuple((k, re.compile(rf"\b{re.escape(k)}\b")) for k in keywords)
+                lines.append(f"    points += {points} * sum(1 for keyword, pattern in {const}"
+                             f" if keyword in text and pattern.search(text))")
+            else:
+                constants[const] = keywords
+                lines.append(f"    points += {points} * sum(map(text.__contains__, {const}))")
+    lines.append(f"    return min(points, {spec['max']})" if spec["max"] is not None else "    return points")
+
+    # One predicate per test (raw field value -> bool) for risk_batch's column-wise evaluation
+    for i, test in enumerate(tests):
+        test["predicate"] = f"{fn}_test{i}"
+        lines.append(f"def {fn}_test{i}(f0):")
+        if test["default"] is not None:
+            lines += ["    if f0 is None:", f"        f0 = {test['default']!r}"]
+        lines.append(f"    return {_test_expr(_value_expr('f0', test), test)}")
+    return lines
+
+
+def compile_rules(doc: dict, fingerprint: str, builtins: dict) -> RuleSet:
+    """Validate a rule document and compile it; `builtins` maps code-defined kinds to their factor.
+
+    Raises ValueError naming the offending rule.
+    """
+    specs = {name: _spec(name, raw, builtins) for name, raw in doc["factors"].items()}
+    constants, source = {}, []
+    for name, spec in specs.items():
+        if spec["kind"] in builtins:
+            continue
+        source += _emit(name, spec, constants)
+        source.append("")
+    source = "\n".join(source)
+    namespace = dict(constants)
+    exec(compile(source, f"<risk rules {doc.get('version', '')}>", "exec"), namespace)
+    for spec in specs.values():
+        for test in _tests(spec):
+            test["predicate"] = namespace[test["predicate"]]
+    factors = {
+        name: (spec["table"], builtins[spec["kind"]] if spec["kind"] in builtins else namespace[f"factor_{name}"])
+        for name, spec in specs.items()
+    }
+    return RuleSet(doc, fingerprint, factors, specs, source)
+
+
+def load_rules(builtins: dict, path: str = RULES_PATH) -> RuleSet:
+    """Read and compile the rule file."""
+    doc, fingerprint = read_rules(path)
+    return compile_rules(doc, fingerprint, builtins)
@@ -1,89 +1,129 @@
 """Seed the database with realistic Indian healthcare data."""
+import hashlib
+import json
 import sys
 import os
 
 sys.path.insert(0, os.path.dirname(__file__))
 
-from database import supabase
+from database import (
+    get_seed_state, save_seed_state, upsert_rows, delete_rows_in, invalidate_all_patients, backfill_risk_scores,
+)
 
 
-def seed():
-    """Seed the Supabase database with Indian healthcare data. Uses upsert to handle re-runs."""
-
-    # Clear existing data (order matters due to foreign keys)
-    for table in ["lab_results", "allergies", "vitals", "medications", "encounters",
-                  "jan_aushadhi_drugs", "diagnostic_centers", "consent_log", "patients"]:
-        try:
-            supabase.table(table).delete().neq("patient_id" if table != "jan_aushadhi_drugs" and table != "diagnostic_centers" else "drug_id" if table == "jan_aushadhi_drugs" else "center_id", "IMPOSSIBLE_VALUE_THAT_MATCHES_NOTHING").execute()
-        except Exception:
-            pass  # Table might not exist yet
-
-    # Seed patients
-    patients = [
+def _patient_rows():
+    return [
         {"patient_id": p[0], "abha_number": p[1], "name": p[2], "dob": p[3], "age": p[4], "gender": p[5], "insurance_tier": p[6], "city": p[7], "pincode": p[8], "phone": p[9]}
         for p in PATIENTS
     ]
-    supabase.table("patients").upsert(patients).execute()
 
-    # Seed encounters
-    encounters = [
+
+def _encounter_rows():
+    return [
         {"encounter_id": e[0], "patient_id": e[1], "date": e[2], "chief_complaint": e[3], "symptoms": e[4], "notes": e[5]}
         for e in ENCOUNTERS
     ]
-    supabase.table("encounters").upsert(encounters).execute()
 
-    # Seed medications
-    medications = [
+
+def _medication_rows():
+    return [
         {"med_id": m[0], "patient_id": m[1], "drug_name": m[2], "dosage": m[3], "frequency": m[4], "status": m[5]}
         for m in MEDICATIONS
     ]
-    supabase.table("medications").upsert(medications).execute()
 
-    # Seed vitals
-    vitals = [
+
+def _vitals_rows():
+    return [
         {"vital_id": v[0], "patient_id": v[1], "timestamp": v[2], "heart_rate": v[3], "blood_pressure_systolic": v[4], "blood_pressure_diastolic": v[5], "temperature": v[6], "oxygen_saturation": int(v[7]), "respiratory_rate": v[8]}
         for v in VITALS
     ]
-    supabase.table("vitals").upsert(vitals).execute()
 
-    # Seed allergies
-    allergies = [
+
+def _allergy_rows():
+    return [
         {"allergy_id": a[0], "patient_id": a[1], "allergen": a[2], "reaction": a[3], "severity": a[4]}
         for a in ALLERGIES
     ]
-    supabase.table("allergies").upsert(allergies).execute()
 
-    # Seed lab results
-    labs = [
+
+def _lab_rows():
+    return [
         {"lab_id": l[0], "patient_id": l[1], "test_name": l[2], "result_value": l[3], "unit": l[4], "reference_range": l[5], "status": l[6], "date": l[7]}
         for l in LAB_RESULTS
     ]
-    supabase.table("lab_results").upsert(labs).execute()
 
-    # Seed Jan Aushadhi drugs
-    jan_drugs = [
+
+def _jan_aushadhi_rows():
+    return [
         {"drug_id": j[0], "generic_name": j[1], "brand_name": j[2], "category": j[3], "brand_price_inr": j[4], "jan_aushadhi_price_inr": j[5], "pmbjp_available": j[6], "molecule": j[7], "savings_percent": round((1 - j[5]/j[4]) * 100, 1) if j[4] > 0 else 0}
         for j in JAN_AUSHADHI_DRUGS
     ]
-    supabase.table("jan_aushadhi_drugs").upsert(jan_drugs).execute()
 
-    # Seed diagnostic centers
-    centers = [
+
+def _diagnostic_center_rows():
+    return [
         {"center_id": d[0], "center_name": d[1], "city": d[2], "pincode": d[3], "test_name": d[4], "price_inr": d[5], "distance_km": d[6], "turnaround_hours": d[7]}
         for d in DIAGNOSTIC_CENTERS
     ]
-    supabase.table("diagnostic_centers").upsert(centers).execute()
 
-    print(f"🇮🇳 Seeded Supabase database: {len(PATIENTS)} patients (ABHA), "
-          f"{len(ENCOUNTERS)} encounters, {len(MEDICATIONS)} medications, "
-          f"{len(VITALS)} vitals, {len(ALLERGIES)} allergies, "
-          f"{len(LAB_RESULTS)} lab results, {len(JAN_AUSHADHI_DRUGS)} Jan Aushadhi drugs, "
-          f"{len(DIAGNOSTIC_CENTERS)} diagnostic centers")
 
+# (table, primary key, row builder) — parents before children (FK order).
+SEED_DATASETS = [
+    ("patients", "patient_id", _patient_rows),
+    ("encounters", "encounter_id", _encounter_rows),
+    ("medications", "med_id", _medication_rows),
+    ("vitals", "vital_id", _vitals_rows),
+    ("allergies", "allergy_id", _allergy_rows),
+    ("lab_results", "lab_id", _lab_rows),
+    ("jan_aushadhi_drugs", "drug_id", _jan_aushadhi_rows),
+    ("diagnostic_centers", "center_id", _diagnostic_center_rows),
+]
 
-if __name__ == "__main__":
-    seed()
 
+def _digest(obj) -> str:
+    return hashlib.sha256(json.dumps(obj, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def seed(force: bool = False):
+    """Bring the seed rows up to date — a no-op when nothing in this file changed.
+
+    Each dataset's content hash (and a hash per row) is stored in `seed_state`.
+    On a mismatch only new/changed rows are upserted and rows dropped from this
+    file are deleted by id; nothing else is touched, so live clinical data is
+    never wiped. Every step is idempotent, which makes concurrent runs from N
+    workers safe: they converge on the same rows and the same state.
+    """
+    state = {} if force else get_seed_state()
+    plans = []
+    for table, key, build in SEED_DATASETS:
+        rows = build()
+        row_hashes = {row[key]: _digest(row)[:16] for row in rows}
+        checksum = _digest(row_hashes)
+        previous = state.get(table)
+        if previous and previous.get("checksum") == checksum:
+            continue
+        old_hashes = (previous or {}).get("row_hashes") or {}
+        changed = [row for row in rows if old_hashes.get(row[key]) != row_hashes[row[key]]]
+        removed = set(old_hashes) - set(row_hashes)
+        plans.append((table, key, checksum, row_hashes, changed, removed))
+
+    if not plans:
+        print("🇮🇳 Seed data unchanged — skipping seeding.")
+        return
+
+    # Upserts parents → children, deletes children → parents.
+    for table, key, checksum, row_hashes, changed, removed in plans:
+        upsert_rows(table, changed)
+    for table, key, checksum, row_hashes, changed, removed in reversed(plans):
+        if removed:
+            delete_rows_in(table, key, removed)
+        save_seed_state(table, checksum, row_hashes)
+    invalidate_all_patients()
+    backfill_risk_scores(rebuild=True)  # seed rows bypass the per-write risk refresh
+
+    print("🇮🇳 Seeded database: " + ", ".join(
+        f"{table} +{len(changed)}/-{len(removed)}" for table, _, _, _, changed, removed in plans
+    ))
 
 
 # ─── Indian Patients with ABHA Numbers ──────────────────────────────────────
@@ -238,4 +278,5 @@ DIAGNOSTIC_CENTERS = [
 ]
 
 
-
+if __name__ == "__main__":
+    seed(force="--force" in sys.argv)
@@ -0,0 +1,148 @@
+"""Storage backends — the table-level operations database.py is written against.
+
+database.py owns the API, caching and validation; a backend only moves rows.
+Two implementations ship:
+
+  supabase  Hosted Postgres over PostgREST (storage_supabase.py)
+  sqlite    Embedded, file-backed, fully offline (storage_sqlite.py)
+
+Pick one with AURA_STORAGE_BACKEND. When unset, Supabase is used if
+SUPABASE_URL is configured and SQLite otherwise, so a fresh checkout runs
+without network access.
+
+Filters are `(column, op, value)` tuples ANDed together, with ops:
+  "eq"         column = value
+  "in"         column IN (value...)
+  "ilike"      column ILIKE value (caller supplies the % wildcards)
+  "ilike_any"  any of the columns in the `column` tuple ILIKE value
+Ordering is a tuple of column names; a leading "-" sorts descending.
+"""
+import os
+
+from vitals_trend import TREND_CAPACITY
+
+
+class StorageError(Exception):
+    """A backend rejected a query (missing table, constraint violation, ...)."""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+# Child collections of the aggregated patient record: (table, order, limit).
+RECORD_CHILDREN = (
+    ("encounters", ("-date",), None),
+    ("medications", ("status",), None),
+    ("vitals", ("-timestamp",), TREND_CAPACITY),  # the latest is scored, all of them feed the trend
+    ("allergies", (), None),
+    ("lab_results", ("-date",), None),
+)
+
+# Rows per request for select_all. PostgREST caps every response at its
+# max-rows setting (Supabase default: 1000) without reporting that it did,
+# so this must not exceed it.
+PAGE_ROWS = 1000
+
+# Primary key of every table the API writes (used for upserts).
+PRIMARY_KEYS = {
+    "patients": "patient_id",
+    "encounters": "encounter_id",
+    "medications": "med_id",
+    "vitals": "vital_id",
+    "allergies": "allergy_id",
+    "lab_results": "lab_id",
+    "jan_aushadhi_drugs": "drug_id",
+    "diagnostic_centers": "center_id",
+    "consent_log": "consent_id",
+    "seed_state": "dataset",
+    "risk_scores": "patient_id",
+}
+
+
+class Storage:
+    """Interface implemented by each backend. All methods are thread-safe."""
+
+    name = "abstract"
+
+    def init_schema(self):
+        """Create tables/indexes if the backend manages its own schema."""
+
+    def close(self):
+        """Release connections."""
+
+    def select(self, table: str, where=(), order=(), limit: int = None, offset: int = 0, columns=None) -> list:
+        raise NotImplementedError
+
+    def select_all(self, table: str, where=(), order=(), columns=None) -> list:
+        """Every matching row, fetched PAGE_ROWS at a time so a response cap can't truncate the result.
+
+        The primary key is appended to `order` so tied rows neither repeat nor go missing between pages.
+        """
+        order = tuple(order) + (PRIMARY_KEYS[table],)
+        rows = []
+        while True:
+            page = self.select(table, where, order, PAGE_ROWS, len(rows), columns)
+            rows.extend(page)
+            if len(page) < PAGE_ROWS:
+                return rows
+
+    def select_after(self, table: str, columns, where, keys: tuple, after: tuple, limit: int) -> list:
+        """Keyset scan: rows with `keys` > `after` (row-value comparison), ordered by `keys`.
+
+        Keys are all ascending or all descending ("-score", "-patient_id"); for
+        descending keys the scan continues with rows < `after`.
+        """
+        raise NotImplementedError
+
+    def insert(self, table: str, row: dict):
+        raise NotImplementedError
+
+    def upsert(self, table: str, rows: list):
+        """Insert-or-replace on the table's primary key, as one statement/request."""
+        raise NotImplementedError
+
+    def update(self, table: str, fields: dict, where) -> list:
+        """Apply `fields` to matching rows; returns the updated rows."""
+        raise NotImplementedError
+
+    def delete(self, table: str, where) -> list:
+        """Delete matching rows (child rows cascade); returns the deleted rows."""
+        raise NotImplementedError
+
+    def full_record(self, column: str, value) -> dict:
+        """Patient row plus every RECORD_CHILDREN collection, or None."""
+        rows = self.select("patients", [(column, "eq", value)])
+        if not rows:
+            return None
+        patient = rows[0]
+        for table, order, limit in RECORD_CHILDREN:
+            patient[table] = self.select(table, [("patient_id", "eq", patient["patient_id"])], order, limit)
+        return patient
+
+    def full_records(self, column: str, values) -> list:
+        """full_record for many patients at once — one query per table, not one set per patient."""
+        patients = self.select_all("patients", [(column, "in", list(values))])
+        by_id = {}
+        for patient in patients:
+            patient.update({table: [] for table, _, _ in RECORD_CHILDREN})
+            by_id[patient["patient_id"]] = patient
+        for table, order, limit in RECORD_CHILDREN:
+            for row in self.select_all(table, [("patient_id", "in", list(by_id))], order) if by_id else ():
+                children = by_id[row["patient_id"]][table]
+                if limit is None or len(children) < limit:
+                    children.append(row)
+        return patients
+
+
+def create_storage(pool_size: int) -> Storage:
+    """Instantiate the backend selected by AURA_STORAGE_BACKEND (see module docstring)."""
+    backend = os.environ.get("AURA_STORAGE_BACKEND") or ("supabase" if os.environ.get("SUPABASE_URL") else "sqlite")
+    if backend == "supabase":
+        from storage_supabase import SupabaseStorage
+        return SupabaseStorage(os.environ.get("SUPABASE_URL"), os.environ.get("SUPABASE_ANON_KEY"), pool_size)
+    if backend == "sqlite":
+        from storage_sqlite import SQLiteStorage
+        default_path = os.path.join(os.path.dirname(__file__), "aura.db")
+        return SQLiteStorage(os.environ.get("AURA_SQLITE_PATH", default_path))
+    raise ValueError(f"Unknown AURA_STORAGE_BACKEND {backend!r} (expected 'supabase' or 'sqlite')")
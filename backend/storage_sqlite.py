@@ -0,0 +1,326 @@
+"""SQLite storage backend — embedded, file-backed, no network required.
+
+Mirrors supabase_migration.sql (TEXT for dates/timestamps, INTEGER for
+booleans, TEXT JSON for JSONB). Each thread gets its own connection in WAL
+mode, so readers never block behind a writer and the async_database pool can
+read in parallel. SQL text is fixed per query shape and always parametrized,
+so sqlite3's per-connection statement cache reuses the prepared statements.
+"""
+import json
+import sqlite3
+import threading
+
+from storage import PRIMARY_KEYS, Storage, StorageError
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS patients (
+    patient_id TEXT PRIMARY KEY,
+    abha_number TEXT UNIQUE,
+    name TEXT NOT NULL,
+    dob TEXT,
+    age INTEGER,
+    gender TEXT CHECK (gender IN ('M', 'F', 'Other')),
+    insurance_tier TEXT DEFAULT 'Self-Pay',
+    city TEXT,
+    pincode TEXT,
+    phone TEXT,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+CREATE TABLE IF NOT EXISTS encounters (
+    encounter_id TEXT PRIMARY KEY,
+    patient_id TEXT REFERENCES patients(patient_id) ON DELETE CASCADE,
+    date TEXT DEFAULT CURRENT_DATE,
+    chief_complaint TEXT,
+    symptoms TEXT,
+    notes TEXT,
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+CREATE TABLE IF NOT EXISTS medications (
+    med_id TEXT PRIMARY KEY,
+    patient_id TEXT REFERENCES patients(patient_id) ON DELETE CASCADE,
+    drug_name TEXT NOT NULL,
+    dosage TEXT,
+    frequency TEXT,
+    status TEXT DEFAULT 'active',
+    created_at TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now'))
+);
+CREATE TABLE IF NOT EXISTS vitals (
+    vital_id TEXT PRIMARY KEY,
+    patient_id TEXT REFERENCES patients(patient_id) ON DELETE CASCADE,
+    timestamp TEXT DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now')),
+    heart_rate INTEGER,
+    blood_pressure_systolic INTEGER,
+    blood_pressure_diastolic INTEGER,
+    temperature REAL,
+    oxygen_saturation INTEGER,
+    respiratory_rate INTEGER
+);
+CREATE TABLE IF NOT EXISTS allergies (
+    allergy_id TEXT PRIMARY KEY,
+    patient_id TEXT REFERENCES patients(patient_id) ON DELETE CASCADE,
+    allergen TEXT NOT NULL,
+    severity TEXT DEFAULT 'moderate',
+    reaction TEXT
+);
+CREATE TABLE IF NOT EXISTS lab_results (
+    lab_id TEXT PRIMARY KEY,
+    patient_id TEXT REFERENCES patients(patient_id) ON DELETE CASCADE,
+    test_name TEXT NOT NULL,
+    result_value TEXT,
+    unit TEXT,
+    reference_range TEXT,
+    date TEXT DEFAULT CURRENT_DATE,
+    status TEXT DEFAULT 'final'
+);
+CREATE TABLE IF NOT EXISTS jan_aushadhi_drugs (
+    drug_id TEXT PRIMARY KEY,
+    generic_name TEXT NOT NULL,
+    brand_name TEXT,
+    molecule TEXT,
+    brand_price_inr REAL,
+    jan_aushadhi_price_inr REAL,
+    savings_percent REAL,
+    pmbjp_available INTEGER DEFAULT 1,
+    category TEXT
+);
+CREATE TABLE IF NOT EXISTS diagnostic_centers (
+    center_id TEXT PRIMARY KEY,
+    center_name TEXT NOT NULL,
+    city TEXT,
+    pincode TEXT,
+    test_name TEXT,
+    price_inr REAL,
+    distance_km REAL,
+    turnaround_hours INTEGER
+);
+CREATE TABLE IF NOT EXISTS consent_log (
+    consent_id TEXT PRIMARY KEY,
+    patient_id TEXT REFERENCES patients(patient_id) ON DELETE CASCADE,
+    doctor_id TEXT,
+    purpose TEXT,
+    consent_pin TEXT,
+    granted_at TEXT,
+    expires_at TEXT,
+    status TEXT DEFAULT 'PENDING'
+);
+CREATE TABLE IF NOT EXISTS seed_state (
+    dataset TEXT PRIMARY KEY,
+    checksum TEXT NOT NULL,
+    row_hashes TEXT,
+    applied_at TEXT
+);
+CREATE TABLE IF NOT EXISTS risk_scores (
+    patient_id TEXT PRIMARY KEY REFERENCES patients(patient_id) ON DELETE CASCADE,
+    score INTEGER NOT NULL,
+    triage_level TEXT NOT NULL,
+    breakdown TEXT NOT NULL,
+    input_version INTEGER NOT NULL DEFAULT 1,
+    rules_version TEXT,
+    updated_at TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_patients_name_id ON patients (name, patient_id);
+CREATE INDEX IF NOT EXISTS idx_patients_city_name_id ON patients (city, name, patient_id);
+CREATE INDEX IF NOT EXISTS idx_patients_insurance_name_id ON patients (insurance_tier, name, patient_id);
+CREATE INDEX IF NOT EXISTS idx_patients_gender_name_id ON patients (gender, name, patient_id);
+CREATE INDEX IF NOT EXISTS idx_encounters_patient_date ON encounters (patient_id, date DESC);
+CREATE INDEX IF NOT EXISTS idx_medications_patient_status ON medications (patient_id, status);
+CREATE INDEX IF NOT EXISTS idx_vitals_patient_timestamp ON vitals (patient_id, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_allergies_patient ON allergies (patient_id);
+CREATE INDEX IF NOT EXISTS idx_lab_results_patient_date ON lab_results (patient_id, date DESC);
+CREATE INDEX IF NOT EXISTS idx_consent_log_patient ON consent_log (patient_id);
+CREATE INDEX IF NOT EXISTS idx_jan_aushadhi_generic_id ON jan_aushadhi_drugs (generic_name, drug_id);
+CREATE INDEX IF NOT EXISTS idx_risk_scores_acuity ON risk_scores (score DESC, patient_id DESC);
+CREATE INDEX IF NOT EXISTS idx_risk_scores_level_acuity ON risk_scores (triage_level, score DESC, patient_id DESC);
+"""
+
+# Columns added after their table first shipped: (table, column, type)
+ADDED_COLUMNS = (("risk_scores", "rules_version", "TEXT"),)
+
+BOOLEAN_COLUMNS = {"pmbjp_available"}
+JSON_COLUMNS = {"row_hashes", "breakdown"}
+
+
+def _encode(value):
+    return json.dumps(value) if isinstance(value, (dict, list)) else value
+
+
+def _decode_row(row: sqlite3.Row) -> dict:
+    out = dict(row)
+    for key in BOOLEAN_COLUMNS.intersection(out):
+        if out[key] is not None:
+            out[key] = bool(out[key])
+    for key in JSON_COLUMNS.intersection(out):
+        if isinstance(out[key], str):
+            out[key] = json.loads(out[key])
+    return out
+
+
+class SQLiteStorage(Storage):
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        if sqlite3.sqlite_version_info < (3, 35, 0):
+            raise RuntimeError(f"SQLite >= 3.35 required for RETURNING (found {sqlite3.sqlite_version})")
+        # ":memory:" becomes a named shared-cache database so every thread's
+        # connection sees the same tables.
+        self._uri = path == ":memory:"
+        self.path = f"file:aura-{id(self)}?mode=memory&cache=shared" if self._uri else path
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self.init_schema()
+        conn = self._conn()
+        self._columns = {
+            table: {row["name"] for row in conn.execute(f'PRAGMA table_info("{table}")')}
+            for (table,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+
+    # ─── Connections ─────────────────────────────────────────────────────────
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path, uri=self._uri, timeout=30.0,
+                isolation_level=None,  # autocommit; multi-row writes open their own transaction
+                check_same_thread=False, cached_statements=256,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def init_schema(self):
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        for table, column, kind in ADDED_COLUMNS:
+            if column not in {row["name"] for row in conn.execute(f'PRAGMA table_info("{table}")')}:
+                conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "{column}" {kind}')
+
+    def close(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _run(self, sql: str, params=(), many: bool = False) -> list:
+        conn = self._conn()
+        try:
+            if many:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.executemany(sql, params)
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                conn.execute("COMMIT")
+                return []
+            return [_decode_row(row) for row in conn.execute(sql, params)]
+        except sqlite3.Error as e:
+            raise StorageError(str(e)) from e
+
+    # ─── SQL building ────────────────────────────────────────────────────────
+
+    def _ident(self, table: str, column: str = None) -> str:
+        """Quote a table/column name, rejecting anything not in the schema."""
+        columns = self._columns.get(table)
+        if columns is None:
+            raise StorageError(f'relation "{table}" does not exist')
+        if column is None:
+            return f'"{table}"'
+        if column not in columns:
+            raise StorageError(f'column {table}.{column} does not exist')
+        return f'"{column}"'
+
+    def _where(self, table: str, where) -> tuple:
+        clauses, params = [], []
+        for column, op, value in where:
+            if op == "eq":
+                clauses.append(f"{self._ident(table, column)} = ?")
+                params.append(_encode(value))
+            elif op == "in":
+                values = list(value)
+                if not values:
+                    clauses.append("0")
+                    continue
+                clauses.append(f"{self._ident(table, column)} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+            elif op == "ilike":
+                clauses.append(f"{self._ident(table, column)} LIKE ?")  # LIKE is case-insensitive in SQLite
+                params.append(value)
+            elif op == "ilike_any":
+                clauses.append("(" + " OR ".join(f"{self._ident(table, c)} LIKE ?" for c in column) + ")")
+                params.extend([value] * len(column))
+            else:
+                raise ValueError(f"Unsupported filter op {op!r}")
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _order(self, table: str, order) -> str:
+        if not order:
+            return ""
+        return " ORDER BY " + ", ".join(
+            f"{self._ident(table, term.lstrip('-'))} {'DESC' if term.startswith('-') else 'ASC'}" for term in order
+        )
+
+    def _projection(self, table: str, columns) -> str:
+        return ", ".join(self._ident(table, c) for c in columns) if columns else "*"
+
+    # ─── Storage API ─────────────────────────────────────────────────────────
+
+    def select(self, table, where=(), order=(), limit=None, offset=0, columns=None):
+        where_sql, params = self._where(table, where)
+        sql = f"SELECT {self._projection(table, columns)} FROM {self._ident(table)}{where_sql}{self._order(table, order)}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        return self._run(sql, params)
+
+    def select_all(self, table, where=(), order=(), columns=None):
+        return self.select(table, where, order, columns=columns)  # no response cap to page around
+
+    def select_after(self, table, columns, where, keys, after, limit):
+        where_sql, params = self._where(table, where)
+        if after:
+            op = "<" if keys[0].startswith("-") else ">"
+            columns_sql = ", ".join(self._ident(table, k.lstrip("-")) for k in keys)
+            row_value = f"({columns_sql}) {op} ({', '.join('?' * len(after))})"
+            where_sql = f"{where_sql} AND {row_value}" if where_sql else f" WHERE {row_value}"
+            params += list(after)
+        sql = (f"SELECT {self._projection(table, columns)} FROM {self._ident(table)}{where_sql}"
+               f"{self._order(table, keys)} LIMIT ?")
+        return self._run(sql, params + [limit])
+
+    def insert(self, table, row):
+        columns = list(row)
+        sql = (f"INSERT INTO {self._ident(table)} ({self._projection(table, columns)}) "
+               f"VALUES ({', '.join('?' * len(columns))})")
+        self._run(sql, [_encode(row[c]) for c in columns])
+
+    def upsert(self, table, rows):
+        # Rows may carry different column sets; each distinct set is one executemany.
+        key = PRIMARY_KEYS[table]
+        shapes = {}
+        for row in rows:
+            shapes.setdefault(tuple(row), []).append(row)
+        for columns, group in shapes.items():
+            updates = ", ".join(f"{self._ident(table, c)} = excluded.{self._ident(table, c)}" for c in columns if c != key)
+            sql = (f"INSERT INTO {self._ident(table)} ({self._projection(table, columns)}) "
+                   f"VALUES ({', '.join('?' * len(columns))}) "
+                   f"ON CONFLICT ({self._ident(table, key)}) DO " + (f"UPDATE SET {updates}" if updates else "NOTHING"))
+            self._run(sql, [[_encode(row[c]) for c in columns] for row in group], many=True)
+
+    def update(self, table, fields, where):
+        where_sql, params = self._where(table, where)
+        assignments = ", ".join(f"{self._ident(table, c)} = ?" for c in fields)
+        sql = f"UPDATE {self._ident(table)} SET {assignments}{where_sql} RETURNING *"
+        return self._run(sql, [_encode(v) for v in fields.values()] + params)
+
+    def delete(self, table, where):
+        where_sql, params = self._where(table, where)
+        return self._run(f"DELETE FROM {self._ident(table)}{where_sql} RETURNING *", params)
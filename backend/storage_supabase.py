@@ -0,0 +1,153 @@
+"""Supabase storage backend — Postgres over PostgREST with a pooled HTTP/2 client."""
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from postgrest.exceptions import APIError
+from supabase import create_client, Client, ClientOptions
+
+from storage import RECORD_CHILDREN, Storage, StorageError
+
+# PostgREST embedded resources: the patient row plus every child collection
+# in a single HTTP round trip.
+FULL_RECORD_SELECT = "*, " + ", ".join(f"{table}(*)" for table, _, _ in RECORD_CHILDREN)
+
+
+def _pgrst_quote(value) -> str:
+    """Quote a value for a PostgREST logic-tree filter (names may contain , . ( ))."""
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _execute(query):
+    try:
+        return query.execute().data
+    except APIError as e:
+        raise StorageError(e.message or str(e)) from e
+
+
+def _filtered(query, where):
+    for column, op, value in where:
+        if op == "eq":
+            query = query.eq(column, value)
+        elif op == "in":
+            query = query.in_(column, list(value))
+        elif op == "ilike":
+            query = query.ilike(column, value)
+        elif op == "ilike_any":
+            # Quoted: a search term may contain , . ( ) — the or() grammar's separators
+            query = query.or_(",".join(f"{c}.ilike.{_pgrst_quote(value)}" for c in column))
+        else:
+            raise ValueError(f"Unsupported filter op {op!r}")
+    return query
+
+
+def _ordered(query, order, foreign_table: str = None):
+    for term in order:
+        query = query.order(term.lstrip("-"), desc=term.startswith("-"), foreign_table=foreign_table)
+    return query
+
+
+class SupabaseStorage(Storage):
+    name = "supabase"
+
+    def __init__(self, url: str, key: str, pool_size: int):
+        # Keep-alive HTTP/2 pool sized so every async_database worker can hold
+        # a warm connection.
+        self._http_client = httpx.Client(
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+                keepalive_expiry=60.0,
+            ),
+            follow_redirects=True,
+        )
+        self.client: Client = create_client(url, key, options=ClientOptions(httpx_client=self._http_client))
+        # Flipped off the first time PostgREST rejects the embedded select (e.g.
+        # the foreign keys are missing from the schema cache) so we stop paying
+        # for a failing request before every fallback.
+        self.embedded_record_supported = True
+        # Shared pool for the concurrent fallback — one slot per child collection.
+        self._record_pool = ThreadPoolExecutor(max_workers=len(RECORD_CHILDREN), thread_name_prefix="aura-record")
+
+    def close(self):
+        self._record_pool.shutdown(wait=False)
+        self._http_client.close()
+
+    def select(self, table, where=(), order=(), limit=None, offset=0, columns=None):
+        query = _ordered(_filtered(self.client.table(table).select(",".join(columns) if columns else "*"), where), order)
+        if limit is not None:
+            query = query.range(offset, offset + limit - 1) if offset else query.limit(limit)
+        return _execute(query)
+
+    def select_after(self, table, columns, where, keys, after, limit):
+        query = _filtered(self.client.table(table).select(",".join(columns)), where)
+        if after:
+            # Row-value (k1, k2) > (v1, v2) — or < for descending keys — spelled as a PostgREST logic tree.
+            op = "lt" if keys[0].startswith("-") else "gt"
+            (k1, k2), (v1, v2) = (k.lstrip("-") for k in keys), after
+            query = query.or_(
+                f"{k1}.{op}.{_pgrst_quote(v1)},"
+                f"and({k1}.eq.{_pgrst_quote(v1)},{k2}.{op}.{_pgrst_quote(v2)})"
+            )
+        return _execute(_ordered(query, keys).limit(limit))
+
+    def insert(self, table, row):
+        _execute(self.client.table(table).insert(row))
+
+    def upsert(self, table, rows):
+        if rows:
+            _execute(self.client.table(table).upsert(rows))
+
+    def update(self, table, fields, where):
+        return _execute(_filtered(self.client.table(table).update(fields), where))
+
+    def delete(self, table, where):
+        return _execute(_filtered(self.client.table(table).delete(), where))
+
+    # ─── Aggregated patient record ───────────────────────────────────────────
+
+    def _embedded_records(self, where) -> list:
+        query = _filtered(self.client.table("patients").select(FULL_RECORD_SELECT), where)
+        for table, order, limit in RECORD_CHILDREN:
+            query = _ordered(query, order, foreign_table=table)
+            if limit:
+                query = query.limit(limit, foreign_table=table)
+        return _execute(query)
+
+    def fetch_embedded_record(self, column, value):
+        rows = self._embedded_records([(column, "eq", value)])
+        return rows[0] if rows else None
+
+    def fetch_concurrent_record(self, patient: dict):
+        """Fallback: fetch the child collections in parallel instead of back to back."""
+        futures = {
+            table: self._record_pool.submit(
+                self.select, table, [("patient_id", "eq", patient["patient_id"])], order, limit
+            )
+            for table, order, limit in RECORD_CHILDREN
+        }
+        for table, future in futures.items():
+            patient[table] = future.result()
+        return patient
+
+    def full_record(self, column, value):
+        if self.embedded_record_supported:
+            try:
+                return self.fetch_embedded_record(column, value)
+            except StorageError as e:
+                print(f"⚠️ Embedded patient select unavailable ({e.message}) — using concurrent fallback.")
+                self.embedded_record_supported = False
+        rows = self.select("patients", [(column, "eq", value)])
+        return self.fetch_concurrent_record(rows[0]) if rows else None
+
+    def full_records(self, column, values):
+        # Embedded: child limits apply per patient, and PostgREST's max-rows cap
+        # counts patients rather than child rows, so no collection is cut short.
+        if self.embedded_record_supported:
+            try:
+                return self._embedded_records([(column, "in", list(values))])
+            except StorageError as e:
+                print(f"⚠️ Embedded patient select unavailable ({e.message}) — using per-table fallback.")
+                self.embedded_record_supported = False
+        return super().full_records(column, values)
@@ -127,6 +127,77 @@ CREATE TABLE IF NOT EXISTS consent_log (
     status TEXT DEFAULT 'PENDING'
 );
 
+-- ═══════════════════════════════════════════════════════════════════
+-- 10. SEED STATE (checksums of the last applied seed_data.py datasets)
+-- ═══════════════════════════════════════════════════════════════════
+CREATE TABLE IF NOT EXISTS seed_state (
+    dataset TEXT PRIMARY KEY,
+    checksum TEXT NOT NULL,
+    row_hashes JSONB,
+    applied_at TIMESTAMPTZ
+);
+
+-- ═══════════════════════════════════════════════════════════════════
+-- 11. RISK SCORES (materialized risk_scorer result per patient)
+-- ═══════════════════════════════════════════════════════════════════
+-- Maintained by the API: each clinical write recomputes only the factor
+-- its table feeds. input_version increments on every change and makes
+-- those updates conditional, so concurrent writes never lose a factor.
+CREATE TABLE IF NOT EXISTS risk_scores (
+    patient_id TEXT PRIMARY KEY REFERENCES patients(patient_id) ON DELETE CASCADE,
+    score INTEGER NOT NULL,
+    triage_level TEXT NOT NULL,
+    breakdown JSONB NOT NULL,
+    input_version INTEGER NOT NULL DEFAULT 1,
+    rules_version TEXT,
+    updated_at TIMESTAMPTZ
+);
+-- rules_version: the risk_rules.json version a score was computed under
+-- (older scores are recomputed by the API after the rules change).
+ALTER TABLE risk_scores ADD COLUMN IF NOT EXISTS rules_version TEXT;
+
+-- ═══════════════════════════════════════════════════════════════════
+-- INDEXES: Patient census (keyset pagination + list filters)
+-- ═══════════════════════════════════════════════════════════════════
+-- GET /api/patients pages on (name, patient_id); filtered pages lead with
+-- the filter column so every page is a bounded index range scan.
+CREATE INDEX IF NOT EXISTS idx_patients_name_id ON patients (name, patient_id);
+CREATE INDEX IF NOT EXISTS idx_patients_city_name_id ON patients (city, name, patient_id);
+CREATE INDEX IF NOT EXISTS idx_patients_insurance_name_id ON patients (insurance_tier, name, patient_id);
+CREATE INDEX IF NOT EXISTS idx_patients_gender_name_id ON patients (gender, name, patient_id);
+-- sort=acuity and triage_level pages walk risk_scores by (score, patient_id) descending.
+CREATE INDEX IF NOT EXISTS idx_risk_scores_acuity ON risk_scores (score DESC, patient_id DESC);
+CREATE INDEX IF NOT EXISTS idx_risk_scores_level_acuity ON risk_scores (triage_level, score DESC, patient_id DESC);
+
+-- ═══════════════════════════════════════════════════════════════════
+-- INDEXES: Foreign keys + per-patient timelines
+-- ═══════════════════════════════════════════════════════════════════
+-- Postgres does not index foreign keys on its own: without these, every
+-- per-patient read is a sequential scan and every patient DELETE scans each
+-- child table to cascade. The trailing sort column matches the ORDER BY of
+-- the record queries so a LIMIT stops after the first rows.
+-- (patients.abha_number is already indexed by its UNIQUE constraint.)
+CREATE INDEX IF NOT EXISTS idx_encounters_patient_date ON encounters (patient_id, date DESC);
+CREATE INDEX IF NOT EXISTS idx_medications_patient_status ON medications (patient_id, status);
+CREATE INDEX IF NOT EXISTS idx_vitals_patient_timestamp ON vitals (patient_id, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_allergies_patient ON allergies (patient_id);
+CREATE INDEX IF NOT EXISTS idx_lab_results_patient_date ON lab_results (patient_id, date DESC);
+CREATE INDEX IF NOT EXISTS idx_consent_log_patient ON consent_log (patient_id);
+
+-- Catalog loads page through (generic_name, drug_id).
+CREATE INDEX IF NOT EXISTS idx_jan_aushadhi_generic_id ON jan_aushadhi_drugs (generic_name, drug_id);
+
+-- ═══════════════════════════════════════════════════════════════════
+-- INDEXES: Trigram search (ILIKE '%term%')
+-- ═══════════════════════════════════════════════════════════════════
+-- A leading wildcard defeats B-tree indexes; pg_trgm GIN indexes serve
+-- ILIKE '%term%' for terms of 3+ characters.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_jan_aushadhi_brand_trgm ON jan_aushadhi_drugs USING gin (brand_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_jan_aushadhi_generic_trgm ON jan_aushadhi_drugs USING gin (generic_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_jan_aushadhi_molecule_trgm ON jan_aushadhi_drugs USING gin (molecule gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_diagnostic_centers_test_trgm ON diagnostic_centers USING gin (test_name gin_trgm_ops);
+
 -- ═══════════════════════════════════════════════════════════════════
 -- ROW LEVEL SECURITY (Enable for production)
 -- ═══════════════════════════════════════════════════════════════════
@@ -139,6 +210,8 @@ ALTER TABLE lab_results ENABLE ROW LEVEL SECURITY;
 ALTER TABLE jan_aushadhi_drugs ENABLE ROW LEVEL SECURITY;
 ALTER TABLE diagnostic_centers ENABLE ROW LEVEL SECURITY;
 ALTER TABLE consent_log ENABLE ROW LEVEL SECURITY;
+ALTER TABLE seed_state ENABLE ROW LEVEL SECURITY;
+ALTER TABLE risk_scores ENABLE ROW LEVEL SECURITY;
 
 -- Allow anon key full access for now (tighten later with auth)
 CREATE POLICY "Allow all for anon" ON patients FOR ALL USING (true) WITH CHECK (true);
@@ -150,3 +223,5 @@ CREATE POLICY "Allow all for anon" ON lab_results FOR ALL USING (true) WITH CHEC
 CREATE POLICY "Allow all for anon" ON jan_aushadhi_drugs FOR ALL USING (true) WITH CHECK (true);
 CREATE POLICY "Allow all for anon" ON diagnostic_centers FOR ALL USING (true) WITH CHECK (true);
 CREATE POLICY "Allow all for anon" ON consent_log FOR ALL USING (true) WITH CHECK (true);
+CREATE POLICY "Allow all for anon" ON seed_state FOR ALL USING (true) WITH CHECK (true);
+CREATE POLICY "Allow all for anon" ON risk_scores FOR ALL USING (true) WITH CHECK (true);
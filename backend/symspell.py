@@ -0,0 +1,166 @@
+"""SymSpell-style fuzzy lookup — edit-distance-tolerant matching without pairwise Levenshtein.
+
+Every vocabulary word is indexed under each string obtainable by deleting up
+to `max_distance` characters from it. A query generates its own deletes, and
+only the words sharing one are verified with a real edit distance, so a
+lookup touches a handful of candidates however large the vocabulary is.
+
+Words are compared by transliteration_key(), which first folds the spelling
+variation typical of romanized Hindi (doubled letters, ee/oo, aspirate h,
+w/v, z/j, ph/f): "bukhaar", "bhukar" and "bukhar" share a key, so those
+variants cost no edits at all.
+
+The deletion table dominates the index (millions of entries for a large
+vocabulary), so pack_deletes() can serialize it into a flat hash table that
+PackedDeletes reads in place — from bytes or a memory-mapped file — without
+deserializing anything.
+"""
+import re
+import struct
+import zlib
+from collections import defaultdict
+
+_SPELLING_FOLDS = (("ee", "i"), ("oo", "u"), ("ph", "f"), ("w", "v"), ("z", "j"), ("q", "k"))
+_ASPIRATE_H = re.compile(r"(?<=[bcdfghjklmnpqrstvxz])h")
+_DOUBLED = re.compile(r"(.)\1+")
+
+
+def transliteration_key(word: str) -> str:
+    """'Bukhaar' → 'bukar', 'chhati' → 'cati', 'seene' → 'sine'."""
+    key = word.lower()
+    for variant, folded in _SPELLING_FOLDS:
+        key = key.replace(variant, folded)
+    key = _ASPIRATE_H.sub("", key)
+    return _DOUBLED.sub(r"\1", key)
+
+
+def _deletes(word: str, max_distance: int) -> set:
+    """`word` plus every string reachable by deleting up to max_distance characters."""
+    found = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - found
+        found |= frontier
+    return found
+
+
+def osa_distance(a: str, b: str) -> int:
+    """Optimal-string-alignment distance (Levenshtein plus adjacent transpositions)."""
+    if a == b:
+        return 0
+    prev2, prev = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+def words_by_key(words) -> dict:
+    """{transliteration key: vocabulary words folding to it}."""
+    index = defaultdict(list)
+    for word in dict.fromkeys(words):
+        index[transliteration_key(word)].append(word)
+    return dict(index)
+
+
+def delete_table(keys, max_distance: int) -> dict:
+    """{delete variant: keys} — the deletion table over transliteration keys (the costly part to build)."""
+    table = defaultdict(set)
+    for key in keys:
+        for variant in _deletes(key, max_distance):
+            table[variant].add(key)
+    return dict(table)
+
+
+class SymSpellIndex:
+    """Deletion index over the transliteration keys of a fixed vocabulary."""
+
+    def __init__(self, words, max_distance: int = 2):
+        self.max_distance = max_distance
+        self.words_by_key = words_by_key(words)  # key -> vocabulary words folding to it
+        self.keys_by_delete = delete_table(self.words_by_key, max_distance)  # delete variant -> keys
+
+    @classmethod
+    def from_parts(cls, words_by_key: dict, keys_by_delete, max_distance: int):
+        """An index over a stored words_by_key and deletion table (a dict or PackedDeletes)."""
+        index = cls.__new__(cls)
+        index.max_distance = max_distance
+        index.words_by_key = words_by_key
+        index.keys_by_delete = keys_by_delete
+        return index
+
+    def lookup(self, word: str, max_distance: int) -> dict:
+        """{vocabulary word: edit distance between keys} for every word within max_distance."""
+        key = transliteration_key(word)
+        max_distance = min(max_distance, self.max_distance)
+        candidates = set()
+        for variant in _deletes(key, max_distance):
+            candidates.update(self.keys_by_delete.get(variant, ()))
+        matches = {}
+        for candidate in candidates:
+            distance = osa_distance(key, candidate)
+            if distance <= max_distance:
+                for vocab_word in self.words_by_key[candidate]:
+                    matches[vocab_word] = distance
+        return matches
+
+
+# ─── Packed deletion table ───────────────────────────────────────────────────
+# Layout: uint32 slot count, uint32 slots[count], then one record per delete
+# variant, "variant\tkey\tkey...\n" in UTF-8. A slot holds 1 + the offset of
+# its record (0 = empty); variants are placed by CRC-32 with linear probing at
+# a load factor of at most one half.
+
+_COUNT = struct.Struct("<I")
+
+
+def pack_deletes(keys_by_delete: dict) -> bytes:
+    """Serialize {delete variant: keys} for PackedDeletes."""
+    count = max(1, 2 * len(keys_by_delete))
+    slots = [0] * count
+    records = bytearray()
+    for variant, keys in keys_by_delete.items():
+        encoded = variant.encode()
+        slot = zlib.crc32(encoded) % count
+        while slots[slot]:
+            slot = (slot + 1) % count
+        slots[slot] = len(records) + 1
+        records += b"\t".join([encoded, *(key.encode() for key in sorted(keys))]) + b"\n"
+    return _COUNT.pack(count) + struct.pack(f"<{count}I", *slots) + bytes(records)
+
+
+class PackedDeletes:
+    """Read-only {delete variant: keys} view over pack_deletes() output.
+
+    Only the probed slots and records are touched, so a memory-mapped table
+    costs nothing to open however large it is.
+    """
+
+    def __init__(self, buffer, offset: int = 0):
+        """`buffer` (bytes or mmap) holds the packed table at `offset`."""
+        (count,) = _COUNT.unpack_from(buffer, offset)
+        self._count = count
+        self._slots = memoryview(buffer)[offset + 4:offset + 4 + 4 * count].cast("I")
+        if not count or len(self._slots) != count:
+            raise ValueError("truncated deletion table")
+        self._base = offset + 4 + 4 * count
+        self._buffer = buffer
+
+    def get(self, variant: str, default=None):
+        encoded = variant.encode()
+        slot = zlib.crc32(encoded) % self._count
+        prefix = encoded + b"\t"
+        while True:
+            offset = self._slots[slot]
+            if not offset:
+                return default
+            start = self._base + offset - 1
+            if self._buffer[start:start + len(prefix)] == prefix:
+                end = self._buffer.find(b"\n", start)
+                return [key.decode() for key in self._buffer[start + len(prefix):end].split(b"\t")]
+            slot = (slot + 1) % self._count
@@ -0,0 +1,5 @@
+"""Shared test setup: import the backend modules the way main.py does (flat, from backend/)."""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
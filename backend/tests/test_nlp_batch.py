@@ -0,0 +1,26 @@
+"""nlp_batch.extract_stream — result rows for NDJSON input."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from nlp_batch import extract_stream
+
+
+def _run(lines: list) -> list:
+    async def collect():
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return [result async for result in extract_stream(lines, chunk_size=2, pool=pool)]
+    return asyncio.run(collect())
+
+
+def test_ndjson_results_keep_order_and_ids():
+    results = _run([b'{"id": "n1", "text": "tez bukhar and chest pain"}', b'"sir dard"'])
+    assert [r["index"] for r in results] == [0, 1]
+    assert results[0]["id"] == "n1" and "symptoms" in results[0]
+    assert results[1]["id"] is None and "symptoms" in results[1]
+
+
+def test_ndjson_error_rows_keep_the_note_id():
+    results = _run([b'{"id": "n1", "body": "no text field"}', b'{"id": "n2", "text": ""}', b"{not json"])
+    assert [r.get("id") for r in results] == ["n1", "n2", None]
+    assert all("error" in r for r in results)
+    assert results[2]["error"].startswith("invalid JSON")
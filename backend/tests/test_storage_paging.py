@@ -0,0 +1,66 @@
+"""Multi-patient reads must survive a response row cap (PostgREST max-rows)."""
+import storage
+from storage import Storage
+from storage_sqlite import SQLiteStorage
+
+CAP = 25
+
+
+class CappedStorage(SQLiteStorage):
+    """SQLite that silently truncates every response to CAP rows, the way PostgREST does."""
+
+    def select(self, table, where=(), order=(), limit=None, offset=0, columns=None):
+        return super().select(table, where, order, min(limit or CAP, CAP), offset, columns)
+
+    select_all = Storage.select_all
+
+
+def _populate(store, patients: int, vitals: int, encounters: int):
+    store.upsert("patients", [{"patient_id": f"P{p:03d}", "name": f"Patient {p}"} for p in range(patients)])
+    store.upsert("vitals", [
+        {"vital_id": f"V{p:03d}-{k:03d}", "patient_id": f"P{p:03d}",
+         "timestamp": f"2026-03-01T{k // 60:02d}:{k % 60:02d}:00", "heart_rate": 60 + k}
+        for p in range(patients) for k in range(vitals)
+    ])
+    store.upsert("encounters", [
+        # Every encounter on the same date: pages must not repeat or skip tied rows.
+        {"encounter_id": f"E{p:03d}-{k:03d}", "patient_id": f"P{p:03d}", "date": "2026-03-01"}
+        for p in range(patients) for k in range(encounters)
+    ])
+
+
+def test_full_records_pages_past_the_cap(monkeypatch):
+    monkeypatch.setattr(storage, "PAGE_ROWS", CAP)
+    capped, plain = CappedStorage(":memory:"), SQLiteStorage(":memory:")
+    for store in (capped, plain):
+        _populate(store, patients=30, vitals=40, encounters=12)
+    ids = [f"P{p:03d}" for p in range(30)]
+
+    records = {r["patient_id"]: r for r in capped.full_records("patient_id", ids)}
+    expected = {r["patient_id"]: r for r in plain.full_records("patient_id", ids)}
+
+    assert len(records) == 30
+    for patient_id, record in records.items():
+        assert len(record["vitals"]) == storage.RECORD_CHILDREN[2][2]
+        assert record["vitals"] == expected[patient_id]["vitals"]
+        assert sorted(e["encounter_id"] for e in record["encounters"]) == \
+            sorted(e["encounter_id"] for e in expected[patient_id]["encounters"])
+
+
+def test_factor_inputs_pages_past_the_cap(monkeypatch):
+    import database
+
+    monkeypatch.setattr(storage, "PAGE_ROWS", CAP)
+    capped = CappedStorage(":memory:")
+    _populate(capped, patients=6, vitals=30, encounters=10)
+    monkeypatch.setattr(database, "_storage", capped)
+    ids = [f"P{p:03d}" for p in range(6)]
+
+    vitals = database._factor_inputs(ids, "vitals")
+    encounters = database._factor_inputs(ids, "encounters")
+    patients = database._factor_inputs(ids, "patients")
+
+    assert all(len(rows) == 30 for rows in vitals.values())
+    assert all(rows[0]["heart_rate"] == 89 for rows in vitals.values())  # newest first
+    assert all(len(rows) == 10 for rows in encounters.values())
+    assert all(patients[patient_id]["patient_id"] == patient_id for patient_id in ids)
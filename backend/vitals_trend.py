@@ -0,0 +1,207 @@
+"""Vitals trend engine — rolling slopes over each patient's recent readings.
+
+The vitals risk factor reads only the latest reading. A heart rate climbing
+from 80 to 115 over six hours scores the same as a steady 115, and a falling
+SpO2 goes unnoticed until it crosses a threshold.
+
+VitalsSeries keeps a patient's newest TREND_CAPACITY readings in a
+fixed-size ring. For each measurement it also keeps running sums over the
+readings taken within TREND_WINDOW_HOURS of the newest one. Those sums are
+n, Σt, Σv, Σt² and Σtv: enough for the mean and the least-squares slope.
+An append adds the new reading to the sums and subtracts whatever falls out
+of the ring or the window. Each update is therefore O(1), amortized over
+window evictions.
+
+Steep worsening slopes score NEWS2-style trend points, scaled up to
+TREND_MAX_POINTS. Times are whole seconds and values are hundredths, so the
+sums are exact integers. A series built reading by reading, one rebuilt from
+stored rows, and risk_batch's vectorized version therefore always score the
+same.
+"""
+from datetime import datetime, timedelta, timezone
+
+TREND_CAPACITY = 36  # newest readings kept per patient: 6 h of 10-minute readings
+TREND_WINDOW_HOURS = 6
+TREND_MIN_READINGS = 3  # per measurement, within the window
+TREND_MIN_SPREAD_MINUTES = 20  # std. deviation of those readings' times (≈1 h of readings)
+TREND_MAX_POINTS = 10
+
+# Measurement -> (worsening direction, [(change per hour, points), ...] steepest first)
+TREND_RULES = {
+    "heart_rate": (1, [(10, 3), (5, 1)]),  # bpm/h rising
+    "respiratory_rate": (1, [(2, 3), (1, 1)]),  # breaths/min per h rising
+    "oxygen_saturation": (-1, [(1, 3), (0.5, 1)]),  # %/h falling
+    "blood_pressure_systolic": (-1, [(10, 2), (5, 1)]),  # mmHg/h falling
+    "temperature": (1, [(0.3, 2), (0.15, 1)]),  # °C/h rising
+}
+MEASURES = tuple(TREND_RULES)
+
+VALUE_SCALE = 100  # values are stored as integer hundredths
+WINDOW_SECONDS = TREND_WINDOW_HOURS * 3600
+MIN_SPREAD = (TREND_MIN_SPREAD_MINUTES * 60) ** 2  # on the variance of the times, in s²
+# Rules with change per hour in hundredths, so thresholds compare as integers
+RULES = {
+    measure: (direction, [(round(change * VALUE_SCALE), points) for change, points in bands])
+    for measure, (direction, bands) in TREND_RULES.items()
+}
+
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+
+
+def parse_seconds(timestamp):
+    """Whole seconds since the epoch for an ISO timestamp (aware ones in UTC), or None if unparseable."""
+    if isinstance(timestamp, datetime):
+        moment = timestamp
+    else:
+        try:
+            moment = datetime.fromisoformat(str(timestamp).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return (moment - _EPOCH) // _SECOND
+
+
+def scaled(value):
+    """A measurement as integer hundredths, or None when missing or not a number."""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return round(float(value) * VALUE_SCALE)
+    except (TypeError, ValueError):
+        return None
+
+
+def band_points(direction: int, bands: list, num: int, den: int) -> int:
+    """Points for a least-squares fit num/den (hundredths per second) under one RULES entry."""
+    rise = direction * num * 3600
+    for change, points in bands:
+        if rise >= change * den:
+            return points
+    return 0
+
+
+class VitalsSeries:
+    """A patient's newest vitals rows in a ring, with windowed sums kept current per append.
+
+    Reads like the newest-first vitals list of a patient record: len() and
+    series[0] (the latest reading) work, so the vitals factor can score it.
+    Not thread-safe; callers share a series under their own lock.
+    """
+
+    def __init__(self, capacity: int = TREND_CAPACITY):
+        self.capacity = capacity
+        self.synced_version = None  # owner's bookkeeping (database.py: risk_scores input_version)
+        self.newest = None  # time of the newest reading
+        self._rows = [None] * capacity
+        self._times = [0] * capacity
+        self._values = [None] * capacity
+        self._ids = set()
+        self._count = 0  # readings ever appended; reading k lives in slot k % capacity
+        self._size = 0
+        self._tail = 0  # first reading still counted in the sums
+        self._sums = {measure: [0, 0, 0, 0, 0] for measure in MEASURES}  # n, Σt, Σv, Σt², Σtv
+
+    @classmethod
+    def from_rows(cls, rows, capacity: int = TREND_CAPACITY) -> "VitalsSeries":
+        """Series over vitals rows given newest first (only the newest `capacity` are kept)."""
+        series = cls(capacity)
+        series.extend(list(rows)[:capacity])
+        return series
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, i: int) -> dict:
+        if not 0 <= i < self._size:
+            raise IndexError("vitals series index out of range")
+        return self._rows[(self._count - 1 - i) % self.capacity]
+
+    def extend(self, rows) -> bool:
+        """Append rows in time order (any input order); False if one is older than the newest reading."""
+        timed = [(parse_seconds(row.get("timestamp")), row) for row in reversed(list(rows))]
+        timed.sort(key=lambda pair: pair[0] if pair[0] is not None else -1)
+        return all([self._append(t, row) for t, row in timed])
+
+    def append(self, row: dict) -> bool:
+        """Add the newest reading; False (series unchanged) if it is older than the newest one."""
+        return self._append(parse_seconds(row.get("timestamp")), row)
+
+    def _append(self, t, row: dict) -> bool:
+        if t is None:
+            return True  # no usable time: the trend ignores it
+        if self.newest is not None and t < self.newest:
+            return False
+        reading_id = row.get("vital_id")
+        if reading_id is not None and reading_id in self._ids:
+            return True  # already here (e.g. loaded from the table after it was written)
+        if self._size == self.capacity:
+            self._evict_oldest()
+        slot = self._count % self.capacity
+        self._rows[slot], self._times[slot] = row, t
+        self._values[slot] = [scaled(row.get(measure)) for measure in MEASURES]
+        if reading_id is not None:
+            self._ids.add(reading_id)
+        self._add(slot, 1)
+        self._count += 1
+        self._size += 1
+        self.newest = t
+        # Drop readings that fell out of the window from the sums (they stay in the ring).
+        while self._tail < self._count and self._times[self._tail % self.capacity] < t - WINDOW_SECONDS:
+            self._add(self._tail % self.capacity, -1)
+            self._tail += 1
+        return True
+
+    def _evict_oldest(self):
+        oldest = self._count - self._size
+        slot = oldest % self.capacity
+        if self._tail <= oldest:
+            self._add(slot, -1)
+            self._tail = oldest + 1
+        self._ids.discard(self._rows[slot].get("vital_id"))
+        self._rows[slot] = self._values[slot] = None
+        self._size -= 1
+
+    def _add(self, slot: int, sign: int):
+        t = self._times[slot]
+        for measure, v in zip(MEASURES, self._values[slot]):
+            if v is not None:
+                sums = self._sums[measure]
+                sums[0] += sign
+                sums[1] += sign * t
+                sums[2] += sign * v
+                sums[3] += sign * t * t
+                sums[4] += sign * t * v
+
+    def fit(self, measure: str):
+        """(num, den) of the least-squares slope num/den in hundredths per second, or None if too few readings."""
+        n, st, sv, stt, stv = self._sums[measure]
+        if n < TREND_MIN_READINGS:
+            return None
+        den = n * stt - st * st  # n² · variance of the times
+        if den < n * n * MIN_SPREAD:
+            return None
+        return n * stv - st * sv, den
+
+    def points(self) -> int:
+        """Trend points (0-TREND_MAX_POINTS) for the current window."""
+        total = 0
+        for measure, (direction, bands) in RULES.items():
+            fit = self.fit(measure)
+            if fit:
+                total += band_points(direction, bands, *fit)
+        return min(total, TREND_MAX_POINTS)
+
+    def summary(self) -> dict:
+        """{measure: {"readings", "mean", "per_hour"}} over the window (per_hour None without a fit)."""
+        summary = {}
+        for measure in MEASURES:
+            n, _, sv, _, _ = self._sums[measure]
+            fit = self.fit(measure)
+            summary[measure] = {
+                "readings": n,
+                "mean": round(sv / n / VALUE_SCALE, 2) if n else None,
+                "per_hour": round(fit[0] * 3600 / fit[1] / VALUE_SCALE, 2) if fit else None,
+            }
+        return summary
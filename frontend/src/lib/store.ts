@@ -93,11 +93,21 @@ export interface AgentMessage {
     summary?: string;
 }
 
+export interface NlpSymptomOccurrence {
+    start: number;
+    end: number;
+    negated: boolean;
+    severity: string;
+    body_part: string | null;
+}
+
 export interface NlpSymptom {
     symptom: string;
     icd10: string;
     severity: string;
     body_part: string | null;
+    negated?: boolean;
+    occurrences?: NlpSymptomOccurrence[];
 }
 
 export interface ChatMessage {